@@ -1,17 +1,96 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+import asyncio
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
-import pickle
 import os
+import time
 import uvicorn
+from inference import load_pipeline, results_frame, synthetic_batch
+from batching import BatcherStopped, MicroBatcher
+from executor import ExecutorFull, InferenceExecutor
+from explain import ExplainError
+from cache import PredictionCache
+from drift import DriftMonitor, load_baseline
+from prediction_log import PredictionLog
+from metrics import MetricsMiddleware, ServingMetrics
+from registry import BASE_DIR, RegistryError, locate_model
+from streaming import RequestStreamingResponse, encode_frame, iter_csv_frames, spool_stream
+import wire
 # uvicorn api:app --reload --host 127.0.0.1 --port 8000
 app = FastAPI(title="Attrition Prediction API")
 
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
-# Global model variable
+# Request counts, errors and latency histograms served at /metrics
+metrics = ServingMetrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics, paths=["/predict", "/predict/batch", "/predict/csv", "/predict/binary",
+                                                                 "/explain", "/explain/batch"])
+
+# Global model variable and an identifier of the model it holds
 model = None
+model_version = None
+
+# Largest number of rows accepted by /predict/batch in a single call
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+
+# Concurrent /predict calls are coalesced into one pipeline call of at most
+# MICRO_BATCH_MAX_SIZE rows, waiting at most MICRO_BATCH_WAIT_MS for company. Once
+# MICRO_BATCH_MAX_QUEUE rows are waiting to be batched, requests get a 503.
+MICRO_BATCHING = os.getenv("MICRO_BATCHING", "1") == "1"
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+MICRO_BATCH_WAIT_MS = float(os.getenv("MICRO_BATCH_WAIT_MS", "2"))
+MICRO_BATCH_MAX_QUEUE = int(os.getenv("MICRO_BATCH_MAX_QUEUE", "1024"))
+batcher = None
+
+# Inference runs on a bounded pool ("thread" or "process") so it never blocks the
+# event loop; once INFERENCE_MAX_PENDING jobs are waiting, requests get a 503.
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_MAX_PENDING = int(os.getenv("INFERENCE_MAX_PENDING", "64"))
+XGB_NTHREAD = int(os.getenv("XGB_NTHREAD", "0")) or None
+executor = None
+
+# Rows parsed and scored together when streaming a CSV upload through /predict/csv
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", "5000"))
+
+# Repeated what-if queries are answered from an LRU cache keyed on the model features.
+# PREDICTION_CACHE_SIZE=0 disables it.
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+
+# Serve a version of this registered model instead of models/model.pkl when
+# MODEL_REGISTRY_VERSION is set ("2", "latest" or a stage such as "Production").
+MODEL_REGISTRY_NAME = os.getenv("MODEL_REGISTRY_NAME", "Classification_XGBoost_Prod")
+MODEL_REGISTRY_VERSION = os.getenv("MODEL_REGISTRY_VERSION", "")
+model_path = None
+# Set by serve.py, which loads the model once before forking the workers
+preforked = False
+reload_task = None
+reload_status = {"state": "idle"}
+
+# Feature drift of scored requests against the training data, served at /drift.
+# DRIFT_BASELINE is a baseline JSON written by drift.py (or the training CSV itself);
+# DRIFT_HALF_LIFE is in rows, 0 weighs all traffic since startup equally.
+DRIFT_BASELINE = os.getenv("DRIFT_BASELINE", os.path.join(BASE_DIR, "models", "drift_baseline.json"))
+DRIFT_HALF_LIFE = float(os.getenv("DRIFT_HALF_LIFE", "10000"))
+drift_monitor = None
+
+# Audit log of every prediction, buffered in memory and written in batches to rotating
+# JSONL or Parquet files under PREDICTION_LOG_DIR (unset disables it). When the buffer
+# is full, PREDICTION_LOG_POLICY "drop" discards new entries and "block" waits for the writer.
+PREDICTION_LOG_DIR = os.getenv("PREDICTION_LOG_DIR", "")
+PREDICTION_LOG_FORMAT = os.getenv("PREDICTION_LOG_FORMAT", "jsonl")
+PREDICTION_LOG_POLICY = os.getenv("PREDICTION_LOG_POLICY", "drop")
+PREDICTION_LOG_BUFFER_ROWS = int(os.getenv("PREDICTION_LOG_BUFFER_ROWS", "100000"))
+PREDICTION_LOG_BATCH_ROWS = int(os.getenv("PREDICTION_LOG_BATCH_ROWS", "1000"))
+PREDICTION_LOG_FLUSH_S = float(os.getenv("PREDICTION_LOG_FLUSH_S", "1"))
+PREDICTION_LOG_MAX_MB = float(os.getenv("PREDICTION_LOG_MAX_MB", "100"))
+PREDICTION_LOG_MAX_AGE_S = float(os.getenv("PREDICTION_LOG_MAX_AGE_S", "3600"))
+prediction_log = None
 
 class PredictionRequest(BaseModel):
     employee_id: int
@@ -45,29 +124,125 @@ class PredictionResponse(BaseModel):
     confidence: float
     probability_stayed: float
     probability_left: float
+    model_version: Optional[str] = None
+
+
+class ExplanationResponse(BaseModel):
+    """Prediction plus the contribution of each input column to the log-odds of leaving."""
+    prediction: int
+    prediction_label: str
+    probability_left: float
+    base_value: float
+    contributions: Dict[str, float]
+    model_version: Optional[str] = None
+
+
+class ReloadRequest(BaseModel):
+    name: str = MODEL_REGISTRY_NAME
+    version: str = "latest"
+
+
+class BatchPredictionRequest(BaseModel):
+    """Either a list of records or a columnar payload (column name -> values)."""
+    records: Optional[List[PredictionRequest]] = None
+    columns: Optional[Dict[str, list]] = None
+
+
+# Input columns and the dtypes the pipeline was trained on
+FEATURE_COLUMNS = list(PredictionRequest.__annotations__)
+FEATURE_DTYPES = {
+    name: {int: "int64", float: "float64"}.get(annotation, "object")
+    for name, annotation in PredictionRequest.__annotations__.items()
+}
+# Columns the model actually uses; employee_id is only an identifier
+MODEL_FEATURES = [name for name in FEATURE_COLUMNS if name != "employee_id"]
+
+prediction_cache = PredictionCache(MODEL_FEATURES, PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
 
 
 def load_model():
-    global model
-    model_path = os.path.join(os.path.dirname(__file__), "..", "models", "model.pkl")
-    if os.path.exists(model_path):
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
-        print(f"✓ Model loaded from {model_path}")
-        return model
-    else:
-        raise FileNotFoundError(f"Model not found at {model_path}")
+    global model, model_version, model_path
+    model_path, model_version = locate_model(MODEL_REGISTRY_NAME, MODEL_REGISTRY_VERSION)
+    model = load_pipeline(model_path)
+    prediction_cache.set_model_version(model_version)
+    print(f"✓ Model {model_version} loaded from {model_path}")
+    return model
+
+
+async def reload_model(name: str, version: str):
+    """Load a registry version in the background, warm it up, then swap it in.
+
+    Requests keep being served by the current model until the new one has answered a
+    synthetic batch; the swap itself is a plain assignment on the event loop, so every
+    request sees either the old model or the new one.
+    """
+    global model, model_version, model_path, reload_status
+    reload_status = {"state": "loading", "target": f"{name}/{version}"}
+    try:
+        new_path, new_version = locate_model(name, version)
+        new_model = await asyncio.to_thread(load_pipeline, new_path)
+        await executor.load(new_model, new_path, synthetic_batch())
+        model, model_version, model_path = new_model, new_version, new_path
+        prediction_cache.set_model_version(new_version)
+        reload_status = {"state": "idle", "loaded": new_version}
+        print(f"✓ Model {new_version} swapped in from {new_path}")
+    except Exception as e:
+        reload_status = {"state": "failed", "target": f"{name}/{version}", "error": str(e)}
+        print(f"Error reloading model: {str(e)}")
+
+
+def load_drift_monitor():
+    """Start monitoring drift if a baseline is available; serving never depends on it."""
+    global drift_monitor
+    if not DRIFT_BASELINE or not os.path.exists(DRIFT_BASELINE):
+        print(f"Drift monitoring off: no baseline at {DRIFT_BASELINE}")
+        return
+    try:
+        drift_monitor = DriftMonitor(load_baseline(DRIFT_BASELINE), DRIFT_HALF_LIFE)
+        print(f"✓ Drift monitoring against {DRIFT_BASELINE}")
+    except Exception as e:
+        print(f"Drift monitoring off: {str(e)}")
 
 # Run this function automatically when the server starts.
 @app.on_event("startup")
 async def startup_event():
+    global batcher, executor, prediction_log
     try:
-        load_model()
+        if not preforked:
+            load_model()
+        executor = InferenceExecutor(INFERENCE_EXECUTOR, INFERENCE_WORKERS, INFERENCE_MAX_PENDING, XGB_NTHREAD,
+                                     on_stages=metrics.observe_stages)
+        await executor.load(model, model_path, synthetic_batch())
+        load_drift_monitor()
+        print(f"✓ Inference on {INFERENCE_WORKERS} {INFERENCE_EXECUTOR} worker(s), {executor.nthread} XGBoost thread(s) each")
+        if MICRO_BATCHING:
+            batcher = MicroBatcher(score_frame, FEATURE_COLUMNS, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_WAIT_MS,
+                                   on_build=lambda seconds: metrics.observe_stage("build_frame", seconds),
+                                   max_queue=MICRO_BATCH_MAX_QUEUE)
+            batcher.start()
+            print(f"✓ Micro-batching enabled (max {MICRO_BATCH_MAX_SIZE} rows / {MICRO_BATCH_WAIT_MS} ms)")
+        if PREDICTION_LOG_DIR:
+            prediction_log = PredictionLog(PREDICTION_LOG_DIR, PREDICTION_LOG_FORMAT, PREDICTION_LOG_BUFFER_ROWS,
+                                           PREDICTION_LOG_BATCH_ROWS, PREDICTION_LOG_FLUSH_S,
+                                           int(PREDICTION_LOG_MAX_MB * 2 ** 20), PREDICTION_LOG_MAX_AGE_S,
+                                           PREDICTION_LOG_POLICY)
+            prediction_log.start()
+            print(f"✓ Logging predictions to {PREDICTION_LOG_DIR} ({PREDICTION_LOG_FORMAT}, {PREDICTION_LOG_POLICY} when full)")
         print("✓ FastAPI server started")
     except Exception as e:
         print(f"Error: {str(e)}")
         raise
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if batcher is not None:
+        await batcher.stop()
+    if prediction_log is not None:
+        await prediction_log.stop()
+    if executor is not None:
+        executor.shutdown()
+
 #Defines the home route of the API.
 @app.get("/")
 async def root():
@@ -77,28 +252,323 @@ async def root():
 async def health_check():
     if model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
-    return {"status": "healthy"}
+    return {"status": "healthy", "model_version": model_version, "reload": reload_status}
 
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest) -> PredictionResponse:
-    if model is None:
+# Starts loading another registered model version; poll /health to see when it is live.
+@app.post("/model/reload", status_code=202)
+async def model_reload(request: ReloadRequest):
+    global reload_task
+    if executor is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
+    if preforked:
+        # Only the worker that got this request would swap its model
+        raise HTTPException(status_code=409, detail="Workers share the model loaded by serve.py; restart it to change models")
+    if reload_task is not None and not reload_task.done():
+        raise HTTPException(status_code=409, detail="A model reload is already in progress")
     try:
-        input_df = pd.DataFrame([request.dict()])
-        prediction = model.predict(input_df)[0]
-        prediction_proba = model.predict_proba(input_df)[0]
-        prediction_label = "Stayed" if prediction == 1 else "Left"
-        confidence = max(prediction_proba) * 100
-        return PredictionResponse(
+        locate_model(request.name, request.version)
+    except (RegistryError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    reload_task = asyncio.create_task(reload_model(request.name, request.version))
+    return {"status": "reloading", "current_version": model_version, "target": f"{request.name}/{request.version}"}
+
+
+async def score_frame(input_df: pd.DataFrame) -> List[PredictionResponse]:
+    """Run every row of the DataFrame through the pipeline in one vectorized call on the executor."""
+    # Read both together so responses name the model that actually scored them
+    current_model, version = model, model_version
+    predictions, probabilities = await executor.predict(current_model, input_df)
+    metrics.observe_predictions(predictions)
+    return build_responses(predictions, probabilities, version)
+
+
+def build_responses(predictions, probabilities, version: str = None) -> List[PredictionResponse]:
+    """Turn label and probability arrays into one PredictionResponse per row."""
+    probabilities = probabilities.astype(np.float64)
+    n_classes = probabilities.shape[1]
+    confidences = (probabilities.max(axis=1) * 100).tolist()
+    stayed = (probabilities[:, 1] * 100).tolist() if n_classes > 1 else [0] * len(predictions)
+    left = (probabilities[:, 0] * 100).tolist() if n_classes > 0 else [0] * len(predictions)
+    return [
+        PredictionResponse(
             prediction=int(prediction),
-            prediction_label=prediction_label,
+            prediction_label="Stayed" if prediction == 1 else "Left",
             confidence=confidence,
-            probability_stayed=float(prediction_proba[1]) * 100 if len(prediction_proba) > 1 else 0,
-            probability_left=float(prediction_proba[0]) * 100 if len(prediction_proba) > 0 else 0
+            probability_stayed=probability_stayed,
+            probability_left=probability_left,
+            model_version=version,
+        )
+        for prediction, confidence, probability_stayed, probability_left
+        in zip(predictions.tolist(), confidences, stayed, left)
+    ]
+
+
+async def score_frame_cached(input_df: pd.DataFrame) -> List[PredictionResponse]:
+    """Like score_frame, but rows already in the prediction cache skip the pipeline."""
+    if not prediction_cache.enabled:
+        return await score_frame(input_df)
+    version = model_version
+    keys = prediction_cache.keys_for_frame(input_df)
+    responses = [prediction_cache.get(key) for key in keys]
+    missing = [i for i, response in enumerate(responses) if response is None]
+    if missing:
+        scored = await score_frame(input_df.iloc[missing])
+        for i, response in zip(missing, scored):
+            responses[i] = response
+            prediction_cache.put(keys[i], response, version)
+    return responses
+
+
+def build_explanations(contributions, base_values, version: str = None) -> List[ExplanationResponse]:
+    """Turn TreeSHAP contributions (log-odds of leaving) into one ExplanationResponse per row."""
+    margins = base_values + contributions.sum(axis=1)
+    left = 1 / (1 + np.exp(-margins))
+    return [
+        ExplanationResponse(
+            # Ties go to the first class ("Left"), as in predict_with_proba
+            prediction=0 if probability_left >= 0.5 else 1,
+            prediction_label="Left" if probability_left >= 0.5 else "Stayed",
+            probability_left=probability_left * 100,
+            base_value=base_value,
+            contributions=dict(zip(MODEL_FEATURES, row)),
+            model_version=version,
         )
+        for probability_left, base_value, row in zip(left.tolist(), base_values.tolist(), contributions.tolist())
+    ]
+
+
+async def explain_frame(input_df: pd.DataFrame, approximate: bool = False) -> List[ExplanationResponse]:
+    """Explain every row of the DataFrame in one vectorized TreeSHAP call on the executor."""
+    current_model, version = model, model_version
+    try:
+        contributions, base_values = await executor.explain(current_model, input_df, MODEL_FEATURES, approximate)
+    except ExecutorFull as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    except ExplainError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Explanation failed: {str(e)}")
+    return build_explanations(contributions, base_values, version)
+
+
+def batch_to_frame(request: BatchPredictionRequest) -> pd.DataFrame:
+    """Build one DataFrame from a batch payload, validating shape and size."""
+    if (request.records is None) == (request.columns is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of 'records' or 'columns'")
+    if request.records is not None:
+        n_rows = len(request.records)
+    else:
+        missing = [name for name in FEATURE_COLUMNS if name not in request.columns]
+        if missing:
+            raise HTTPException(status_code=422, detail=f"Missing columns: {missing}")
+        lengths = {len(request.columns[name]) for name in FEATURE_COLUMNS}
+        if len(lengths) != 1:
+            raise HTTPException(status_code=422, detail="All columns must have the same length")
+        n_rows = lengths.pop()
+    if n_rows == 0:
+        raise HTTPException(status_code=422, detail="Batch is empty")
+    if n_rows > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch of {n_rows} rows exceeds the limit of {MAX_BATCH_SIZE}")
+
+    start = time.perf_counter()
+    if request.records is not None:
+        input_df = pd.DataFrame.from_records([record.dict() for record in request.records], columns=FEATURE_COLUMNS)
+    else:
+        try:
+            input_df = pd.DataFrame({name: request.columns[name] for name in FEATURE_COLUMNS}).astype(FEATURE_DTYPES)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=422, detail=f"Invalid column values: {str(e)}")
+    metrics.observe_stage("build_frame", time.perf_counter() - start)
+    return input_df
+
+
+def observe_validation(http_request: Request):
+    """Record the time between the request arriving and the handler running (body parsing and validation)."""
+    start = http_request.scope.get("state", {}).get("request_start")
+    if start is not None:
+        metrics.observe_stage("validation", time.perf_counter() - start)
+
+
+@app.post("/predict", response_model=PredictionResponse)
+async def predict(request: PredictionRequest, http_request: Request) -> PredictionResponse:
+    observe_validation(http_request)
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    record = request.dict()
+    key = prediction_cache.key(record) if prediction_cache.enabled else None
+    response = prediction_cache.get(key) if key is not None else None
+    if response is None:
+        version = model_version
+        try:
+            if batcher is not None:
+                response = await batcher.submit(record)
+            else:
+                start = time.perf_counter()
+                input_df = pd.DataFrame([record])
+                metrics.observe_stage("build_frame", time.perf_counter() - start)
+                response = (await score_frame(input_df))[0]
+        except ExecutorFull as e:
+            raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+        except BatcherStopped:
+            raise HTTPException(status_code=503, detail="Server shutting down")
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Prediction failed: {str(e)}")
+        if key is not None:
+            prediction_cache.put(key, response, version)
+    if drift_monitor is not None:
+        drift_monitor.observe(record)
+    if prediction_log is not None:
+        await prediction_log.log("/predict", record, response)
+    return response
+
+
+# Scores many employees in one pipeline pass instead of one HTTP call per row.
+@app.post("/predict/batch", response_model=List[PredictionResponse])
+async def predict_batch(request: BatchPredictionRequest, http_request: Request) -> List[PredictionResponse]:
+    observe_validation(http_request)
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    input_df = batch_to_frame(request)
+    try:
+        responses = await score_frame_cached(input_df)
+    except ExecutorFull as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Prediction failed: {str(e)}")
+    if drift_monitor is not None:
+        drift_monitor.observe_frame(input_df)
+    if prediction_log is not None:
+        await prediction_log.log_frame("/predict/batch", input_df, responses)
+    return responses
+
+
+# Why an employee is flagged: per-column TreeSHAP contributions to the risk of leaving.
+# ?approximate=true trades exact SHAP values for the much cheaper Saabas attribution.
+@app.post("/explain", response_model=ExplanationResponse)
+async def explain(request: PredictionRequest, http_request: Request, approximate: bool = False) -> ExplanationResponse:
+    observe_validation(http_request)
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return (await explain_frame(pd.DataFrame([request.dict()]), approximate))[0]
+
+
+@app.post("/explain/batch", response_model=List[ExplanationResponse])
+async def explain_batch(request: BatchPredictionRequest, http_request: Request,
+                        approximate: bool = False) -> List[ExplanationResponse]:
+    observe_validation(http_request)
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return await explain_frame(batch_to_frame(request), approximate)
+
+
+async def score_csv_stream(request: Request, output_format: str):
+    """Score an uploaded CSV chunk by chunk, yielding encoded results as each chunk finishes."""
+    first = True
+    try:
+        async for chunk in iter_csv_frames(spool_stream(request.stream()), FEATURE_COLUMNS, FEATURE_DTYPES, CSV_CHUNK_ROWS):
+            current_model, version = model, model_version
+            while True:
+                try:
+                    predictions, probabilities = await executor.predict(current_model, chunk)
+                    break
+                except ExecutorFull:
+                    # A long upload waits for capacity rather than failing halfway through
+                    await asyncio.sleep(0.05)
+            metrics.observe_predictions(predictions)
+            if drift_monitor is not None:
+                drift_monitor.observe_frame(chunk)
+            scored = results_frame(chunk["employee_id"].to_numpy(), predictions, probabilities, version)
+            if prediction_log is not None:
+                await prediction_log.log_frame("/predict/csv", chunk, scored)
+            yield encode_frame(scored, output_format, include_header=first)
+            first = False
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band and stop
+        error = pd.DataFrame({"error": [f"Prediction failed: {str(e)}"]})
+        yield encode_frame(error, output_format, include_header=True)
+
+
+# Streams a CSV export (raw request body) through the model in fixed-size chunks and
+# streams the results back as NDJSON (default) or CSV while the upload is still being read.
+@app.post("/predict/csv")
+async def predict_csv(request: Request, format: str = "ndjson"):
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=422, detail="format must be 'ndjson' or 'csv'")
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return RequestStreamingResponse(score_csv_stream(request, format), media_type=media_type)
+
+
+# Columnar batches as Arrow IPC or MessagePack (see wire.py), decoded straight into the
+# pipeline's DataFrame. The answer uses the request's format unless Accept names the other one.
+@app.post("/predict/binary")
+async def predict_binary(request: Request):
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    input_format = wire.media_format(request.headers.get("content-type"))
+    if input_format is None:
+        raise HTTPException(status_code=415, detail=f"Content-Type must be one of {list(wire.MEDIA_TYPES.values())}")
+    output_format = wire.media_format(request.headers.get("accept")) or input_format
+    try:
+        for fmt in {input_format, output_format}:
+            wire.require(fmt)
+    except ImportError as e:
+        raise HTTPException(status_code=415, detail=f"Binary format not available: {str(e)}")
+    body = await request.body()
+    start = time.perf_counter()
+    try:
+        input_df = wire.decode_frame(body, input_format, FEATURE_COLUMNS, FEATURE_DTYPES)
+    except wire.WireError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    metrics.observe_stage("build_frame", time.perf_counter() - start)
+    if len(input_df) == 0:
+        raise HTTPException(status_code=422, detail="Batch is empty")
+    if len(input_df) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(input_df)} rows exceeds the limit of {MAX_BATCH_SIZE}")
+
+    # Scored as a whole, without the per-row prediction cache
+    current_model, version = model, model_version
+    try:
+        predictions, probabilities = await executor.predict(current_model, input_df)
+    except ExecutorFull as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Prediction failed: {str(e)}")
+    metrics.observe_predictions(predictions)
+    if drift_monitor is not None:
+        drift_monitor.observe_frame(input_df)
+    scored = results_frame(input_df["employee_id"].to_numpy(), predictions, probabilities, version)
+    if prediction_log is not None:
+        await prediction_log.log_frame("/predict/binary", input_df, scored)
+    return Response(wire.encode_frame(scored, output_format), media_type=wire.MEDIA_TYPES[output_format])
+
+
+# Prometheus text exposition of the counters and histograms collected by ServingMetrics
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return prediction_cache.stats()
+
+
+@app.get("/log/stats")
+async def log_stats():
+    if prediction_log is None:
+        raise HTTPException(status_code=503, detail="Prediction logging is off: set PREDICTION_LOG_DIR")
+    return prediction_log.stats()
+
+
+# PSI and KL divergence of each feature of scored requests against the training baseline
+@app.get("/drift")
+async def drift():
+    if drift_monitor is None:
+        raise HTTPException(status_code=503, detail="Drift monitoring is off: no baseline loaded")
+    return drift_monitor.report()
 
 
 if __name__ == "__main__":
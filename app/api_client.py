@@ -0,0 +1,95 @@
+"""HTTP client the Streamlit pages use to talk to the FastAPI server.
+
+One pooled requests.Session per process keeps connections to the API alive across
+reruns and sessions. Prediction calls are retried with exponential backoff on
+connection errors and 502/503/504 (including the API's "Server busy" 503); scoring
+is idempotent, so POSTs are retried too. The health check is not retried and is
+only trusted for API_HEALTH_TTL seconds, so a restarted or stopped API is noticed.
+"""
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# FastAPI server URL
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+API_BACKOFF = float(os.getenv("API_BACKOFF", "0.3"))
+# Seconds a successful health check is reused before asking the API again
+API_HEALTH_TTL = float(os.getenv("API_HEALTH_TTL", "10"))
+HEALTH_TIMEOUT = 2
+POOL_SIZE = 10
+
+
+class ApiError(Exception):
+    """The API answered with an error status."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"API Error: {status_code}")
+        self.status_code = status_code
+        self.text = text
+
+
+class ApiClient:
+    def __init__(self, base_url: str = API_URL, timeout: float = API_TIMEOUT, retries: int = API_RETRIES,
+                 backoff: float = API_BACKOFF, health_ttl: float = API_HEALTH_TTL):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.health_ttl = health_ttl
+        self._healthy_until = 0.0
+        self._lock = threading.Lock()
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset({"GET", "POST"}), raise_on_status=False)
+        self.session = requests.Session()
+        self.session.mount(self.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry))
+        # Requests picks the adapter with the longest matching prefix: /health fails fast instead of retrying
+        self.session.mount(f"{self.base_url}/health", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+
+    def healthy(self) -> bool:
+        """Whether the API is up with a model loaded; a positive answer is cached for ``health_ttl`` seconds."""
+        if time.monotonic() < self._healthy_until:
+            return True
+        try:
+            ok = self.session.get(f"{self.base_url}/health", timeout=HEALTH_TIMEOUT).status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        with self._lock:
+            self._healthy_until = time.monotonic() + self.health_ttl if ok else 0.0
+        return ok
+
+    def _post(self, path: str, payload: dict):
+        try:
+            response = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            # Ask /health again on the next rerun rather than trusting the cached answer
+            with self._lock:
+                self._healthy_until = 0.0
+            raise
+        if response.status_code != 200:
+            raise ApiError(response.status_code, response.text)
+        return response.json()
+
+    def predict(self, payload: dict) -> dict:
+        return self._post("/predict", payload)
+
+    def predict_batch(self, payloads: list) -> list:
+        """Score many payloads in one /predict/batch call; returns one prediction per payload, in order."""
+        columns = {name: [payload[name] for payload in payloads] for name in payloads[0]}
+        return self._post("/predict/batch", {"columns": columns})
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ApiClient:
+    """The process-wide client, shared by every Streamlit session."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient()
+        return _client
@@ -0,0 +1,161 @@
+"""Attrition counts precomputed as a cube over the key employee dimensions.
+
+The cube keeps, for every combination of years_at_company, job_role, job_level,
+age_groups and overtime seen in the data, the number of employees and the number
+who left. That is a few thousand cells however many records went in, so any
+breakdown of the attrition rate is a sum over those cells instead of a groupby
+over the raw file. New records are added to the existing counts, and refresh()
+only parses the rows appended to a CSV since the last refresh.
+
+Build or update the cube from a CSV and print a breakdown:
+    python app/attrition_cube.py data/Faker_Data/test.csv --cube data/.cache/attrition_cube.json --by job_level overtime
+"""
+import argparse
+import io
+import json
+import os
+import threading
+
+import pandas as pd
+
+CUBE_FORMAT = 1
+DIMENSIONS = ("years_at_company", "job_role", "job_level", "age_groups", "overtime")
+ATTRITION_COLUMN = "attrition"
+ATTRITION_LEFT = "Left"
+# Bytes of appended CSV parsed at a time by refresh()
+READ_BLOCK_BYTES = 64 * 1024 * 1024
+
+
+class AttritionCube:
+    """Employee and leaver counts per combination of DIMENSIONS.
+
+    ``counts`` is indexed by the dimensions and has ``employees`` and ``left``
+    columns. ``sources`` records, per CSV file, its header and the byte offset up to
+    which its rows have been counted.
+    """
+
+    def __init__(self, counts: pd.DataFrame = None, sources: dict = None):
+        if counts is None:
+            counts = pd.DataFrame({"employees": [], "left": []}, dtype="int64",
+                                  index=pd.MultiIndex.from_tuples([], names=DIMENSIONS))
+        self.counts = counts
+        self.sources = sources or {}
+        self._lock = threading.Lock()
+
+    @property
+    def rows(self) -> int:
+        return int(self.counts["employees"].sum())
+
+    def update(self, records: pd.DataFrame) -> int:
+        """Add ``records`` (one row per employee) to the counts; returns the number of rows added."""
+        missing = [column for column in DIMENSIONS + (ATTRITION_COLUMN,) if column not in records.columns]
+        if missing:
+            raise ValueError(f"Records are missing columns {missing}")
+        if records.empty:
+            return 0
+        left = (records[ATTRITION_COLUMN] == ATTRITION_LEFT).astype("int64")
+        new = left.groupby([records[dim] for dim in DIMENSIONS], dropna=False).agg(["size", "sum"])
+        new.columns = ["employees", "left"]
+        self.counts = self.counts.add(new, fill_value=0).astype("int64")
+        return len(records)
+
+    def refresh(self, csv_path: str) -> int:
+        """Count the rows appended to ``csv_path`` since the last refresh; returns how many were added.
+
+        A file that shrank or whose header changed is counted again from scratch. A
+        trailing line without a newline is left for the next refresh, since it may
+        still be being written.
+        """
+        key = os.path.abspath(csv_path)
+        with self._lock, open(csv_path, "rb") as f:
+            header = f.readline()
+            size = os.fstat(f.fileno()).st_size
+            source = self.sources.get(key)
+            if source is not None and (source["header"] != header.decode("utf-8") or source["offset"] > size):
+                # Not an append: forget everything and count the whole file again
+                self.counts = AttritionCube().counts
+                self.sources = {}
+                source = None
+            offset = source["offset"] if source else len(header)
+            columns = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+            usecols = list(DIMENSIONS) + [ATTRITION_COLUMN]
+            added = 0
+            f.seek(offset)
+            while offset < size:
+                block = f.read(min(READ_BLOCK_BYTES, size - offset))
+                end = block.rfind(b"\n") + 1
+                if end == 0:
+                    break
+                records = pd.read_csv(io.BytesIO(block[:end]), header=None, names=columns, usecols=usecols)
+                added += self.update(records)
+                offset += end
+                f.seek(offset)
+            self.sources[key] = {"header": header.decode("utf-8"), "offset": offset}
+            return added
+
+    def query(self, by=(), **filters) -> pd.DataFrame:
+        """Attrition by the dimensions in ``by``, restricted to ``filters``.
+
+        Each filter is a dimension name mapped to a value or a list of values, e.g.
+        ``query(["job_level"], overtime="Yes")``. Returns one row per group with the
+        ``by`` columns, ``employees``, ``left`` and ``attrition_rate``.
+        """
+        by = list(by)
+        unknown = [dim for dim in by + list(filters) if dim not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimensions {unknown}; expected some of {list(DIMENSIONS)}")
+        counts = self.counts
+        for dim, values in filters.items():
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            counts = counts[counts.index.get_level_values(dim).isin(values)]
+        if by:
+            result = counts.groupby(level=by, dropna=False).sum().reset_index()
+        else:
+            result = counts.sum().to_frame().transpose()
+        result["attrition_rate"] = result["left"] / result["employees"]
+        return result
+
+    def save(self, path: str):
+        """Write the cube as JSON, replacing ``path`` atomically."""
+        with self._lock:
+            cells = self.counts.reset_index()
+            cube = {
+                "format": CUBE_FORMAT,
+                "dimensions": list(DIMENSIONS),
+                "sources": dict(self.sources),
+                "cells": {column: cells[column].tolist() for column in cells.columns},
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cube, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "AttritionCube":
+        with open(path, encoding="utf-8") as f:
+            cube = json.load(f)
+        if cube.get("format") != CUBE_FORMAT or tuple(cube.get("dimensions", ())) != DIMENSIONS:
+            raise ValueError(f"Unsupported attrition cube in {path}")
+        cells = pd.DataFrame(cube["cells"], columns=list(DIMENSIONS) + ["employees", "left"])
+        counts = cells.set_index(list(DIMENSIONS)).astype("int64")
+        return cls(counts, cube["sources"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or incrementally update the attrition cube from a CSV.")
+    parser.add_argument("csv", help="Employee records with the cube dimensions and an attrition column")
+    parser.add_argument("--cube", required=True, help="Cube file to update (created if missing)")
+    parser.add_argument("--by", nargs="*", default=["years_at_company"], choices=DIMENSIONS,
+                        help="Dimensions of the breakdown to print")
+    args = parser.parse_args()
+
+    cube = AttritionCube.load(args.cube) if os.path.exists(args.cube) else AttritionCube()
+    added = cube.refresh(args.csv)
+    cube.save(args.cube)
+    print(f"Added {added} rows from {args.csv}; the cube holds {cube.rows} rows in {len(cube.counts)} cells")
+    print(cube.query(args.by).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+
+import pandas as pd
+
+from executor import ExecutorFull
+
+
+class BatcherStopped(RuntimeError):
+    """Raised to callers whose row was still waiting or being scored when the batcher stopped."""
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one DataFrame per pipeline call.
+
+    Callers ``await submit(row)``. A background task collects queued rows until either
+    ``max_batch_size`` rows are waiting or ``max_wait_ms`` has passed since the first
+    row of the batch arrived, scores them together with the coroutine ``score_fn`` and
+    hands every caller back its own result. Each batch is scored in its own task, so the
+    next batch is collected while the previous one is still running. ``on_build``, if
+    given, receives the seconds spent building each batch's DataFrame.
+
+    At most ``max_queue`` rows wait to be batched; further submissions raise
+    ExecutorFull, like a saturated inference pool. ``stop()`` fails every row that is
+    still waiting or being scored with BatcherStopped, so no caller is left hanging.
+    """
+
+    def __init__(self, score_fn: Callable[[pd.DataFrame], Awaitable[list]], columns: List[str],
+                 max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 on_build: Optional[Callable[[float], None]] = None, max_queue: int = 1024):
+        self.score_fn = score_fn
+        self.columns = columns
+        self.on_build = on_build
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Rows taken off the queue by the batch being collected
+        self._collecting = []
+        # Dispatch task -> the caller futures of its batch
+        self._inflight = {}
+        self._stopped = False
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._stopped = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        error = BatcherStopped("batcher stopped")
+        pending = [future for _, future in self._collecting]
+        self._collecting = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait()[1])
+        tasks = list(self._inflight)
+        for task in tasks:
+            pending += self._inflight[task]
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, row: dict):
+        if self._stopped or self._queue is None:
+            raise BatcherStopped("batcher stopped")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((row, future))
+        except asyncio.QueueFull:
+            raise ExecutorFull(f"{self.max_queue} rows already waiting to be batched")
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for the first row, then gather more until the batch is full or the window closes."""
+        loop = asyncio.get_running_loop()
+        batch = self._collecting = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued before paying for a timed wait
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        self._collecting = []
+        return batch
+
+    async def _score(self, rows: List[dict]) -> list:
+        start = time.perf_counter()
+        input_df = pd.DataFrame.from_records(rows, columns=self.columns)
+        if self.on_build is not None:
+            self.on_build(time.perf_counter() - start)
+        return await self.score_fn(input_df)
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._inflight[task] = [future for _, future in batch]
+            task.add_done_callback(lambda done: self._inflight.pop(done, None))
+
+    async def _dispatch(self, batch: list):
+        rows = [row for row, _ in batch]
+        futures = [future for _, future in batch]
+        try:
+            results = await self._score(rows)
+        except ExecutorFull as e:
+            # The pool is saturated: retrying row by row would only add more submissions
+            results = [e] * len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                results = [e]
+            else:
+                # One bad row must not fail everyone it was batched with, so retry row by row
+                results = []
+                for row in rows:
+                    try:
+                        results.append((await self._score([row]))[0])
+                    except ExecutorFull as full:
+                        # Stop retrying once the pool is full; the remaining rows get the same error
+                        results += [full] * (len(rows) - len(results))
+                        break
+                    except Exception as row_error:
+                        results.append(row_error)
+        for future, result in zip(futures, results):
+            if future.done():  # caller went away
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
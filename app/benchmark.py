@@ -0,0 +1,179 @@
+"""Time each stage of the inference pipeline in-process and gate on regressions.
+
+Stages: building the DataFrame from PredictionRequest objects, the preprocessor
+ColumnTransformer, the SelectFromModel feature selection and the XGBoost classifier,
+plus the end-to-end predict_with_proba call on the pickled pipeline and on its
+compiled inference-only form, and the classifier step evaluated by NumpyForest.
+Results can be saved as a named baseline under benchmarks/baselines/ and later runs
+compared against it; the run exits with status 1 when any stage is slower than the
+baseline by more than --max-regression %.
+
+Examples:
+    python app/benchmark.py --save-baseline main
+    python app/benchmark.py --compare main --max-regression 15
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import sklearn
+import xgboost
+
+from api import FEATURE_COLUMNS, MODEL_REGISTRY_NAME, MODEL_REGISTRY_VERSION, PredictionRequest
+from compiled import compile_pipeline
+from forest import NumpyForest
+from inference import load_pipeline, predict_with_proba, set_nthread
+from loadtest import generate_payloads
+from registry import BASE_DIR, locate_model
+
+BASELINE_DIR = os.path.join(BASE_DIR, "benchmarks", "baselines")
+BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+STAGES = ["build_frame", "preprocessor", "feature_selection", "classifier", "end_to_end", "compiled_end_to_end",
+          "numpy_forest"]
+
+
+def time_call(fn, min_time: float, max_repeats: int) -> float:
+    """Median wall time of ``fn()`` in ms, repeated until ``min_time`` seconds have been spent."""
+    timings = []
+    spent = 0.0
+    while len(timings) < max_repeats and (spent < min_time or len(timings) < 3):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        spent += elapsed
+    return float(np.median(timings) * 1000)
+
+
+def benchmark_batch(model, compiled, forest, requests: list, min_time: float, max_repeats: int) -> dict:
+    """Per-stage median latency in ms for one batch of PredictionRequest objects."""
+    steps = model.named_steps
+    input_df = pd.DataFrame.from_records([request.dict() for request in requests], columns=FEATURE_COLUMNS)
+    encoded = steps["preprocessor"].transform(input_df)
+    selected = steps["feature_selection"].transform(encoded)
+    calls = {
+        "build_frame": lambda: pd.DataFrame.from_records([request.dict() for request in requests], columns=FEATURE_COLUMNS),
+        "preprocessor": lambda: steps["preprocessor"].transform(input_df),
+        "feature_selection": lambda: steps["feature_selection"].transform(encoded),
+        "classifier": lambda: steps["classifier"].predict_proba(selected),
+        "end_to_end": lambda: predict_with_proba(model, input_df),
+        "compiled_end_to_end": lambda: predict_with_proba(compiled, input_df),
+        "numpy_forest": lambda: forest.predict_proba(selected),
+    }
+    return {stage: time_call(calls[stage], min_time, max_repeats) for stage in STAGES}
+
+
+def run_benchmarks(model, compiled, forest, batch_sizes, min_time: float, max_repeats: int, seed: int = 0) -> dict:
+    payloads = generate_payloads(max(batch_sizes), seed=seed)
+    requests = [PredictionRequest(**payload) for payload in payloads]
+    results = {}
+    for size in batch_sizes:
+        # Warm caches and lazy initialisation outside the timed loop
+        benchmark_batch(model, compiled, forest, requests[:size], 0, 1)
+        results[str(size)] = benchmark_batch(model, compiled, forest, requests[:size], min_time, max_repeats)
+        stages = results[str(size)]
+        print(f"batch {size:>6}: " + "  ".join(f"{stage} {stages[stage]:.3f}ms" for stage in STAGES))
+    return results
+
+
+def environment(model_version: str, nthread: int) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "model_version": model_version,
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "sklearn": sklearn.__version__,
+        "xgboost": xgboost.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "xgb_nthread": nthread,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def find_regressions(current: dict, baseline: dict, max_regression: float, min_delta_ms: float) -> list:
+    """Stages slower than the baseline by more than ``max_regression`` percent (and ``min_delta_ms``)."""
+    regressions = []
+    for size, stages in current.items():
+        for stage, ms in stages.items():
+            base_ms = baseline.get(size, {}).get(stage)
+            if base_ms is None or ms - base_ms < min_delta_ms:
+                continue
+            change = (ms / base_ms - 1) * 100 if base_ms else float("inf")
+            if change > max_regression:
+                regressions.append({"batch_size": int(size), "stage": stage, "baseline_ms": base_ms,
+                                    "current_ms": ms, "change_pct": change})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inference pipeline stage by stage.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to spend timing each stage per batch size")
+    parser.add_argument("--max-repeats", type=int, default=200)
+    parser.add_argument("--nthread", type=int, default=int(os.getenv("XGB_NTHREAD", "0")) or os.cpu_count() or 1)
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store the results as benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against benchmarks/baselines/NAME.json")
+    parser.add_argument("--max-regression", type=float, default=float(os.getenv("BENCHMARK_MAX_REGRESSION", "10")),
+                        help="Allowed slowdown per stage in percent")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="Ignore slowdowns smaller than this many ms (timer noise on tiny batches)")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    model_path, model_version = locate_model(MODEL_REGISTRY_NAME, MODEL_REGISTRY_VERSION)
+    model = load_pipeline(model_path, compiled=False)
+    compiled = compile_pipeline(model)
+    classifier = model.named_steps["classifier"]
+    forest = NumpyForest.from_booster(classifier.get_booster(), classifier.classes_)
+    set_nthread(model, args.nthread)
+    print(f"Benchmarking {model_version} with {args.nthread} XGBoost thread(s)")
+
+    report = {
+        "environment": environment(model_version, args.nthread),
+        "results_ms": run_benchmarks(model, compiled, forest, args.batch_sizes, args.min_time, args.max_repeats),
+    }
+
+    status = 0
+    if args.compare:
+        with open(baseline_path(args.compare), encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report["results_ms"], baseline["results_ms"],
+                                       args.max_regression, args.min_delta_ms)
+        report["compared_to"] = {"name": args.compare, "environment": baseline["environment"],
+                                 "max_regression_pct": args.max_regression, "regressions": regressions}
+        for r in regressions:
+            print(f"REGRESSION batch {r['batch_size']} {r['stage']}: "
+                  f"{r['baseline_ms']:.3f}ms -> {r['current_ms']:.3f}ms (+{r['change_pct']:.1f}%)")
+        if regressions:
+            status = 1
+        else:
+            print(f"No stage regressed by more than {args.max_regression}% against '{args.compare}'")
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.save_baseline), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {baseline_path(args.save_baseline)}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
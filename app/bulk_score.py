@@ -0,0 +1,161 @@
+"""Score employee CSV files offline with the model the API serves.
+
+The parent only splits the inputs into tasks and writes results. CSV files are split
+into byte ranges of about --chunk-rows lines, cut at line ends. Each worker reads and
+parses its own range, scores it and sends back just the employee ids, predictions and
+probabilities. Prediction log files are one task each. Records must not contain
+embedded newlines, which holds for the exports written by data_generator.py.
+
+Example:
+    python app/bulk_score.py data/Faker_Data --output predictions.parquet --workers 8
+"""
+import argparse
+import glob
+import io
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from executor import init_worker, predict_in_worker
+from inference import results_frame
+from prediction_log import is_log_file, iter_log_files, read_log, request_columns
+from registry import locate_model
+
+
+def iter_input_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "**", "*.csv"), recursive=True))
+            yield from iter_log_files([path])
+        else:
+            yield path
+
+
+def csv_ranges(path: str, chunk_rows: int):
+    """Split a CSV file into (header, start, end) byte ranges of about ``chunk_rows`` lines each."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        # Size the ranges from the average length of the first lines
+        sample = [len(line) for line, _ in zip(f, range(1000))]
+        chunk_bytes = max(1, sum(sample) * chunk_rows // max(1, len(sample)))
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            # Move on to the end of the line the cut landed in
+            f.readline()
+            end = f.tell() if start + chunk_bytes < size else size
+            yield header, start, end
+            start = end
+
+
+def iter_tasks(paths, chunk_rows: int):
+    """What each worker reads: ("csv", path, (header, start, end)) ranges or ("log", path, None) files."""
+    for path in iter_input_files(paths):
+        if is_log_file(path):
+            # Rescore the logged requests, e.g. with a newer model version
+            yield "log", path, None
+        else:
+            for byte_range in csv_ranges(path, chunk_rows):
+                yield "csv", path, byte_range
+
+
+def read_task(kind: str, path: str, byte_range) -> pd.DataFrame:
+    if kind == "log":
+        return request_columns(read_log(path))
+    header, start, end = byte_range
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return pd.read_csv(io.BytesIO(header + data))
+
+
+def score_task(kind: str, path: str, byte_range):
+    """Worker side: read and score one task; returns (employee ids, predictions, probabilities)."""
+    frame = read_task(kind, path, byte_range)
+    if frame.empty:
+        return frame["employee_id"].to_numpy(), None, None
+    predictions, probabilities = predict_in_worker(frame)
+    return frame["employee_id"].to_numpy(), predictions, probabilities
+
+
+class ResultWriter:
+    """Appends scored chunks to a single Parquet or CSV file."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.parquet = output_path.endswith(".parquet")
+        self._writer = None
+        self._first = True
+
+    def write(self, frame: pd.DataFrame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.output_path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def bulk_score(paths, output_path: str, workers: int, chunk_rows: int, name: str, version: str = None) -> int:
+    """Score every row of the input files on a process pool and write the results in input order."""
+    model_path, model_version = locate_model(name, version)
+    writer = ResultWriter(output_path)
+    # Each worker loads the model once and runs XGBoost single-threaded; parallelism comes from processes
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=init_worker, initargs=(model_path, 1))
+    # Bound the tasks in flight so memory doesn't grow with the input size
+    inflight = deque()
+    n_rows = 0
+
+    def drain_one():
+        employee_ids, predictions, probabilities = inflight.popleft().result()
+        if len(employee_ids):
+            writer.write(results_frame(employee_ids, predictions, probabilities, model_version))
+        return len(employee_ids)
+
+    try:
+        for task in iter_tasks(paths, chunk_rows):
+            inflight.append(pool.submit(score_task, *task))
+            if len(inflight) >= workers * 2:
+                n_rows += drain_one()
+        while inflight:
+            n_rows += drain_one()
+    finally:
+        pool.shutdown(cancel_futures=True)
+        writer.close()
+    return n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="CSV files, prediction log files, or directories of them")
+    parser.add_argument("--output", required=True, help="Destination .parquet or .csv file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-rows", type=int, default=20000, help="Approximate CSV rows per worker task")
+    parser.add_argument("--model-name", default=os.getenv("MODEL_REGISTRY_NAME", "Classification_XGBoost_Prod"))
+    parser.add_argument("--model-version", default=os.getenv("MODEL_REGISTRY_VERSION", ""),
+                        help="Registry version to use; models/model.pkl when omitted")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_rows = bulk_score(args.inputs, args.output, args.workers, args.chunk_rows,
+                        args.model_name, args.model_version)
+    elapsed = time.perf_counter() - start
+    print(f"✓ Scored {n_rows} rows in {elapsed:.1f}s ({n_rows / elapsed:,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
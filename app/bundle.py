@@ -0,0 +1,176 @@
+"""Model bundle: the booster in XGBoost's native format plus a declarative encoder spec.
+
+A bundle is a directory holding
+    booster.ubj  the trained booster, saved with Booster.save_model
+    forest_*.npy the same trees flattened for NumpyForest (binary:logistic only)
+    spec.json    format version, classes, booster settings and the SelectedFeatures
+                 spec (category lists, scaler means and scales, output positions of
+                 the features kept by SelectFromModel)
+
+Loading one needs neither pickle nor imblearn and does not depend on the exact
+sklearn version the model was trained with. load_pipeline() recognises a bundle
+directory and returns the same CompiledPipeline the pickled model compiles to. With
+evaluator="numpy" the trees are scored by NumpyForest and xgboost is never imported.
+That is what makes loading fast: importing xgboost also imports sklearn, which is
+most of the cold start of the default evaluator.
+
+Export a bundle and check it against the original on the test set:
+    python app/bundle.py models/model.pkl --output models/model_bundle --check data/Faker_Data/test.csv
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+
+from compiled import CompiledPipeline, SelectedFeatures, compile_pipeline
+from forest import NumpyForest
+
+BUNDLE_FORMAT = 1
+EVALUATORS = ("xgboost", "numpy")
+BOOSTER_FILE = "booster.ubj"
+SPEC_FILE = "spec.json"
+# Largest probability difference accepted from NumpyForest
+NUMPY_TOLERANCE = 1e-6
+
+
+def is_bundle(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, SPEC_FILE))
+
+
+class BoosterClassifier:
+    """predict_proba over a bare xgboost.Booster, matching XGBClassifier.predict_proba."""
+
+    def __init__(self, booster, classes, objective: str, iteration_range=(0, 0), missing=np.nan):
+        self.booster = booster
+        self.classes_ = np.asarray(classes)
+        self.objective = objective
+        self.iteration_range = tuple(iteration_range)
+        self.missing = missing
+
+    def get_booster(self):
+        return self.booster
+
+    def set_params(self, n_jobs: int = None, **_):
+        if n_jobs:
+            self.booster.set_param({"nthread": n_jobs})
+        return self
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        prob = self.booster.inplace_predict(X, iteration_range=self.iteration_range, missing=self.missing,
+                                            validate_features=False)
+        if prob.ndim == 1:
+            # binary:logistic yields P(class 1) only; expand it the way XGBClassifier does
+            return np.vstack((1 - prob, prob)).transpose()
+        return prob
+
+
+def features_to_spec(features: SelectedFeatures) -> dict:
+    return {
+        "n_features": features.n_features,
+        "numeric": [{"column": column, "mean": None if mean is None else float(mean),
+                     "scale": None if scale is None else float(scale), "index": int(j)}
+                    for column, mean, scale, j in features.numeric],
+        "ordinal": [{"column": column, "categories": [str(c) for c in categories], "index": int(j)}
+                    for column, categories, j in features.ordinal],
+        "onehot": [{"column": column, "categories": [str(c) for c in categories],
+                    "outputs": [[int(k), int(j)] for k, j in outputs]}
+                   for column, categories, outputs in features.onehot],
+    }
+
+
+def features_from_spec(spec: dict) -> SelectedFeatures:
+    return SelectedFeatures(
+        spec["n_features"],
+        [(item["column"], item["mean"], item["scale"], item["index"]) for item in spec["numeric"]],
+        [(item["column"], item["categories"], item["index"]) for item in spec["ordinal"]],
+        [(item["column"], item["categories"], [tuple(pair) for pair in item["outputs"]]) for item in spec["onehot"]],
+    )
+
+
+def save_bundle(pipeline, path: str):
+    """Write ``pipeline`` (a training pipeline or a CompiledPipeline) as a bundle directory."""
+    compiled = compile_pipeline(pipeline)
+    features, classifier = compiled.steps[0][1], compiled.steps[-1][1]
+    objective = classifier.objective if isinstance(classifier.objective, str) else None
+    if objective not in ("binary:logistic", "multi:softprob"):
+        raise ValueError(f"Cannot bundle a classifier with objective {classifier.objective!r}")
+    best_iteration = getattr(classifier.get_booster(), "best_iteration", None)
+    os.makedirs(path, exist_ok=True)
+    classifier.get_booster().save_model(os.path.join(path, BOOSTER_FILE))
+    forest = None
+    if objective == "binary:logistic":
+        forest = NumpyForest.from_booster(classifier.get_booster(), classifier.classes_).save(path)
+    spec = {
+        "format": BUNDLE_FORMAT,
+        "classes": np.asarray(classifier.classes_).tolist(),
+        "objective": objective,
+        "iteration_range": [0, best_iteration + 1] if best_iteration is not None else [0, 0],
+        "missing": None if np.isnan(classifier.missing) else float(classifier.missing),
+        "features": features_to_spec(features),
+        "forest": forest,
+    }
+    with open(os.path.join(path, SPEC_FILE), "w", encoding="utf-8") as f:
+        json.dump(spec, f, indent=2, ensure_ascii=False)
+
+
+def load_bundle(path: str, evaluator: str = "xgboost", mmap: bool = False) -> CompiledPipeline:
+    """Load a bundle directory written by save_bundle.
+
+    ``evaluator`` picks the XGBoost booster or the NumpyForest arrays to score the
+    trees; ``mmap`` memory-maps the NumpyForest arrays instead of reading them.
+    """
+    if evaluator not in EVALUATORS:
+        raise ValueError(f"Unknown evaluator: {evaluator}")
+    with open(os.path.join(path, SPEC_FILE), encoding="utf-8") as f:
+        spec = json.load(f)
+    if spec.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported bundle format {spec.get('format')} in {path}")
+    features = features_from_spec(spec["features"])
+    if evaluator == "numpy":
+        if not spec.get("forest"):
+            raise ValueError(f"Bundle {path} has no NumpyForest arrays")
+        return CompiledPipeline(features, NumpyForest.load(path, spec["forest"], mmap=mmap))
+
+    import xgboost
+
+    booster = xgboost.Booster(model_file=os.path.join(path, BOOSTER_FILE))
+    missing = np.nan if spec["missing"] is None else spec["missing"]
+    classifier = BoosterClassifier(booster, spec["classes"], spec["objective"], spec["iteration_range"], missing)
+    return CompiledPipeline(features, classifier)
+
+
+def main():
+    import pandas as pd
+
+    from compiled import check_parity
+
+    parser = argparse.ArgumentParser(description="Export a pickled pipeline as a model bundle.")
+    parser.add_argument("model", help="Pickled training pipeline")
+    parser.add_argument("--output", required=True, help="Bundle directory to write")
+    parser.add_argument("--check", metavar="CSV", help="Require identical probabilities on this dataset, e.g. the test set")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        pipeline = pickle.load(f)
+    save_bundle(pipeline, args.output)
+    print(f"Saved bundle to {args.output}")
+    if args.check:
+        test_df = pd.read_csv(args.check)
+        # The booster must match exactly; NumpyForest may differ in the last float32 bit
+        for evaluator, tolerance in (("xgboost", 0), ("numpy", NUMPY_TOLERANCE)):
+            try:
+                bundle = load_bundle(args.output, evaluator)
+            except ValueError as e:
+                print(f"Skipping {evaluator}: {str(e)}")
+                continue
+            difference = check_parity(pipeline, bundle, test_df)
+            print(f"Max probability difference ({evaluator}) on {len(test_df)} rows of {args.check}: {difference}")
+            if difference > tolerance:
+                sys.exit(f"Bundle ({evaluator}) does not match the original pipeline")
+
+
+if __name__ == "__main__":
+    main()
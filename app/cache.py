@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from typing import Hashable, List
+
+import pandas as pd
+
+
+class PredictionCache:
+    """Bounded LRU cache of predictions with a per-entry time-to-live.
+
+    Keys are built from the model features only, so two requests that differ just in
+    ``employee_id`` share an entry. The cache remembers which model produced its
+    entries and empties itself when a different model version is set.
+    """
+
+    def __init__(self, feature_columns: List[str], max_entries: int = 10000, ttl_seconds: float = 3600):
+        self.feature_columns = feature_columns
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.model_version = None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def key(self, record: dict) -> Hashable:
+        """Canonical key for one request: its feature values in a fixed column order."""
+        return tuple(record[name] for name in self.feature_columns)
+
+    def keys_for_frame(self, input_df: pd.DataFrame) -> List[Hashable]:
+        return list(input_df[self.feature_columns].itertuples(index=False, name=None))
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value, model_version=None):
+        """Store a prediction; results computed by a model other than the current one are ignored."""
+        if not self.enabled or model_version != self.model_version:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set_model_version(self, model_version):
+        """Drop every entry if predictions are now served by a different model."""
+        if model_version != self.model_version:
+            self._entries.clear()
+            self.model_version = model_version
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "model_version": self.model_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
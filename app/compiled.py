@@ -0,0 +1,201 @@
+"""Inference-only version of the training pipeline.
+
+The training pipeline one-hot encodes and scales every input column, then
+SelectFromModel throws away about half of the encoded columns, and SMOTE sits in
+front of the classifier doing nothing outside of fit. compile_pipeline() folds the
+fitted preprocessor and selector into a single SelectedFeatures step that computes
+only the surviving columns, in the order the booster was trained on, and drops SMOTE.
+
+Export a compiled artifact and check it against the original on the test set:
+    python app/compiled.py models/model.pkl --output models/model_compiled.pkl --check data/Faker_Data/test.csv
+"""
+import argparse
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+class CompileError(Exception):
+    """Raised when a pipeline contains a step that cannot be compiled."""
+
+
+class SelectedFeatures:
+    """Builds the selected encoded columns straight from the raw input DataFrame.
+
+    ``numeric`` holds (column, mean, scale, output index) for scaled columns,
+    ``ordinal`` holds (column, categories, output index) for ordinal codes and
+    ``onehot`` holds (column, categories, [(category index, output index), ...]).
+    Every value is computed with the same float64 operations as the sklearn
+    transformers, so the booster sees bit-identical input.
+    """
+
+    def __init__(self, n_features: int, numeric: list, ordinal: list, onehot: list):
+        self.n_features = n_features
+        self.numeric = numeric
+        self.ordinal = ordinal
+        self.onehot = onehot
+
+    @staticmethod
+    def _codes(values, categories, column: str) -> np.ndarray:
+        codes = pd.Index(categories).get_indexer(values)
+        if (codes < 0).any():
+            unknown = sorted({str(v) for v in np.asarray(values)[codes < 0]})
+            raise ValueError(f"Found unknown categories {unknown} in column {column}")
+        return codes
+
+    def encode(self, input_df: pd.DataFrame) -> tuple:
+        """The preprocessor's share of transform: scaled values and category codes of the inputs that are used."""
+        numeric = []
+        for column, mean, scale, j in self.numeric:
+            values = input_df[column].to_numpy(dtype=np.float64)
+            if mean is not None:
+                values = values - mean
+            if scale is not None:
+                values = values / scale
+            numeric.append(values)
+        ordinal = [self._codes(input_df[column], categories, column) for column, categories, _ in self.ordinal]
+        onehot = [self._codes(input_df[column], categories, column) for column, categories, _ in self.onehot]
+        return len(input_df), numeric, ordinal, onehot
+
+    def select(self, encoded: tuple) -> np.ndarray:
+        """The feature selector's share of transform: lay out the selected columns in booster order."""
+        n_rows, numeric, ordinal, onehot = encoded
+        out = np.empty((n_rows, self.n_features), dtype=np.float64)
+        for (_, _, _, j), values in zip(self.numeric, numeric):
+            out[:, j] = values
+        for (_, _, j), codes in zip(self.ordinal, ordinal):
+            out[:, j] = codes
+        for (_, _, outputs), codes in zip(self.onehot, onehot):
+            for k, j in outputs:
+                out[:, j] = codes == k
+        return out
+
+    def transform(self, input_df: pd.DataFrame) -> np.ndarray:
+        return self.select(self.encode(input_df))
+
+
+class CompiledPipeline:
+    """SelectedFeatures followed by the fitted classifier; a drop-in for the training pipeline at inference."""
+
+    def __init__(self, features: SelectedFeatures, classifier):
+        self.steps = [("features", features), ("classifier", classifier)]
+
+    @property
+    def named_steps(self) -> dict:
+        return dict(self.steps)
+
+    @property
+    def classes_(self):
+        return self.steps[-1][1].classes_
+
+    def predict_proba(self, input_df: pd.DataFrame) -> np.ndarray:
+        return self.steps[-1][1].predict_proba(self.steps[0][1].transform(input_df))
+
+    def predict(self, input_df: pd.DataFrame) -> np.ndarray:
+        return np.asarray(self.classes_)[self.predict_proba(input_df).argmax(axis=1)]
+
+
+def _unwrap(transformer):
+    """The single supported transformer behind a one-step Pipeline."""
+    from sklearn.pipeline import Pipeline
+
+    if isinstance(transformer, Pipeline):
+        if len(transformer.steps) != 1:
+            raise CompileError(f"Cannot compile a {len(transformer.steps)}-step column pipeline")
+        return transformer.steps[0][1]
+    return transformer
+
+
+def _encoded_columns(preprocessor) -> list:
+    """Describe every output column of the preprocessor as (kind, input column, parameters)."""
+    # Imported here so that loading a compiled model never needs sklearn
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+    if not (isinstance(preprocessor.remainder, str) and preprocessor.remainder == "drop"):
+        raise CompileError("Cannot compile a ColumnTransformer that keeps remainder columns")
+    encoded = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or name == "remainder":
+            continue
+        transformer = _unwrap(transformer)
+        if isinstance(transformer, StandardScaler):
+            means = transformer.mean_ if transformer.with_mean else [None] * len(columns)
+            scales = transformer.scale_ if transformer.with_std else [None] * len(columns)
+            encoded += [("numeric", column, (mean, scale)) for column, mean, scale in zip(columns, means, scales)]
+        elif isinstance(transformer, OrdinalEncoder):
+            if transformer.handle_unknown != "error":
+                raise CompileError("Only OrdinalEncoder(handle_unknown='error') can be compiled")
+            encoded += [("ordinal", column, list(categories))
+                        for column, categories in zip(columns, transformer.categories_)]
+        elif isinstance(transformer, OneHotEncoder):
+            if transformer.drop is not None or transformer.handle_unknown != "error":
+                raise CompileError("Only OneHotEncoder(drop=None, handle_unknown='error') can be compiled")
+            for column, categories in zip(columns, transformer.categories_):
+                encoded += [("onehot", column, (list(categories), k)) for k in range(len(categories))]
+        else:
+            raise CompileError(f"Cannot compile transformer {type(transformer).__name__}")
+    return encoded
+
+
+def compile_pipeline(pipeline) -> CompiledPipeline:
+    """Build the inference-only equivalent of a fitted preprocessor/feature_selection/smote/classifier pipeline."""
+    if isinstance(pipeline, CompiledPipeline):
+        return pipeline
+    steps = pipeline.named_steps
+    encoded = _encoded_columns(steps["preprocessor"])
+    selected = steps["feature_selection"].get_support(indices=True)
+
+    numeric, ordinal, onehot = [], [], {}
+    for j, index in enumerate(selected):
+        kind, column, params = encoded[index]
+        if kind == "numeric":
+            numeric.append((column, params[0], params[1], j))
+        elif kind == "ordinal":
+            ordinal.append((column, params, j))
+        else:
+            categories, k = params
+            onehot.setdefault(column, (categories, []))[1].append((k, j))
+    features = SelectedFeatures(len(selected), numeric, ordinal,
+                                [(column, categories, outputs) for column, (categories, outputs) in onehot.items()])
+    return CompiledPipeline(features, pipeline.steps[-1][1])
+
+
+def check_parity(pipeline, compiled: CompiledPipeline, input_df: pd.DataFrame) -> float:
+    """Largest absolute difference between the two models' probabilities on ``input_df``."""
+    expected = pipeline.predict_proba(input_df)
+    actual = compiled.predict_proba(input_df)
+    return float(np.abs(expected - actual).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the training pipeline into an inference-only artifact.")
+    parser.add_argument("model", help="Pickled training pipeline")
+    parser.add_argument("--output", help="Where to pickle the compiled pipeline")
+    parser.add_argument("--check", metavar="CSV", help="Require identical probabilities on this dataset, e.g. the test set")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        pipeline = pickle.load(f)
+    compiled = compile_pipeline(pipeline)
+    features = compiled.steps[0][1]
+    print(f"Compiled {args.model}: {features.n_features} selected features from "
+          f"{len(features.numeric)} numeric, {len(features.ordinal)} ordinal and {len(features.onehot)} one-hot columns")
+
+    if args.check:
+        test_df = pd.read_csv(args.check)
+        difference = check_parity(pipeline, compiled, test_df)
+        print(f"Max probability difference on {len(test_df)} rows of {args.check}: {difference}")
+        if difference != 0:
+            sys.exit("Compiled pipeline does not match the original; not exporting")
+    if args.output:
+        with open(args.output, "wb") as f:
+            pickle.dump(compiled, f)
+        print(f"Saved compiled pipeline to {args.output}")
+
+
+if __name__ == "__main__":
+    # Re-import so the pickle refers to compiled.CompiledPipeline rather than __main__
+    from compiled import main
+    main()
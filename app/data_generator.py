@@ -0,0 +1,340 @@
+"""Synthetic HR attrition dataset generator.
+
+Lives in app/ so the backend image can synthesize load-test and benchmark
+payloads; notebooks/Milestone1/Data_Preprocessing/Data_Generator.py runs it as before.
+"""
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Configuration based on the generation plan ---
+
+NUM_EMPLOYEES = 90000
+
+# Define value ranges and probability distributions
+JOB_ROLES = ['Technology', 'Healthcare', 'Finance', 'Education', 'Media']
+JOB_ROLE_WEIGHTS = [0.30, 0.25, 0.20, 0.15, 0.10]
+
+COMPANY_SIZES = ['Small', 'Medium', 'Large']
+COMPANY_SIZE_WEIGHTS = [0.20, 0.45, 0.35]
+
+EDUCATION_LEVELS = ['High School', 'Associate Degree', 'Bachelor’s Degree', 'Master’s Degree', 'PhD']
+
+GENDERS = ['Male', 'Female']
+JOB_LEVELS = ['Entry', 'Mid', 'Senior']
+MARITAL_STATUSES = ['Single', 'Married', 'Divorced']
+WORK_LIFE_BALANCE = ['Poor', 'Fair', 'Good', 'Excellent']
+JOB_SATISFACTION = ['Low', 'Medium', 'High', 'Very High']
+COMPANY_REPUTATION = ['Poor', 'Fair', 'Good', 'Excellent']
+EMPLOYEE_RECOGNITION = ['Low', 'Medium', 'High', 'Very High']
+PERFORMANCE_RATINGS = ['Low', 'Average', 'High', 'Excellent']
+YES_NO = ['No', 'Yes']
+ATTRITION = ['Stayed', 'Left']
+
+# Every attribute is drawn for all rows at once. Categorical columns are kept as
+# integer codes into the lists above until the DataFrame is built, so the
+# conditional rules below are plain boolean masks over whole columns.
+
+# --- Helper functions to enforce logic and dependencies ---
+
+def choose(rng, size, values, p, categories=None):
+    """Draws `size` values with probabilities `p`, returned as codes into `categories`."""
+    categories = values if categories is None else categories
+    codes = np.array([categories.index(v) for v in values], dtype=np.int8)
+    return codes[rng.choice(len(values), size=size, p=p)]
+
+def choose_where(rng, codes, mask, values, p, categories):
+    """Fills `codes[mask]` with draws from `values`."""
+    codes[mask] = choose(rng, int(mask.sum()), values, p, categories)
+
+def lookup(codes, categories, mapping, default=0.0):
+    """Maps category codes to numbers through a {category: value} dict."""
+    table = np.array([mapping.get(c, default) for c in categories], dtype=np.float64)
+    return table[codes]
+
+def get_job_level(rng, age, years_at_company):
+    """Determines job level based on age and tenure."""
+    codes = np.empty(len(age), dtype=np.int8)
+    junior = (age <= 25) | (years_at_company <= 2)
+    middle = ~junior & (((age >= 26) & (age <= 38)) | ((years_at_company >= 3) & (years_at_company <= 8)))
+    veteran = ~junior & ~middle
+    choose_where(rng, codes, junior, ['Entry', 'Mid'], [0.9, 0.1], JOB_LEVELS)
+    choose_where(rng, codes, middle, ['Entry', 'Mid', 'Senior'], [0.15, 0.75, 0.10], JOB_LEVELS)
+    choose_where(rng, codes, veteran, ['Mid', 'Senior'], [0.3, 0.7], JOB_LEVELS)
+    return codes
+
+def get_monthly_income(rng, job_level, job_role, company_size):
+    """Calculates monthly income based on several factors."""
+    base = {'Entry': 3500, 'Mid': 6500, 'Senior': 12000}
+
+    role_multiplier = {'Technology': 1.25, 'Finance': 1.18, 'Healthcare': 1.1, 'Media': 0.95, 'Education': 0.9}
+    size_multiplier = {'Small': 0.9, 'Medium': 1.0, 'Large': 1.15}
+
+    base_income = lookup(job_level, JOB_LEVELS, base, 3000)
+
+    # Introduce random variation
+    variation = rng.uniform(0.85, 1.15, size=len(job_level))
+
+    income = (base_income * lookup(job_role, JOB_ROLES, role_multiplier, 1.0)
+              * lookup(company_size, COMPANY_SIZES, size_multiplier, 1.0) * variation)
+    return income.astype(np.int64)
+
+def get_education_level(rng, job_level, job_role):
+    """Determines education level based on job level and role."""
+    codes = np.empty(len(job_level), dtype=np.int8)
+    senior = job_level == JOB_LEVELS.index('Senior')
+    senior_academic = senior & np.isin(job_role, [JOB_ROLES.index('Technology'), JOB_ROLES.index('Education')])
+    choose_where(rng, codes, job_level == JOB_LEVELS.index('Entry'), EDUCATION_LEVELS, [0.3, 0.3, 0.35, 0.04, 0.01], EDUCATION_LEVELS)
+    choose_where(rng, codes, job_level == JOB_LEVELS.index('Mid'), EDUCATION_LEVELS, [0.05, 0.1, 0.5, 0.3, 0.05], EDUCATION_LEVELS)
+    choose_where(rng, codes, senior_academic, EDUCATION_LEVELS, [0.01, 0.04, 0.4, 0.4, 0.15], EDUCATION_LEVELS)
+    choose_where(rng, codes, senior & ~senior_academic, EDUCATION_LEVELS, [0.02, 0.08, 0.5, 0.35, 0.05], EDUCATION_LEVELS)
+    return codes
+
+def get_marital_status_and_dependents(rng, age):
+    """Determines marital status and number of dependents based on age."""
+    status = np.empty(len(age), dtype=np.int8)
+    young = age <= 28
+    middle = (age >= 29) & (age <= 45)
+    choose_where(rng, status, young, ['Single', 'Married'], [0.85, 0.15], MARITAL_STATUSES)
+    choose_where(rng, status, middle, MARITAL_STATUSES, [0.20, 0.70, 0.10], MARITAL_STATUSES)
+    choose_where(rng, status, ~young & ~middle, MARITAL_STATUSES, [0.10, 0.60, 0.30], MARITAL_STATUSES)
+
+    dependents = np.empty(len(age), dtype=np.int64)
+    single = status == MARITAL_STATUSES.index('Single')
+    married = status == MARITAL_STATUSES.index('Married')
+    divorced = status == MARITAL_STATUSES.index('Divorced')
+    dependents[single] = rng.choice([0, 1], size=int(single.sum()), p=[0.9, 0.1])
+    dependents[married] = rng.choice([0, 1, 2, 3, 4, 5], size=int(married.sum()), p=[0.1, 0.2, 0.35, 0.2, 0.1, 0.05])
+    dependents[divorced] = rng.choice([0, 1, 2, 3], size=int(divorced.sum()), p=[0.2, 0.4, 0.3, 0.1])
+
+    return status, dependents
+
+def get_attrition(rng, record):
+    """
+    Determines attrition using a log-odds model for stronger correlation.
+    A score is calculated for every row, then converted to a probability.
+    """
+    # Base score: A negative value indicates a baseline tendency to stay.
+    score = np.full(len(record['age']), -2.2)
+
+    # --- Factors increasing attrition risk (positive score contribution) ---
+
+    # Job Satisfaction (very high impact)
+    satisfaction_map = {'Low': 2.5, 'Medium': 1.2, 'High': -0.5, 'Very High': -2.0}
+    score += lookup(record['job_satisfaction'], JOB_SATISFACTION, satisfaction_map)
+
+    # Work-Life Balance
+    wlb_map = {'Poor': 1.5, 'Fair': 0.5, 'Good': -0.5, 'Excellent': -1.0}
+    score += lookup(record['work_life_balance'], WORK_LIFE_BALANCE, wlb_map)
+
+    # Overtime (significant impact)
+    score += 0.8 * (record['overtime'] == YES_NO.index('Yes'))
+
+    # Employee Recognition
+    recognition_map = {'Low': 1.3, 'Medium': 0.2, 'High': -0.6, 'Very High': -1.2}
+    score += lookup(record['employee_recognition'], EMPLOYEE_RECOGNITION, recognition_map)
+
+    # Income Check (being underpaid is a major factor)
+    income_thresholds = {'Entry': 3000, 'Mid': 6000, 'Senior': 11000}
+    score += 1.8 * (record['monthly_income'] < lookup(record['job_level'], JOB_LEVELS, income_thresholds, 99999))
+
+    # Career Stagnation
+    score += 1.5 * ((record['years_at_company'] > 4) & (record['number_of_promotions'] == 0))
+
+    # Early Tenure Risk
+    score += 0.7 * (record['years_at_company'] <= 2)
+
+    # --- Factors decreasing attrition risk (negative score contribution) ---
+
+    # Company Reputation
+    reputation_map = {'Poor': 0.5, 'Fair': 0.1, 'Good': -0.4, 'Excellent': -0.9}
+    score += lookup(record['company_reputation'], COMPANY_REPUTATION, reputation_map)
+
+    # Leadership Opportunities
+    score -= 0.5 * (record['leadership_opportunities'] == YES_NO.index('Yes'))
+
+    # Sigmoid function to convert the score to a probability
+    p_attrition = 1 / (1 + np.exp(-score))
+
+    # Ensure probability is within a reasonable bound
+    p_attrition = np.clip(p_attrition, 0.01, 0.95)
+
+    return (rng.random(len(score)) < p_attrition).astype(np.int8)
+
+def get_happiness_ratings(rng, record, n):
+    """Draws the inter-correlated qualitative ratings from a hidden 'happiness' score."""
+    happiness_score = rng.uniform(0.1, 1.0, size=n)
+    happy = happiness_score > 0.7
+    unhappy = happiness_score < 0.3
+    average = ~happy & ~unhappy
+
+    ratings = {
+        'work_life_balance': (WORK_LIFE_BALANCE,
+                              (['Good', 'Excellent'], [0.6, 0.4]),
+                              (['Poor', 'Fair'], [0.7, 0.3]),
+                              [0.1, 0.3, 0.5, 0.1]),
+        'job_satisfaction': (JOB_SATISFACTION,
+                             (['High', 'Very High'], [0.5, 0.5]),
+                             (['Low', 'Medium'], [0.8, 0.2]),
+                             [0.1, 0.4, 0.4, 0.1]),
+        'company_reputation': (COMPANY_REPUTATION,
+                               (['Good', 'Excellent'], [0.7, 0.3]),
+                               (['Poor', 'Fair'], [0.6, 0.4]),
+                               [0.05, 0.25, 0.6, 0.1]),
+        'employee_recognition': (EMPLOYEE_RECOGNITION,
+                                 (['High', 'Very High'], [0.6, 0.4]),
+                                 (['Low', 'Medium'], [0.7, 0.3]),
+                                 [0.15, 0.5, 0.3, 0.05]),
+    }
+    for column, (categories, happy_dist, unhappy_dist, average_p) in ratings.items():
+        codes = np.empty(n, dtype=np.int8)
+        choose_where(rng, codes, happy, *happy_dist, categories)
+        choose_where(rng, codes, unhappy, *unhappy_dist, categories)
+        choose_where(rng, codes, average, categories, average_p, categories)
+        record[column] = codes
+
+# --- Column-wise data generation ---
+
+CATEGORIES = {
+    'gender': GENDERS,
+    'company_size': COMPANY_SIZES,
+    'job_role': JOB_ROLES,
+    'job_level': JOB_LEVELS,
+    'education_level': EDUCATION_LEVELS,
+    'marital_status': MARITAL_STATUSES,
+    'work_life_balance': WORK_LIFE_BALANCE,
+    'job_satisfaction': JOB_SATISFACTION,
+    'company_reputation': COMPANY_REPUTATION,
+    'employee_recognition': EMPLOYEE_RECOGNITION,
+    'performance_rating': PERFORMANCE_RATINGS,
+    'overtime': YES_NO,
+    'remote_work': YES_NO,
+    'leadership_opportunities': YES_NO,
+    'innovation_opportunities': YES_NO,
+    'attrition': ATTRITION,
+}
+
+def generate_dataset(num_employees, seed=None):
+    """Generates the full dataset with all specified columns and relationships."""
+    rng = np.random.default_rng(seed)
+    n = num_employees
+    record = {}
+
+    # Foundational Attributes
+    record['employee_id'] = np.arange(1, n + 1)
+    age = rng.normal(loc=38, scale=10, size=n).astype(np.int64)  # mean 38, std dev 10
+    age = np.clip(age, 18, 65)  # keep within realistic HR bounds
+    record['age'] = age
+    record['gender'] = choose(rng, n, GENDERS, [0.52, 0.48])
+    record['company_size'] = choose(rng, n, COMPANY_SIZES, COMPANY_SIZE_WEIGHTS)
+    record['job_role'] = choose(rng, n, JOB_ROLES, JOB_ROLE_WEIGHTS)
+
+    # Dependent Attributes
+    max_years = np.maximum(0, age - 18)
+    record['years_at_company'] = rng.integers(0, max_years + 1)
+
+    record['job_level'] = get_job_level(rng, age, record['years_at_company'])
+    record['monthly_income'] = get_monthly_income(rng, record['job_level'], record['job_role'], record['company_size'])
+    record['education_level'] = get_education_level(rng, record['job_level'], record['job_role'])
+    record['marital_status'], record['number_of_dependents'] = get_marital_status_and_dependents(rng, age)
+
+    # Inter-correlated Qualitative Ratings (driven by a hidden 'happiness' score)
+    get_happiness_ratings(rng, record, n)
+
+    # Other Attributes
+    record['performance_rating'] = choose(rng, n, PERFORMANCE_RATINGS, [0.1, 0.5, 0.3, 0.1])
+
+    max_promotions = record['years_at_company'] // 3
+    max_promotions += record['performance_rating'] >= PERFORMANCE_RATINGS.index('High')
+    promotions = rng.integers(0, max_promotions + 1)
+
+    # Ensure promotions are logical with job level
+    entry_overpromoted = (record['job_level'] == JOB_LEVELS.index('Entry')) & (promotions > 1)
+    promotions[entry_overpromoted] = rng.integers(0, 2, size=int(entry_overpromoted.sum()))
+    record['number_of_promotions'] = promotions
+
+    role = record['job_role']
+    level = record['job_level']
+    technology = role == JOB_ROLES.index('Technology')
+    record['overtime'] = ((record['work_life_balance'] == WORK_LIFE_BALANCE.index('Poor'))
+                          | (technology & (rng.random(n) < 0.4))).astype(np.int8)
+    record['distance_from_home'] = np.maximum(1, rng.gamma(2, 10, size=n).astype(np.int64))
+
+    # Healthcare is never remote since it is not in the eligible roles
+    remote_roles = np.isin(role, [JOB_ROLES.index(r) for r in ['Technology', 'Media', 'Finance']])
+    record['remote_work'] = (remote_roles & (rng.random(n) < 0.6)).astype(np.int8)
+
+    record['leadership_opportunities'] = ((level == JOB_LEVELS.index('Senior'))
+                                          | ((level == JOB_LEVELS.index('Mid')) & (rng.random(n) < 0.3))).astype(np.int8)
+    record['innovation_opportunities'] = (technology
+                                          | ((record['company_size'] != COMPANY_SIZES.index('Medium')) & (rng.random(n) < 0.4))).astype(np.int8)
+
+    # Target Variable - Attrition (generated last based on other factors)
+    record['attrition'] = get_attrition(rng, record)
+
+    for column, categories in CATEGORIES.items():
+        record[column] = pd.Categorical.from_codes(record[column], categories=categories)
+
+    return pd.DataFrame(record)
+
+def add_derived_columns(df):
+    """Adds the engineered age columns the cleaned dataset and the API expect."""
+    df['age_before_working'] = df['age'] - df['years_at_company']
+
+    age_bins = [17, 25, 35, 45, 55, 100]
+    age_labels = ['18-25', '26-35', '36-45', '46-55', '55+']
+    df['age_groups'] = pd.cut(df['age'], bins=age_bins, labels=age_labels, right=True)
+    return df
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the synthetic HR attrition dataset.")
+    parser.add_argument("--rows", type=int, default=NUM_EMPLOYEES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data',
+                                                       'Faker_Data', 'synthetic_hr_dataset.csv'),
+                        help="CSV path, or a .parquet path for large runs")
+    args = parser.parse_args()
+
+    # 1. Generate the core data
+    start = time.perf_counter()
+    df = generate_dataset(args.rows, seed=args.seed)
+    print(f"Generated {len(df)} records in {time.perf_counter() - start:.2f}s")
+
+    # 2. Calculate derived columns
+    print("\nCalculating derived columns...")
+    add_derived_columns(df)
+
+    # 3. Define final column order for the output file
+    final_column_order = [
+        'employee_id', 'age', 'gender', 'years_at_company', 'job_role',
+        'monthly_income', 'work_life_balance', 'job_satisfaction',
+        'performance_rating', 'number_of_promotions', 'overtime',
+        'distance_from_home', 'education_level', 'marital_status',
+        'number_of_dependents', 'job_level', 'company_size', 'remote_work',
+        'leadership_opportunities', 'innovation_opportunities',
+        'company_reputation', 'employee_recognition', 'attrition',
+        'age_groups', 'age_before_working'
+    ]
+    df = df[final_column_order]
+
+    # 4. Save to CSV (or Parquet)
+    output_filename = args.output
+    if output_filename.endswith('.parquet'):
+        df.to_parquet(output_filename, index=False)
+    else:
+        df.to_csv(output_filename, index=False, quoting=csv.QUOTE_ALL)
+
+    print(f"\nSuccessfully generated and saved {len(df)} records to '{output_filename}'.")
+
+    # 5. Display a sample of the data and verify constraints
+    print("\n--- Data Sample (First 5 Rows) ---")
+    print(df.head())
+    print("\n--- Data Verification ---")
+    print(f"Number of records: {len(df)}")
+    print(f"Years at company > (Age - 18)? : { (df['years_at_company'] >= (df['age'] - 18)).any() }")
+    print(f"Min age before working: { df['age_before_working'].min() }")
@@ -0,0 +1,110 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from attrition_cube import AttritionCube
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SYNTHETIC_DATA_PATH = os.path.join(BASE_DIR, "data", "Faker_Data", "synthetic_hr_dataset.csv")
+PREPROCESSED_DATA_PATH = os.path.join(BASE_DIR, "data", "Faker_Data", "Preprocessed_Data", "preprocessed_data.csv")
+# Parquet copies of the CSVs, mirroring their paths relative to the repository root
+PARQUET_CACHE_DIR = os.path.join(BASE_DIR, "data", ".cache")
+ATTRITION_CUBE_PATH = os.path.join(PARQUET_CACHE_DIR, "attrition_cube.json")
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+
+
+def _mtime(path: str) -> float:
+    """Modification time used as the cache key, so edited files are picked up on the next rerun."""
+    return os.path.getmtime(path)
+
+
+def _parquet_path(csv_path: str) -> str:
+    relative = os.path.relpath(os.path.abspath(csv_path), BASE_DIR)
+    if relative.startswith(os.pardir):
+        relative = os.path.abspath(csv_path).lstrip(os.sep)
+    return os.path.join(PARQUET_CACHE_DIR, os.path.splitext(relative)[0] + ".parquet")
+
+
+def _to_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    for column in df.columns:
+        if df[column].dtype == object or pd.api.types.is_string_dtype(df[column]):
+            if df[column].nunique() <= CATEGORICAL_MAX_UNIQUE_RATIO * len(df):
+                df[column] = df[column].astype("category")
+    return df
+
+
+# cache_resource hands every session the same DataFrame without copying it; callers must not mutate it
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_table(csv_path: str, mtime: float) -> pd.DataFrame:
+    parquet_path = _parquet_path(csv_path)
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= mtime:
+        return pd.read_parquet(parquet_path)
+    df = _to_categoricals(pd.read_csv(csv_path))
+    try:
+        os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+        df.to_parquet(parquet_path, index=False)
+    except OSError:
+        pass  # read-only data directory: keep serving from the in-memory cache
+    return df
+
+
+def load_table(csv_path: str) -> pd.DataFrame:
+    """Load a CSV once per file version.
+
+    The first load writes a Parquet copy with categorical dtypes under data/.cache/,
+    and later processes read that instead. Results are cached on (path, mtime), so reruns
+    of the Streamlit script don't touch the disk again until the CSV changes.
+    Raises FileNotFoundError if the CSV does not exist.
+    """
+    return _load_table(csv_path, _mtime(csv_path))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _value_counts(csv_path: str, mtime: float, column: str) -> pd.DataFrame:
+    counts = _load_table(csv_path, mtime)[column].value_counts(sort=False)
+    return counts.rename_axis(column).reset_index(name="count")
+
+
+def value_counts(csv_path: str, column: str) -> pd.DataFrame:
+    """Rows per value of ``column``, as a (column, count) frame."""
+    return _value_counts(csv_path, _mtime(csv_path), column)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _group_counts(csv_path: str, mtime: float, columns: tuple) -> pd.DataFrame:
+    df = _load_table(csv_path, mtime)
+    return df.groupby(list(columns), observed=True).size().reset_index(name="count")
+
+
+def group_counts(csv_path: str, columns) -> pd.DataFrame:
+    """Rows per combination of ``columns``, as a frame with one column per key plus ``count``."""
+    return _group_counts(csv_path, _mtime(csv_path), tuple(columns))
+
+
+@st.cache_resource(show_spinner=False)
+def _attrition_cube(cube_path: str) -> AttritionCube:
+    if os.path.exists(cube_path):
+        try:
+            return AttritionCube.load(cube_path)
+        except ValueError:
+            pass  # written by an older version: rebuild it
+    return AttritionCube()
+
+
+def attrition_cube(csv_path: str, cube_path: str = ATTRITION_CUBE_PATH) -> AttritionCube:
+    """The attrition cube over ``csv_path``, brought up to date with any rows appended since the last call.
+
+    One cube is kept per process and saved to ``cube_path``, so a restart only counts
+    the rows appended in the meantime.
+    Raises FileNotFoundError if the CSV does not exist.
+    """
+    cube = _attrition_cube(cube_path)
+    if cube.refresh(csv_path):
+        try:
+            cube.save(cube_path)
+        except OSError:
+            pass  # read-only data directory: the in-memory cube stays current
+    return cube
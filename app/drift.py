@@ -0,0 +1,223 @@
+"""Streaming data-drift monitor for the features of scored requests.
+
+Each feature gets a fixed-size sketch: counts over the training data's decile bins
+for numeric features, and counts per training category (plus one bucket for unseen
+values) for categorical ones. Scoring a request adds it to the sketches in O(1), and
+memory never grows with traffic. The live distributions are compared with the
+baseline built from the training CSV, using the population stability index (PSI)
+and the KL divergence KL(live || baseline).
+
+Recent traffic counts more: with a half-life of H rows, a row observed H rows ago
+weighs half as much as the newest. Instead of shrinking every count on each
+update, new rows get an exponentially growing weight, and the counts are rescaled
+only when that weight gets large. Proportions are unaffected by a common scale.
+
+Build the baseline once from the training data:
+    python app/drift.py data/Faker_Data/train.csv --output models/drift_baseline.json
+"""
+import argparse
+import json
+import os
+from bisect import bisect_right
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from training import BINARY_CATEGORIES, NOMINAL_COLS, NUMERIC_COLS, ORDINAL_CATEGORIES
+
+# Added to every proportion so empty bins don't make PSI/KL infinite
+EPSILON = 1e-4
+# PSI above this is usually read as a significant shift
+PSI_ALERT = 0.2
+# Rescale the counts once the weight of new rows passes 2 ** RESCALE_EXPONENT
+RESCALE_EXPONENT = 40
+# The model's input features, grouped as in the training preprocessor
+NUMERIC_FEATURES = list(NUMERIC_COLS)
+CATEGORICAL_FEATURES = NOMINAL_COLS + list(BINARY_CATEGORIES) + list(ORDINAL_CATEGORIES)
+
+
+class NumericSketch:
+    def __init__(self, edges: List[float]):
+        # Interior bin edges; a value v falls in bin bisect_right(edges, v)
+        self.edges = [float(edge) for edge in edges]
+        self.counts = np.zeros(len(self.edges) + 1)
+
+    def add(self, value, weight: float = 1.0):
+        self.counts[bisect_right(self.edges, value)] += weight
+
+    def add_values(self, values: np.ndarray, weight: float = 1.0):
+        bins = np.searchsorted(self.edges, np.asarray(values, dtype=np.float64), side="right")
+        self.counts += np.bincount(bins, minlength=len(self.counts)) * weight
+
+    def spec(self) -> dict:
+        return {"edges": self.edges}
+
+
+class CategoricalSketch:
+    def __init__(self, categories: List[str]):
+        self.categories = list(categories)
+        self.positions = {category: i for i, category in enumerate(self.categories)}
+        self._index = pd.Index(self.categories)
+        # The last bucket counts values the baseline never saw
+        self.counts = np.zeros(len(self.categories) + 1)
+
+    def add(self, value, weight: float = 1.0):
+        self.counts[self.positions.get(value, len(self.categories))] += weight
+
+    def add_values(self, values: np.ndarray, weight: float = 1.0):
+        # -1 for unseen values; pandas is deprecating them in pd.Categorical(values, categories)
+        codes = self._index.get_indexer(values).astype(np.int64)
+        codes[codes < 0] = len(self.categories)
+        self.counts += np.bincount(codes, minlength=len(self.counts)) * weight
+
+    def spec(self) -> dict:
+        return {"categories": self.categories}
+
+
+def _sketch(spec: dict):
+    return NumericSketch(spec["edges"]) if "edges" in spec else CategoricalSketch(spec["categories"])
+
+
+def _proportions(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    proportions = counts / total if total > 0 else np.zeros_like(counts)
+    proportions = proportions + EPSILON
+    return proportions / proportions.sum()
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index between two count vectors over the same bins."""
+    e, a = _proportions(expected), _proportions(actual)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def kl_divergence(expected: np.ndarray, actual: np.ndarray) -> float:
+    """KL(actual || expected) in nats."""
+    e, a = _proportions(expected), _proportions(actual)
+    return float(np.sum(a * np.log(a / e)))
+
+
+def build_baseline(df: pd.DataFrame, numeric: List[str], categorical: List[str], bins: int = 10,
+                   source: str = None) -> dict:
+    """Bin edges, categories and counts of the training data, in the form DriftMonitor and save_baseline use."""
+    features = {}
+    for name in numeric:
+        values = df[name].to_numpy(dtype=np.float64)
+        # Discrete features repeat quantiles: keep each edge once
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])).tolist()
+        sketch = NumericSketch(edges)
+        sketch.add_values(values)
+        features[name] = {**sketch.spec(), "counts": sketch.counts.tolist()}
+    for name in categorical:
+        sketch = CategoricalSketch(sorted(df[name].astype(str).unique()))
+        sketch.add_values(df[name].astype(str).to_numpy())
+        features[name] = {**sketch.spec(), "counts": sketch.counts.tolist()}
+    return {"source": source, "rows": len(df), "features": features}
+
+
+def load_baseline(path: str, numeric: List[str] = NUMERIC_FEATURES, categorical: List[str] = CATEGORICAL_FEATURES,
+                  bins: int = 10) -> dict:
+    """Read a saved baseline (.json), or build one from a training CSV."""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    df = pd.read_csv(path, usecols=list(numeric) + list(categorical))
+    return build_baseline(df, numeric, categorical, bins, source=os.path.basename(path))
+
+
+def save_baseline(baseline: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f)
+
+
+class DriftMonitor:
+    """Live feature sketches of scored requests, compared with a training baseline.
+
+    Updates run on the event loop, so they need no lock.
+    """
+
+    def __init__(self, baseline: dict, half_life: float = 10000):
+        self.baseline = baseline
+        self.half_life = half_life
+        self.expected = {name: np.asarray(spec["counts"], dtype=np.float64)
+                         for name, spec in baseline["features"].items()}
+        self.sketches = {name: _sketch(spec) for name, spec in baseline["features"].items()}
+        self.rows = 0
+        # The newest row weighs 2 ** _exponent
+        self._exponent = 0.0
+
+    @property
+    def _weight(self) -> float:
+        return 2.0 ** self._exponent
+
+    def _advance(self, n_rows: int):
+        self.rows += n_rows
+        if self.half_life <= 0:
+            return
+        self._exponent += n_rows / self.half_life
+        if self._exponent > RESCALE_EXPONENT:
+            # Rows this far back weigh next to nothing; past 2 ** -1000 they are simply zero.
+            # Called before the new rows are added, so those always keep their weight.
+            scale = 2.0 ** -min(self._exponent, 1000)
+            for sketch in self.sketches.values():
+                sketch.counts *= scale
+            self._exponent = 0.0
+
+    def observe(self, record: dict):
+        """Add one request's features."""
+        self._advance(1)
+        weight = self._weight
+        for name, sketch in self.sketches.items():
+            sketch.add(record[name], weight)
+
+    def observe_frame(self, input_df: pd.DataFrame):
+        """Add every row of a batch; the whole batch gets the weight of its last row."""
+        self._advance(len(input_df))
+        weight = self._weight
+        for name, sketch in self.sketches.items():
+            # A categorical column is binned from its codes, not its values
+            sketch.add_values(input_df[name], weight)
+
+    def effective_rows(self) -> float:
+        """The rows the decayed counts amount to: how much traffic the scores are based on."""
+        if not self.rows:
+            return 0.0
+        total = next(iter(self.sketches.values())).counts.sum()
+        return float(total / self._weight)
+
+    def report(self) -> dict:
+        features = {}
+        for name, sketch in self.sketches.items():
+            features[name] = {
+                "type": "numeric" if isinstance(sketch, NumericSketch) else "categorical",
+                "psi": psi(self.expected[name], sketch.counts) if self.rows else 0.0,
+                "kl_divergence": kl_divergence(self.expected[name], sketch.counts) if self.rows else 0.0,
+            }
+        return {
+            "rows": self.rows,
+            "effective_rows": self.effective_rows(),
+            "half_life_rows": self.half_life,
+            "baseline": {"source": self.baseline.get("source"), "rows": self.baseline.get("rows")},
+            "max_psi": max((feature["psi"] for feature in features.values()), default=0.0),
+            "drifted": sorted(name for name, feature in features.items() if feature["psi"] > PSI_ALERT),
+            "features": features,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the drift baseline from the training data.")
+    parser.add_argument("csv", help="Training CSV")
+    parser.add_argument("--output", required=True, help="Baseline JSON to write (read by the API via DRIFT_BASELINE)")
+    parser.add_argument("--bins", type=int, default=10, help="Quantile bins per numeric feature")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.csv, bins=args.bins)
+    save_baseline(baseline, args.output)
+    size = sum(len(spec["counts"]) for spec in baseline["features"].values())
+    print(f"✓ Baseline of {baseline['rows']} rows, {len(baseline['features'])} features ({size} bins) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
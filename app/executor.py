@@ -0,0 +1,122 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+
+import pandas as pd
+
+from explain import explain_frame
+from inference import load_pipeline, predict_with_proba, predict_with_stages, set_nthread
+
+
+class ExecutorFull(Exception):
+    """Raised when the inference pool already has ``max_pending`` jobs queued or running."""
+
+
+# Model held by each worker process when running with kind="process"
+_worker_model = None
+
+
+def init_worker(model_path: str, nthread: int):
+    """Process pool initializer: load the model once per worker process."""
+    global _worker_model
+    _worker_model = load_pipeline(model_path)
+    set_nthread(_worker_model, nthread)
+
+
+def predict_in_worker(input_df: pd.DataFrame):
+    return predict_with_proba(_worker_model, input_df)
+
+
+def predict_stages_in_worker(input_df: pd.DataFrame):
+    return predict_with_stages(_worker_model, input_df)
+
+
+def explain_in_worker(input_df: pd.DataFrame, columns: list, approximate: bool):
+    return explain_frame(_worker_model, input_df, columns, approximate)
+
+
+class InferenceExecutor:
+    """Runs blocking model calls on a bounded thread or process pool.
+
+    Keeps sklearn/XGBoost work off the asyncio event loop so that /health and other
+    requests stay responsive. At most ``max_pending`` jobs may be queued or running;
+    beyond that ``predict`` raises ExecutorFull instead of letting the backlog grow.
+    If ``on_stages`` is given it is called on the event loop with the per-step
+    timings of every job.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 2, max_pending: int = 64,
+                 nthread: int = None, on_stages: Callable[[dict], None] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        # Split the cores between workers so XGBoost threads don't oversubscribe them
+        self.nthread = nthread or max(1, (os.cpu_count() or 1) // max_workers)
+        self.on_stages = on_stages
+        self.pending = 0
+        # Process pools are created per model by load(), since each worker holds its own copy
+        self._pool = None
+        if kind == "thread":
+            self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="inference")
+
+    async def load(self, model, model_path: str, warmup_df: pd.DataFrame):
+        """Prepare the pool to serve ``model`` and warm it up with ``warmup_df``.
+
+        With threads the model object is shared, so it only needs its thread limit set.
+        With processes a new pool is started from ``model_path`` and warmed before it
+        replaces the old one; jobs already running on the old pool are left to finish.
+        """
+        loop = asyncio.get_running_loop()
+        if self.kind == "thread":
+            set_nthread(model, self.nthread)
+            await loop.run_in_executor(self._pool, partial(predict_with_proba, model, warmup_df))
+            return
+        # Spawn rather than fork: the server process already runs an event loop and threads
+        pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_worker, initargs=(model_path, self.nthread))
+        try:
+            await asyncio.gather(*(loop.run_in_executor(pool, partial(predict_in_worker, warmup_df))
+                                   for _ in range(self.max_workers)))
+        except Exception:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        old_pool, self._pool = self._pool, pool
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+
+    async def _run(self, job):
+        if self.pending >= self.max_pending:
+            raise ExecutorFull(f"{self.pending} inference jobs already pending")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, job)
+        finally:
+            self.pending -= 1
+
+    async def predict(self, model, input_df: pd.DataFrame):
+        """Return ``predict_with_proba(model, input_df)`` computed on the pool."""
+        if self.kind == "process":
+            job = partial(predict_stages_in_worker, input_df)
+        else:
+            job = partial(predict_with_stages, model, input_df)
+        labels, probabilities, timings = await self._run(job)
+        if self.on_stages is not None:
+            self.on_stages(timings)
+        return labels, probabilities
+
+    async def explain(self, model, input_df: pd.DataFrame, columns: list, approximate: bool = False):
+        """Return ``explain_frame(model, input_df, columns, approximate)`` computed on the pool."""
+        if self.kind == "process":
+            job = partial(explain_in_worker, input_df, columns, approximate)
+        else:
+            job = partial(explain_frame, model, input_df, columns, approximate)
+        return await self._run(job)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,148 @@
+import json
+import os
+
+import numpy as np
+
+# Arrays stored in a bundle, one .npy file each so they can be memory-mapped
+FOREST_ARRAYS = ("feature", "threshold", "default_left", "leaf_value")
+# Rows traversed together; bounds the (trees x rows) index arrays to a few MB
+CHUNK_ROWS = 8192
+# Trees are padded to complete binary trees, so their size grows as 2 ** depth
+MAX_DEPTH = 16
+
+
+class NumpyForest:
+    """Gradient-boosted trees flattened into contiguous arrays and evaluated with NumPy.
+
+    Every tree is padded to a complete binary tree of depth ``max_depth`` and stored
+    heap-style: the children of split ``i`` are ``2i + 1`` and ``2i + 2``. Row ``t`` of
+    ``feature``, ``threshold`` and ``default_left`` describes the splits of tree ``t``
+    and row ``t`` of ``leaf_value`` its ``2 ** max_depth`` leaves; a leaf that sits
+    higher up in the original tree is copied into every padded leaf below it. A batch
+    is scored by moving every (tree, row) pair one level down per step, which only
+    needs arithmetic on the heap position, then summing the leaf weights tree by tree
+    in float32 like XGBoost's CPU predictor does.
+    Only binary:logistic boosters with numerical splits are supported.
+    """
+
+    def __init__(self, arrays: dict, base_margin: float, max_depth: int, classes=(0, 1)):
+        for name in FOREST_ARRAYS:
+            setattr(self, name, arrays[name])
+        self.base_margin = np.float32(base_margin)
+        self.max_depth = max_depth
+        self.classes_ = np.asarray(classes)
+
+    @classmethod
+    def from_booster(cls, booster, classes=(0, 1)) -> "NumpyForest":
+        model = json.loads(booster.save_raw("json"))
+        learner = model["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"NumpyForest only supports binary:logistic, not {objective}")
+        gbm = learner["gradient_booster"]
+        if gbm["name"] != "gbtree":
+            raise ValueError(f"NumpyForest only supports gbtree boosters, not {gbm['name']}")
+        base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+        # binary:logistic stores the base score as a probability; trees add to its logit
+        base_margin = -np.log(np.float32(1) / np.float32(base_score) - np.float32(1))
+
+        trees = gbm["model"]["trees"]
+        if any(any(tree["split_type"]) for tree in trees):
+            raise ValueError("NumpyForest does not support categorical splits")
+        depth = max(_depth(tree["left_children"], tree["right_children"]) for tree in trees)
+        if depth > MAX_DEPTH:
+            raise ValueError(f"NumpyForest supports trees up to depth {MAX_DEPTH}, not {depth}")
+        n_splits = 2 ** depth - 1
+        arrays = {
+            "feature": np.zeros((len(trees), n_splits), dtype=np.int32),
+            "threshold": np.zeros((len(trees), n_splits), dtype=np.float32),
+            "default_left": np.zeros((len(trees), n_splits), dtype=bool),
+            "leaf_value": np.zeros((len(trees), n_splits + 1), dtype=np.float32),
+        }
+        for t, tree in enumerate(trees):
+            _fill(tree, arrays, t, node=0, position=0, level=0, depth=depth)
+        return cls(arrays, float(base_margin), depth, classes)
+
+    def save(self, path: str, prefix: str = "forest_") -> dict:
+        """Write each array as ``<prefix><name>.npy`` under ``path``; returns the metadata to keep alongside."""
+        for name in FOREST_ARRAYS:
+            np.save(os.path.join(path, f"{prefix}{name}.npy"), getattr(self, name))
+        return {"base_margin": float(self.base_margin), "max_depth": self.max_depth,
+                "n_trees": int(len(self.leaf_value)), "classes": self.classes_.tolist()}
+
+    @classmethod
+    def load(cls, path: str, meta: dict, prefix: str = "forest_", mmap: bool = False) -> "NumpyForest":
+        """Read the arrays written by save(); with ``mmap`` they stay in the page cache, shared between processes."""
+        arrays = {name: np.load(os.path.join(path, f"{prefix}{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in FOREST_ARRAYS}
+        return cls(arrays, meta["base_margin"], meta["max_depth"], meta["classes"])
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        margin = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), CHUNK_ROWS):
+            margin[start:start + CHUNK_ROWS] = self._margin_chunk(X[start:start + CHUNK_ROWS])
+        return margin
+
+    def _margin_chunk(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_features = X.shape
+        n_trees, n_splits = self.feature.shape
+        flat = X.ravel()
+        feature = self.feature.ravel()
+        threshold = self.threshold.ravel()
+        default_right = ~self.default_left.ravel()
+        row_base = (np.arange(n_rows, dtype=np.int64) * n_features)[None, :]
+        tree_base = (np.arange(n_trees, dtype=np.int64) * n_splits)[:, None]
+        # Each tree has n_splits + 1 leaves; with depth 0 (every tree a single leaf) n_splits is 0
+        leaf_base = (np.arange(n_trees, dtype=np.int64) * (n_splits + 1))[:, None]
+        has_missing = np.isnan(flat).any()
+        # position[t, r] is the heap position of row r in tree t
+        position = np.zeros((n_trees, n_rows), dtype=np.int64)
+        for _ in range(self.max_depth):
+            split = tree_base + position
+            values = flat[row_base + feature[split]]
+            go_right = ~(values < threshold[split])
+            if has_missing:
+                go_right = np.where(np.isnan(values), default_right[split], go_right)
+            position = 2 * position + 1 + go_right
+        leaf_values = self.leaf_value.ravel()[leaf_base + position - n_splits]
+        margin = np.full(n_rows, self.base_margin, dtype=np.float32)
+        for tree_values in leaf_values:
+            margin += tree_values
+        return margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        margin = self.predict_margin(X)
+        prob = np.float32(1) / (np.float32(1) + np.exp(-margin))
+        return np.vstack((1 - prob, prob)).transpose()
+
+
+def _fill(tree: dict, arrays: dict, t: int, node: int, position: int, level: int, depth: int):
+    """Copy ``node`` of an XGBoost JSON tree and its subtree to heap ``position`` of tree ``t``."""
+    left = tree["left_children"][node]
+    if level == depth:
+        arrays["leaf_value"][t, position - (2 ** depth - 1)] = tree["split_conditions"][node]
+        return
+    if left == -1:
+        # A shallow leaf: both padded children lead to the same leaf weight
+        _fill(tree, arrays, t, node, 2 * position + 1, level + 1, depth)
+        _fill(tree, arrays, t, node, 2 * position + 2, level + 1, depth)
+        return
+    arrays["feature"][t, position] = tree["split_indices"][node]
+    arrays["threshold"][t, position] = tree["split_conditions"][node]
+    arrays["default_left"][t, position] = tree["default_left"][node]
+    _fill(tree, arrays, t, left, 2 * position + 1, level + 1, depth)
+    _fill(tree, arrays, t, tree["right_children"][node], 2 * position + 2, level + 1, depth)
+
+
+def _depth(left: list, right: list) -> int:
+    """Number of edges on the longest root-to-leaf path."""
+    deepest = 0
+    stack = [(0, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if left[node] == -1:
+            deepest = max(deepest, depth)
+        else:
+            stack += [(left[node], depth + 1), (right[node], depth + 1)]
+    return deepest
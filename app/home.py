@@ -1,6 +1,5 @@
 import streamlit as st
-import pandas as pd
-import os
+from data_store import SYNTHETIC_DATA_PATH, load_table
 
 def home_page():
     """Home page content."""
@@ -12,10 +11,7 @@ def home_page():
 
     st.header("Data", divider="gray")
     try:
-        base = os.path.dirname(__file__)
-        path = os.path.join(base, "..", "data", "Faker_Data", "synthetic_hr_dataset.csv")
-        path = os.path.abspath(path)
-        df = pd.read_csv(path)
+        df = load_table(SYNTHETIC_DATA_PATH)
         st.dataframe(df)
     except FileNotFoundError:
         st.warning("Data file not found. Please ensure synthetic_hr_dataset.csv exists.")
\ No newline at end of file
@@ -0,0 +1,135 @@
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from bundle import is_bundle, load_bundle
+from compiled import CompileError, SelectedFeatures, check_parity, compile_pipeline
+
+# Serve the inference-only form of the training pipeline (see compiled.py); set to 0
+# to run the pickled pipeline as is.
+COMPILED_PIPELINE = os.getenv("COMPILED_PIPELINE", "1") == "1"
+# How bundles score their trees: "xgboost" (the booster) or "numpy" (NumpyForest, no
+# xgboost import); MODEL_MMAP=1 memory-maps the NumpyForest arrays.
+MODEL_EVALUATOR = os.getenv("MODEL_EVALUATOR", "xgboost")
+MODEL_MMAP = os.getenv("MODEL_MMAP", "0") == "1"
+
+
+# A valid employee profile used to build synthetic warm-up batches
+WARMUP_RECORD = {
+    "employee_id": 8342, "age": 30, "gender": "Male", "years_at_company": 6, "job_role": "Media",
+    "monthly_income": 5254.0, "work_life_balance": "Fair", "job_satisfaction": "Low",
+    "performance_rating": "High", "number_of_promotions": 1, "overtime": "No", "distance_from_home": 21,
+    "education_level": "Master’s Degree", "marital_status": "Married", "number_of_dependents": 2,
+    "job_level": "Mid", "company_size": "Small", "remote_work": "Yes", "leadership_opportunities": "Yes",
+    "innovation_opportunities": "Yes", "company_reputation": "Poor", "employee_recognition": "Low",
+    "age_groups": "26-35", "age_before_working": 24,
+}
+
+
+def synthetic_batch(n_rows: int = 64) -> pd.DataFrame:
+    """Build ``n_rows`` valid records by varying the numeric fields of WARMUP_RECORD."""
+    batch = pd.DataFrame([WARMUP_RECORD] * n_rows)
+    offsets = np.arange(n_rows)
+    batch["employee_id"] += offsets
+    batch["monthly_income"] += offsets * 100.0
+    batch["distance_from_home"] = 1 + offsets % 50
+    batch["number_of_promotions"] = offsets % 4
+    return batch
+
+
+def results_frame(employee_ids, predictions, probabilities, version: str = None) -> pd.DataFrame:
+    """Predictions as columns keyed by employee_id, the bulk counterpart of PredictionResponse."""
+    probabilities = probabilities.astype(np.float64)
+    return pd.DataFrame({
+        "employee_id": employee_ids,
+        "prediction": predictions.astype(int),
+        "prediction_label": np.where(predictions == 1, "Stayed", "Left"),
+        "confidence": probabilities.max(axis=1) * 100,
+        "probability_stayed": probabilities[:, 1] * 100,
+        "probability_left": probabilities[:, 0] * 100,
+        "model_version": version,
+    })
+
+
+def load_pipeline(model_path: str, compiled: bool = None):
+    """Load a model bundle directory, or unpickle the trained pipeline compiled for inference unless disabled.
+
+    The compiled form is only used if it reproduces the pipeline's probabilities
+    exactly on a synthetic batch; otherwise the original pipeline is returned.
+    """
+    if is_bundle(model_path):
+        return load_bundle(model_path, MODEL_EVALUATOR, MODEL_MMAP)
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    if not (COMPILED_PIPELINE if compiled is None else compiled):
+        return model
+    try:
+        lean = compile_pipeline(model)
+    except (CompileError, AttributeError, KeyError) as e:
+        print(f"Serving {model_path} uncompiled: {str(e)}")
+        return model
+    if lean is not model and check_parity(model, lean, synthetic_batch()) != 0:
+        print(f"Serving {model_path} uncompiled: compiled probabilities differ")
+        return model
+    return lean
+
+
+def set_nthread(model, nthread: int):
+    """Limit every XGBoost estimator in the pipeline to ``nthread`` threads."""
+    for _, step in getattr(model, "steps", []):
+        if hasattr(step, "get_booster"):
+            step.set_params(n_jobs=nthread)
+
+
+def predict_with_proba(model, input_df: pd.DataFrame):
+    """Score a DataFrame with a single pass through the pipeline.
+
+    Returns the predicted class labels and the full probability matrix. The labels
+    are derived from the probabilities instead of calling model.predict(), which
+    would run the preprocessor, the feature selector and the booster a second time.
+    """
+    labels, probabilities, _ = predict_with_stages(model, input_df)
+    return labels, probabilities
+
+
+def predict_with_stages(model, input_df: pd.DataFrame):
+    """Like predict_with_proba, but also return the seconds spent in each pipeline step.
+
+    The steps are run one by one exactly as Pipeline.predict_proba would: every step
+    but the last transforms the data, except samplers such as SMOTE, which have no
+    transform and only act during fit. The compiled pipeline's single features step
+    is timed in two parts under the training pipeline's names, so the stage metrics
+    mean the same with either model: ``preprocessor`` for scaling and category
+    lookups, ``feature_selection`` for laying out the selected columns.
+    """
+    timings = {}
+    steps = getattr(model, "steps", None)
+    if steps is None:
+        start = time.perf_counter()
+        probabilities = model.predict_proba(input_df)
+        timings["classifier"] = time.perf_counter() - start
+    else:
+        data = input_df
+        for name, step in steps[:-1]:
+            if step is None or step == "passthrough" or not hasattr(step, "transform"):
+                continue
+            start = time.perf_counter()
+            if isinstance(step, SelectedFeatures):
+                encoded = step.encode(data)
+                timings["preprocessor"] = time.perf_counter() - start
+                start = time.perf_counter()
+                data = step.select(encoded)
+                timings["feature_selection"] = time.perf_counter() - start
+                continue
+            data = step.transform(data)
+            timings[name] = time.perf_counter() - start
+        name, final = steps[-1]
+        start = time.perf_counter()
+        probabilities = final.predict_proba(data)
+        timings[name] = time.perf_counter() - start
+    # Same rule as XGBClassifier.predict: ties go to the first class
+    labels = np.asarray(model.classes_)[probabilities.argmax(axis=1)]
+    return labels, probabilities, timings
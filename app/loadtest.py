@@ -0,0 +1,220 @@
+"""Drive /predict with realistic employee profiles and report latency and throughput.
+
+Payloads come from the synthetic data generator (same distributions as the training
+data) or are replayed from a JSONL file with one PredictionRequest per line, or from
+the API's prediction log (a log file or the PREDICTION_LOG_DIR directory).
+
+Examples:
+    python app/loadtest.py --start-server --concurrency 32 --duration 30 --output run.json
+    python app/loadtest.py --url http://127.0.0.1:8000 --rate 500 --replay profiles.jsonl
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from prediction_log import is_log_file, request_payloads
+
+def generate_payloads(n_rows: int, seed: int = None) -> list:
+    """Synthesize ``n_rows`` PredictionRequest payloads with data_generator."""
+    from data_generator import add_derived_columns, generate_dataset
+
+    frame = add_derived_columns(generate_dataset(n_rows, seed=seed)).drop(columns="attrition")
+    return json.loads(frame.to_json(orient="records"))
+
+
+def read_payloads(path: str) -> list:
+    if os.path.isdir(path) or is_log_file(path):
+        return request_payloads([path])
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_payloads(payloads: list, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        for payload in payloads:
+            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+
+class Recorder:
+    """Collects per-request outcomes for the summary."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def record(self, latency: float, status):
+        self.latencies.append(latency)
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        if status != 200:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = np.asarray(self.latencies) * 1000
+        total = len(latencies)
+        percentiles = np.percentile(latencies, [50, 95, 99]) if total else [None] * 3
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": self.errors / total if total else 0.0,
+            "status_codes": self.statuses,
+            "elapsed_s": elapsed,
+            "throughput_rps": total / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                "p50": _float(percentiles[0]),
+                "p95": _float(percentiles[1]),
+                "p99": _float(percentiles[2]),
+                "mean": _float(latencies.mean()) if total else None,
+                "max": _float(latencies.max()) if total else None,
+            },
+        }
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+async def send(client: httpx.AsyncClient, endpoint: str, payload: dict, recorder: Recorder, started: float):
+    """POST one payload; latency counts from ``started`` so queueing delay is included."""
+    try:
+        response = await client.post(endpoint, json=payload)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    recorder.record(time.perf_counter() - started, status)
+
+
+async def run_closed_loop(client, endpoint, payloads, recorder, concurrency: int, deadline: float, max_requests: int):
+    """``concurrency`` workers each send their next request as soon as the last one returns."""
+    source = itertools.cycle(payloads)
+    sent = itertools.count()
+
+    async def worker():
+        while time.perf_counter() < deadline and next(sent) < max_requests:
+            await send(client, endpoint, next(source), recorder, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_open_loop(client, endpoint, payloads, recorder, rate: float, deadline: float, max_requests: int):
+    """Start requests on a fixed schedule of ``rate`` per second, whether or not earlier ones finished.
+
+    Latency is measured from the scheduled start, so a server that falls behind shows
+    up in the percentiles instead of silently lowering the offered load.
+    """
+    source = itertools.cycle(payloads)
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    tasks = []
+    for i in range(max_requests):
+        scheduled = start + i * interval
+        if scheduled >= deadline:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(client, endpoint, next(source), recorder, scheduled)))
+    await asyncio.gather(*tasks)
+
+
+async def run_load(url: str, payloads: list, concurrency: int, rate: float, duration: float,
+                   max_requests: int, timeout: float) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        if rate:
+            await run_open_loop(client, "/predict", payloads, recorder, rate, deadline, max_requests)
+        else:
+            await run_closed_loop(client, "/predict", payloads, recorder, concurrency, deadline, max_requests)
+        elapsed = time.perf_counter() - start
+    return recorder.summary(elapsed)
+
+
+def start_server(port: int, startup_timeout: float = 60.0) -> subprocess.Popen:
+    """Launch ``uvicorn api:app`` on localhost and wait until /health answers."""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--app-dir", app_dir,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+    )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"API did not become healthy within {startup_timeout:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the attrition prediction API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL (ignored with --start-server)")
+    parser.add_argument("--start-server", action="store_true", help="Start a local uvicorn server for the run")
+    parser.add_argument("--port", type=int, default=8000, help="Port for --start-server")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight (closed loop)")
+    parser.add_argument("--rate", type=float, default=0, help="Target requests per second (open loop); overrides --concurrency pacing")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    parser.add_argument("--replay", default=None, help="JSONL file of PredictionRequest payloads, or a prediction log file/directory, to replay")
+    parser.add_argument("--profiles", type=int, default=10000, help="Number of profiles to generate when not replaying")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-profiles", default=None, help="Write the generated payloads to this JSONL file")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    payloads = read_payloads(args.replay) if args.replay else generate_payloads(args.profiles, args.seed)
+    if not payloads:
+        parser.error("no payloads to send")
+    if args.save_profiles:
+        write_payloads(payloads, args.save_profiles)
+
+    server = start_server(args.port) if args.start_server else None
+    url = f"http://127.0.0.1:{args.port}" if server else args.url
+    try:
+        # An open-loop run needs enough connections for the requests that pile up
+        concurrency = max(args.concurrency, int(args.rate)) if args.rate else args.concurrency
+        results = asyncio.run(run_load(url, payloads, concurrency, args.rate, args.duration,
+                                       args.requests or sys.maxsize, args.timeout))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "url": url,
+        "mode": "open" if args.rate else "closed",
+        "concurrency": args.concurrency if not args.rate else None,
+        "target_rps": args.rate or None,
+        "duration_s": args.duration,
+        "payloads": args.replay or f"generated:{len(payloads)}:seed={args.seed}",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **results,
+    }
+    latency = report["latency_ms"]
+    print(f"{report['requests']} requests, {report['throughput_rps']:.1f} req/s, "
+          f"error rate {report['error_rate']:.2%}, "
+          f"p50/p95/p99 {latency['p50'] or 0:.1f}/{latency['p95'] or 0:.1f}/{latency['p99'] or 0:.1f} ms")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
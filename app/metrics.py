@@ -0,0 +1,167 @@
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bounds in seconds, from 100 µs to 10 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(names: Sequence[str], values: Tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+                for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram:
+    """Fixed-bucket histogram; the buckets of each label set are allocated once."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self.series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        series = self.series.get(labelvalues)
+        if series is None:
+            series = self.series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class ServingMetrics:
+    """Request, error, latency and prediction metrics of the API in Prometheus text format.
+
+    Every update happens on the event loop thread (pool jobs report their step timings
+    back through the executor), so plain ints and lists are enough: no locks are taken
+    on the request path.
+    """
+
+    def __init__(self, prefix: str = "attrition"):
+        self.requests = Counter(f"{prefix}_requests_total", "HTTP requests received", ("path",))
+        self.errors = Counter(f"{prefix}_request_errors_total", "Requests that failed, by status code or exception",
+                              ("path", "type"))
+        self.in_flight = Gauge(f"{prefix}_requests_in_flight", "Requests currently being handled")
+        self.latency = Histogram(f"{prefix}_request_latency_seconds", "End-to-end request latency", ("path",))
+        self.stage_latency = Histogram(f"{prefix}_stage_latency_seconds",
+                                       "Time spent per request stage and pipeline step", ("stage",))
+        self.predictions = Counter(f"{prefix}_predictions_total", "Predictions made by the model, by label",
+                                   ("label",))
+        self.in_flight.inc(amount=0)
+        self._families = [self.requests, self.errors, self.in_flight, self.latency,
+                          self.stage_latency, self.predictions]
+
+    def observe_stage(self, stage: str, seconds: float):
+        self.stage_latency.observe(seconds, stage)
+
+    def observe_stages(self, timings: dict):
+        for stage, seconds in timings.items():
+            self.stage_latency.observe(seconds, stage)
+
+    def observe_predictions(self, predictions):
+        left = int((predictions == 0).sum())
+        if left:
+            self.predictions.inc("Left", amount=left)
+        if len(predictions) - left:
+            self.predictions.inc("Stayed", amount=len(predictions) - left)
+
+    def render(self) -> str:
+        lines = []
+        for family in self._families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            lines.extend(family.samples())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests, errors, in-flight requests and latency per path.
+
+    The request start time is left in ``scope["state"]["request_start"]`` so handlers
+    can measure how long body parsing and validation took before they ran.
+    """
+
+    def __init__(self, app, metrics: ServingMetrics, paths: Sequence[str]):
+        self.app = app
+        self.metrics = metrics
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        start = time.perf_counter()
+        scope.setdefault("state", {})["request_start"] = start
+        metrics = self.metrics
+        metrics.requests.inc(path)
+        metrics.in_flight.inc()
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            metrics.errors.inc(path, type(e).__name__)
+            raise
+        else:
+            if status is not None and status >= 400:
+                metrics.errors.inc(path, str(status))
+        finally:
+            metrics.in_flight.dec()
+            metrics.latency.observe(time.perf_counter() - start, path)
@@ -1,24 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import plotly.express as px
 import requests
-import json
-import os
+from api_client import API_URL, ApiError, get_client
 
 
-# FastAPI server URL
-API_URL = os.getenv("API_URL", "http://localhost:8000")
-# API_URL = "http://127.0.0.1:8000"
+# Inputs the what-if analysis can vary: label, lowest and highest value (same ranges as the form)
+WHAT_IF_FEATURES = {
+    "monthly_income": ("Monthly Income ($)", 1000.0, 20000.0),
+    "years_at_company": ("Years at Company", 0, 30),
+    "distance_from_home": ("Distance from Home (km)", 1, 100),
+    "number_of_promotions": ("Number of Promotions", 0, 15),
+    "age": ("Age (Years)", 18, 65),
+    "number_of_dependents": ("Number of Dependents", 0, 10),
+}
 
 
-@st.cache_resource
 def check_api_health():
-    """Check if FastAPI server is running."""
-    try:
-        response = requests.get(f"{API_URL}/health", timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    """Check if FastAPI server is running (a healthy answer is reused for a few seconds)."""
+    return get_client().healthy()
 
 
 # Helper to calculate derived features
@@ -36,6 +37,61 @@ def calculate_age_group(age: int) -> str:
         return "55+"
 
 
+def what_if_payloads(payload: dict, feature: str, low, high, points: int) -> list:
+    """Copies of ``payload`` with ``feature`` swept from ``low`` to ``high``, derived fields kept consistent."""
+    values = np.linspace(low, high, points)
+    if isinstance(payload[feature], int):
+        values = np.unique(np.round(values).astype(int))
+    variants = []
+    for value in values.tolist():
+        variant = dict(payload, **{feature: value})
+        variant["age_groups"] = calculate_age_group(variant["age"])
+        variant["age_before_working"] = variant["age"] - variant["years_at_company"]
+        variants.append(variant)
+    return variants
+
+
+# Runs on its own, so changing the sweep settings doesn't rerun the rest of the page
+@st.fragment
+def what_if_analysis(payload: dict):
+    st.subheader("What-if Analysis")
+    st.write("Vary one input over a range, keeping the others as entered above, and see how the attrition risk changes.")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        feature = st.selectbox("Input to vary", list(WHAT_IF_FEATURES),
+                               format_func=lambda name: WHAT_IF_FEATURES[name][0])
+    label, low, high = WHAT_IF_FEATURES[feature]
+    with col2:
+        value_range = st.slider("Range", low, high, (low, high), key=f"what_if_range_{feature}")
+    with col3:
+        points = st.number_input("Points", 2, 200, 25)
+
+    if st.button("Run What-if", use_container_width=True):
+        variants = what_if_payloads(payload, feature, value_range[0], value_range[1], points)
+        try:
+            # All variants are scored in one batched call
+            results = get_client().predict_batch(variants)
+        except requests.exceptions.ConnectionError:
+            st.error("❌ Cannot connect to FastAPI server")
+            return
+        except requests.exceptions.Timeout:
+            st.error("⏱️ Request timed out")
+            return
+        except ApiError as e:
+            st.error(str(e))
+            st.write(e.text)
+            return
+
+        curve = pd.DataFrame({
+            label: [variant[feature] for variant in variants],
+            "Attrition risk (%)": [result["probability_left"] for result in results],
+        })
+        fig = px.line(curve, x=label, y="Attrition risk (%)", markers=True,
+                      title=f"Attrition Risk by {label}")
+        fig.add_vline(x=payload[feature], line_dash="dash", annotation_text="Current")
+        st.plotly_chart(fig, use_container_width=True)
+
+
 def model_page():
     """Prediction Model page with FastAPI inference."""
     st.title("Prediction Model 💻")
@@ -127,76 +183,75 @@ def model_page():
     age_groups = calculate_age_group(age)
     age_before_working = age - years_at_company
 
+    # Build the payload with all 24 features in correct order
+    payload = {
+        "employee_id": employee_id,
+        "age": age,
+        "gender": gender,
+        "years_at_company": years_at_company,
+        "job_role": job_role,
+        "monthly_income": monthly_income,
+        "work_life_balance": work_life_balance,
+        "job_satisfaction": job_satisfaction,
+        "performance_rating": performance_rating,
+        "number_of_promotions": number_of_promotions,
+        "overtime": overtime,
+        "distance_from_home": distance_from_home,
+        "education_level": education_level,
+        "marital_status": marital_status,
+        "number_of_dependents": number_of_dependents,
+        "job_level": job_level,
+        "company_size": company_size,
+        "remote_work": remote_work,
+        "leadership_opportunities": leadership_opportunities,
+        "innovation_opportunities": innovation_opportunities,
+        "company_reputation": company_reputation,
+        "employee_recognition": employee_recognition,
+        "age_groups": age_groups,
+        "age_before_working": age_before_working,
+    }
+
     # Prediction button
     if st.button("Predict Attrition", type="primary", use_container_width=True):
         try:
-            # Build the payload with all 24 features in correct order
-            payload = {
-                "employee_id": employee_id,
-                "age": age,
-                "gender": gender,
-                "years_at_company": years_at_company,
-                "job_role": job_role,
-                "monthly_income": monthly_income,
-                "work_life_balance": work_life_balance,
-                "job_satisfaction": job_satisfaction,
-                "performance_rating": performance_rating,
-                "number_of_promotions": number_of_promotions,
-                "overtime": overtime,
-                "distance_from_home": distance_from_home,
-                "education_level": education_level,
-                "marital_status": marital_status,
-                "number_of_dependents": number_of_dependents,
-                "job_level": job_level,
-                "company_size": company_size,
-                "remote_work": remote_work,
-                "leadership_opportunities": leadership_opportunities,
-                "innovation_opportunities": innovation_opportunities,
-                "company_reputation": company_reputation,
-                "employee_recognition": employee_recognition,
-                "age_groups": age_groups,
-                "age_before_working": age_before_working,
-            }
-
             # Send request to FastAPI server
-            response = requests.post(f"{API_URL}/predict", json=payload, timeout=10)
-
-            if response.status_code == 200:
-                result = response.json()
-                prediction = result["prediction"]
-                confidence = result["confidence"]
-                prediction_label = result["prediction_label"]
-
-                # Map prediction to label (1 = Stayed, 0 = Left)
-                result_label = "Stayed ✅" if prediction == 1 else "Left ⚠️"
-
-                st.markdown("#### Prediction Result:")
-
-                if prediction == 1:
-                    st.success(f"**{result_label}** ({confidence:.1f}% confidence)")
-                    st.write("This employee is predicted to stay with the company.")
-                else:
-                    st.error(f"**{result_label}** ({confidence:.1f}% confidence)")
-                    st.write(
-                        "This employee exhibits characteristics associated with attrition risk."
-                    )
-
-                # Show additional details
-                st.markdown("---")
-                st.subheader("Prediction Details")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Prediction", prediction_label)
-                with col2:
-                    st.metric("Confidence", f"{confidence:.1f}%")
+            result = get_client().predict(payload)
+            prediction = result["prediction"]
+            confidence = result["confidence"]
+            prediction_label = result["prediction_label"]
+
+            # Map prediction to label (1 = Stayed, 0 = Left)
+            result_label = "Stayed ✅" if prediction == 1 else "Left ⚠️"
+
+            st.markdown("#### Prediction Result:")
+
+            if prediction == 1:
+                st.success(f"**{result_label}** ({confidence:.1f}% confidence)")
+                st.write("This employee is predicted to stay with the company.")
             else:
-                st.error(f"API Error: {response.status_code}")
-                st.write(response.text)
+                st.error(f"**{result_label}** ({confidence:.1f}% confidence)")
+                st.write(
+                    "This employee exhibits characteristics associated with attrition risk."
+                )
 
+            # Show additional details
+            st.markdown("---")
+            st.subheader("Prediction Details")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Prediction", prediction_label)
+            with col2:
+                st.metric("Confidence", f"{confidence:.1f}%")
+        except ApiError as e:
+            st.error(str(e))
+            st.write(e.text)
         except requests.exceptions.ConnectionError:
             st.error("❌ Cannot connect to FastAPI server")
-            st.info("Make sure the FastAPI server is running on http://127.0.0.1:8000")
+            st.info(f"Make sure the FastAPI server is running on {API_URL}")
         except requests.exceptions.Timeout:
             st.error("⏱️ Request timed out")
         except Exception as e:
             st.error(f"Prediction failed: {str(e)}")
+
+    st.markdown("---")
+    what_if_analysis(payload)
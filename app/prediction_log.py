@@ -0,0 +1,294 @@
+"""Asynchronous audit log of every prediction, written in batches to rotating files.
+
+Handlers hand their request and response to ``PredictionLog.log()`` / ``log_frame()``,
+which only append to an in-memory buffer. A background task takes whatever is
+buffered once ``batch_rows`` rows are waiting or ``flush_interval`` seconds have
+passed, and writes it as one JSONL or Parquet batch from a worker thread, so file
+I/O never runs on the event loop. When the buffer is full the ``policy`` decides:
+"drop" discards the new rows and counts them, "block" makes the request wait for
+the writer.
+
+Each row holds the request fields, the response fields (prediction, probabilities,
+model_version), ``endpoint`` and ``logged_at``. Files are named
+``predictions-<time>-<pid>-<n>.jsonl`` (or ``.parquet``) and are written as ``*.open``
+until they reach ``max_bytes`` or ``max_age`` seconds, then renamed. Only closed
+files are read back: the load tester's ``--replay`` and the bulk scorer both
+accept a log directory.
+"""
+import asyncio
+import glob
+import os
+import time
+from collections import deque
+from typing import List, Optional
+
+import pandas as pd
+
+# Columns the log adds to the request fields
+LOG_FIELDS = ["logged_at", "endpoint", "prediction", "prediction_label", "confidence", "probability_stayed",
+              "probability_left", "model_version"]
+LOG_FORMATS = {"jsonl": ".jsonl", "parquet": ".parquet"}
+LOG_GLOB = "predictions-*"
+
+
+class PredictionLog:
+    def __init__(self, directory: str, fmt: str = "jsonl", buffer_rows: int = 100000, batch_rows: int = 1000,
+                 flush_interval: float = 1.0, max_bytes: int = 100 * 2 ** 20, max_age: float = 3600,
+                 policy: str = "drop"):
+        if fmt not in LOG_FORMATS:
+            raise ValueError(f"Unknown prediction log format {fmt!r}; use one of {list(LOG_FORMATS)}")
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown prediction log policy {policy!r}; use 'drop' or 'block'")
+        self.directory = directory
+        self.fmt = fmt
+        self.buffer_rows = buffer_rows
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.policy = policy
+        # (logged_at, endpoint, requests, responses): a dict and a response, or a DataFrame and a batch of them
+        self._pending = deque()
+        self._pending_rows = 0
+        self._ready: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Only touched by the writer thread
+        self._file = None
+        self._writer = None
+        self._path = None
+        self._opened_at = 0.0
+        self._sequence = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.files_closed = 0
+        self.write_errors = 0
+        self.last_error = None
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Write everything still buffered and close the current file."""
+        if self._task is not None:
+            # Let the writer finish its current batch rather than cancel it mid-write
+            self._stopping = True
+            self._ready.set()
+            await self._task
+            self._task = None
+
+    async def log(self, endpoint: str, record: dict, response):
+        await self._append((time.time(), endpoint, record, response), 1)
+
+    async def log_frame(self, endpoint: str, input_df: pd.DataFrame, responses):
+        """Log a scored batch: ``responses`` is a list of PredictionResponse or a results DataFrame."""
+        await self._append((time.time(), endpoint, input_df, responses), len(input_df))
+
+    async def _append(self, entry: tuple, n_rows: int):
+        if self._task is None or self._task.done():
+            # No writer to drain the buffer: dropping beats letting requests wait forever
+            self.rows_dropped += n_rows
+            return
+        # A batch larger than the whole buffer still goes in once the buffer is empty
+        while self._pending_rows and self._pending_rows + n_rows > self.buffer_rows:
+            if self.policy == "drop" or self._task.done():
+                self.rows_dropped += n_rows
+                return
+            self._space.clear()
+            await self._space.wait()
+        self._pending.append(entry)
+        self._pending_rows += n_rows
+        if self._pending_rows >= self.batch_rows:
+            self._ready.set()
+
+    def _take(self) -> list:
+        entries = list(self._pending)
+        self._pending.clear()
+        self._pending_rows = 0
+        if self._space is not None:
+            self._space.set()
+        return entries
+
+    async def _run(self):
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._ready.clear()
+                if self._stopping:
+                    await self._flush(self._write_and_close)
+                    return
+                # Also runs when idle, so an old file is closed (and readable) without new traffic
+                await self._flush(self._write)
+        finally:
+            # Wake requests blocked on a full buffer; _append drops once the writer is gone
+            self._space.set()
+
+    async def _flush(self, write):
+        entries = self._take()
+        try:
+            await asyncio.to_thread(write, entries)
+        except Exception as e:
+            # A failed batch is lost, but the writer keeps going so logging resumes once the
+            # cause (a full disk, a bad directory, an unexpected value) goes away
+            self.write_errors += 1
+            self.rows_dropped += sum(len(entry[2]) if isinstance(entry[2], pd.DataFrame) else 1 for entry in entries)
+            self.last_error = f"{type(e).__name__}: {str(e)}"
+            print(f"Error writing the prediction log: {self.last_error}")
+            await asyncio.to_thread(self._discard_file)
+
+    def _write(self, entries: list):
+        if self._path is not None and time.time() - self._opened_at >= self.max_age:
+            self._close()
+        if not entries:
+            return
+        frame = _entries_frame(entries)
+        if self._path is not None and self._size() >= self.max_bytes:
+            self._close()
+        if self.fmt == "parquet":
+            self._write_parquet(frame)
+        else:
+            if self._path is None:
+                self._open()
+                self._file = open(self._path, "w", encoding="utf-8")
+            self._file.write(frame.to_json(orient="records", lines=True, force_ascii=False))
+            self._file.flush()
+        self.rows_written += len(frame)
+
+    def _write_parquet(self, frame: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is not None and not table.schema.equals(self._writer.schema):
+            # A Parquet file has one schema; start a new file rather than fail the batch
+            self._close()
+        if self._writer is None:
+            self._open()
+            self._writer = pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def _write_and_close(self, entries: list):
+        self._write(entries)
+        self._close()
+
+    def _open(self):
+        self._sequence += 1
+        # The pid keeps the files of workers sharing a directory apart
+        name = (f"predictions-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._sequence:04d}"
+                f"{LOG_FORMATS[self.fmt]}.open")
+        self._path = os.path.join(self.directory, name)
+        self._opened_at = time.time()
+
+    def _size(self) -> int:
+        if self._file is not None:
+            return self._file.tell()
+        return os.path.getsize(self._path) if os.path.exists(self._path) else 0
+
+    def _close(self):
+        if self._path is None:
+            return
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+        os.replace(self._path, self._path[:-len(".open")])
+        self._file = self._writer = self._path = None
+        self.files_closed += 1
+
+    def _discard_file(self):
+        """Give up on the current file after a failed write; the next batch starts a new one.
+
+        The file keeps its ``.open`` suffix, so a possibly truncated last batch is never
+        replayed, but the rows written before the failure stay on disk.
+        """
+        for handle in (self._file, self._writer):
+            try:
+                if handle is not None:
+                    handle.close()
+            except Exception:
+                pass
+        self._file = self._writer = self._path = None
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "format": self.fmt,
+            "policy": self.policy,
+            "buffered_rows": self._pending_rows,
+            "buffer_rows": self.buffer_rows,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "files_closed": self.files_closed,
+            "write_errors": self.write_errors,
+            "last_error": self.last_error,
+            "writer_running": self._task is not None and not self._task.done(),
+            "current_file": os.path.basename(self._path) if self._path else None,
+        }
+
+
+def _entries_frame(entries: list) -> pd.DataFrame:
+    """One row per prediction: request fields, response fields, endpoint and logged_at."""
+    frames, singles = [], []
+    for logged_at, endpoint, input_df, responses in entries:
+        if isinstance(input_df, dict):
+            singles.append({**input_df, **responses.dict(), "endpoint": endpoint, "logged_at": logged_at})
+            continue
+        # Keep the rows in the order they were logged
+        if singles:
+            frames.append(pd.DataFrame(singles))
+            singles = []
+        if not isinstance(responses, pd.DataFrame):
+            responses = pd.DataFrame([response.dict() for response in responses])
+        requests = input_df.reset_index(drop=True)
+        frame = pd.concat([requests, responses.drop(columns=[c for c in responses if c in requests])
+                          .reset_index(drop=True)], axis=1)
+        frames.append(frame.assign(endpoint=endpoint, logged_at=logged_at))
+    if singles:
+        frames.append(pd.DataFrame(singles))
+    frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    # All-missing versions would otherwise change the Parquet schema between batches
+    frame["model_version"] = frame["model_version"].astype("string")
+    # Categorical columns from binary batches would too: Parquet stores them as dictionaries
+    categorical = [name for name in frame.columns if isinstance(frame[name].dtype, pd.CategoricalDtype)]
+    if categorical:
+        frame = frame.astype({name: frame[name].cat.categories.dtype for name in categorical})
+    return frame
+
+
+def iter_log_files(paths: List[str]):
+    """Closed prediction log files, oldest first; directories are searched recursively."""
+    for path in paths:
+        if os.path.isdir(path):
+            files = [f for ext in LOG_FORMATS.values()
+                     for f in glob.glob(os.path.join(path, "**", LOG_GLOB + ext), recursive=True)]
+            yield from sorted(files, key=os.path.basename)
+        else:
+            yield path
+
+
+def is_log_file(path: str) -> bool:
+    return os.path.basename(path).startswith("predictions-") and path.endswith(tuple(LOG_FORMATS.values()))
+
+
+def read_log(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_json(path, lines=True, dtype=False, convert_dates=False)
+
+
+def request_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Drop the columns the log added, leaving the requests as they were received."""
+    return frame.drop(columns=[c for c in LOG_FIELDS if c in frame])
+
+
+def request_payloads(paths: List[str]) -> list:
+    """Every logged request as a /predict payload, in the order they were logged."""
+    return [payload for path in iter_log_files(paths)
+            for payload in request_columns(read_log(path)).to_dict("records")]
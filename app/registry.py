@@ -0,0 +1,83 @@
+import os
+
+import yaml
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# Model served when no registry version is requested: a pickled pipeline or a bundle directory
+DEFAULT_MODEL_PATH = os.getenv("MODEL_PATH", os.path.join(BASE_DIR, "models", "model.pkl"))
+# Local MLflow file store: registry metadata under mlruns/models, artifacts under mlartifacts
+REGISTRY_DIR = os.getenv("MLFLOW_REGISTRY_DIR", os.path.join(BASE_DIR, "mlruns", "models"))
+ARTIFACTS_DIR = os.getenv("MLFLOW_ARTIFACTS_DIR", os.path.join(BASE_DIR, "mlartifacts"))
+ARTIFACTS_SCHEME = "mlflow-artifacts:/"
+
+
+class RegistryError(Exception):
+    """Raised when a registered model version cannot be found or resolved to a file."""
+
+
+def locate_model(name: str, version: str = None):
+    """Return (path, version label) of a registry version, or of models/model.pkl when no version is given."""
+    if version:
+        meta = resolve_version(name, version)
+        return resolve_model_path(meta), f"{meta['name']}/{meta['version']}"
+    if not os.path.exists(DEFAULT_MODEL_PATH):
+        raise FileNotFoundError(f"Model not found at {DEFAULT_MODEL_PATH}")
+    return DEFAULT_MODEL_PATH, f"{os.path.basename(DEFAULT_MODEL_PATH)}@{int(os.path.getmtime(DEFAULT_MODEL_PATH))}"
+
+
+def _read_yaml(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def _model_dir(name: str) -> str:
+    path = os.path.join(REGISTRY_DIR, name)
+    # Names come from API callers, so refuse anything that escapes the registry
+    if os.path.dirname(os.path.normpath(path)) != os.path.normpath(REGISTRY_DIR) or not os.path.isdir(path):
+        raise RegistryError(f"Unknown registered model: {name}")
+    return path
+
+
+def list_versions(name: str) -> dict:
+    """Map version number -> metadata for every version of a registered model."""
+    model_dir = _model_dir(name)
+    versions = {}
+    for entry in os.listdir(model_dir):
+        meta_path = os.path.join(model_dir, entry, "meta.yaml")
+        if entry.startswith("version-") and os.path.exists(meta_path):
+            meta = _read_yaml(meta_path)
+            versions[int(meta["version"])] = meta
+    return versions
+
+
+def resolve_version(name: str, spec: str = "latest") -> dict:
+    """Find a version by number ("2"), "latest", or stage name ("Production")."""
+    versions = list_versions(name)
+    if not versions:
+        raise RegistryError(f"{name} has no registered versions")
+    if spec == "latest":
+        return versions[max(versions)]
+    if spec.isdigit():
+        if int(spec) not in versions:
+            raise RegistryError(f"{name} has no version {spec}")
+        return versions[int(spec)]
+    staged = [number for number, meta in versions.items() if meta.get("current_stage") == spec]
+    if not staged:
+        raise RegistryError(f"{name} has no version in stage {spec}")
+    return versions[max(staged)]
+
+
+def resolve_model_path(meta: dict) -> str:
+    """Local path of the pickled model behind a registry version."""
+    location = meta.get("storage_location", "")
+    if not location.startswith(ARTIFACTS_SCHEME):
+        raise RegistryError(f"Unsupported artifact location: {location}")
+    artifact_dir = os.path.join(ARTIFACTS_DIR, location[len(ARTIFACTS_SCHEME):])
+    mlmodel_path = os.path.join(artifact_dir, "MLmodel")
+    if not os.path.exists(mlmodel_path):
+        raise RegistryError(f"Artifacts for {meta.get('name')} v{meta.get('version')} not found at {artifact_dir}")
+    pickled_model = _read_yaml(mlmodel_path).get("flavors", {}).get("sklearn", {}).get("pickled_model", "model.pkl")
+    model_path = os.path.join(artifact_dir, pickled_model)
+    if not os.path.exists(model_path):
+        raise RegistryError(f"Model file missing: {model_path}")
+    return model_path
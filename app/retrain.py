@@ -0,0 +1,176 @@
+"""Warm-start retraining: continue boosting the production model on newly labeled records.
+
+A full refresh refits the whole pipeline of final_model.ipynb on all of train.csv.
+Here the preprocessor and feature selection of the production pipeline stay frozen:
+only the new records are encoded with them (and resampled with the pipeline's SMOTE
+settings), and the existing XGBClassifier is boosted for --rounds more trees on them.
+The cost grows with the number of new records, not with the size of the history.
+
+The retrained pipeline is scored on the holdout set next to the current one. It is
+registered as a new version of the registered model only if neither weighted F1 nor
+accuracy drops by more than --tolerance; otherwise the script exits with status 1.
+
+Example:
+    python app/retrain.py data/new_records.csv --holdout data/Faker_Data/test.csv --tracking-uri http://localhost:5000
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score
+
+from registry import BASE_DIR, locate_model
+from training import load_dataset
+
+REGISTERED_MODEL = os.getenv("MODEL_REGISTRY_NAME", "Classification_XGBoost_Prod")
+
+
+class RetrainError(Exception):
+    """Raised when a model or a batch of records cannot be used for warm-start retraining."""
+
+
+def load_base_model(name: str = REGISTERED_MODEL, version: str = None, path: str = None):
+    """Unpickle the training pipeline to continue from: a file, or a registry version; returns (model, label)."""
+    if path:
+        label = path
+    else:
+        path, label = locate_model(name, version)
+    if os.path.isdir(path):
+        raise RetrainError(f"{path} is a model bundle; retraining needs the pickled training pipeline")
+    with open(path, "rb") as f:
+        model = pickle.load(f)
+    if not hasattr(model, "steps") or not hasattr(model.steps[-1][1], "get_booster"):
+        raise RetrainError(f"{label} is not a pipeline ending in an XGBoost classifier")
+    return model, label
+
+
+def encode(model, X):
+    """Run the frozen steps before the classifier; samplers such as SMOTE only apply when fitting."""
+    data = X
+    for _, step in model.steps[:-1]:
+        if step is None or step == "passthrough" or hasattr(step, "fit_resample"):
+            continue
+        data = step.transform(data)
+    return np.asarray(data)
+
+
+def resample(model, X: np.ndarray, y: np.ndarray):
+    """Apply a copy of the pipeline's sampler to the new records, as fitting the pipeline would."""
+    sampler = next((step for _, step in model.steps[:-1] if hasattr(step, "fit_resample")), None)
+    if sampler is None:
+        return X, y
+    try:
+        return clone(sampler).fit_resample(X, y)
+    except ValueError as e:
+        # Too few minority rows for k_neighbors, or already balanced past sampling_strategy
+        print(f"Training on the new records without {type(sampler).__name__}: {e}")
+        return X, y
+
+
+def continue_boosting(classifier, X: np.ndarray, y: np.ndarray, rounds: int, learning_rate: float = None):
+    """A new classifier with ``rounds`` trees fitted on (X, y) on top of the trees of ``classifier``."""
+    params = classifier.get_params()
+    params["n_estimators"] = rounds
+    if learning_rate is not None:
+        params["learning_rate"] = learning_rate
+    updated = type(classifier)(**params)
+    # xgboost starts from a copy of the booster: the production classifier is left as it was
+    updated.fit(X, y, xgb_model=classifier.get_booster())
+    updated.set_params(n_estimators=updated.get_booster().num_boosted_rounds())
+    return updated
+
+
+def retrain(model, X_new, y_new, rounds: int, learning_rate: float = None):
+    """The production pipeline with its classifier boosted further on the new records."""
+    if y_new.nunique() < 2:
+        raise RetrainError("The new records need both Left and Stayed labels")
+    X, y = resample(model, encode(model, X_new), y_new.to_numpy())
+    name, classifier = model.steps[-1]
+    updated = continue_boosting(classifier, X, y, rounds, learning_rate)
+    return type(model)(model.steps[:-1] + [(name, updated)])
+
+
+def evaluate(model, X, y) -> dict:
+    predictions = model.predict(X)
+    return {"f1_score": f1_score(y, predictions, average="weighted"), "accuracy": accuracy_score(y, predictions)}
+
+
+def regressions(before: dict, after: dict, tolerance: float) -> list:
+    """Metrics of ``after`` that are worse than ``before`` by more than ``tolerance``."""
+    return [metric for metric in before if after[metric] < before[metric] - tolerance]
+
+
+def register(model, name: str, experiment: str, tracking_uri: str, params: dict, metrics: dict, X_sample):
+    """Log the retrained pipeline to MLflow and register it as a new version of ``name``; returns the version."""
+    import mlflow
+    import mlflow.sklearn
+
+    if tracking_uri:
+        mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment(experiment)
+    with mlflow.start_run(run_name="warm-start"):
+        mlflow.set_tags({"retrain.base": params["base_model"]})
+        mlflow.log_params(params)
+        mlflow.log_metrics(metrics)
+        # cloudpickle, like the registered models: registry.py loads the pickled_model file
+        info = mlflow.sklearn.log_model(model, name="model", serialization_format="cloudpickle",
+                                        signature=mlflow.models.infer_signature(X_sample, model.predict(X_sample)),
+                                        registered_model_name=name)
+    return info.registered_model_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Continue boosting the production model on new labeled records.")
+    parser.add_argument("new_data", nargs="+", help="CSV files of newly labeled records (with the attrition column)")
+    parser.add_argument("--holdout", default=os.path.join(BASE_DIR, "data", "Faker_Data", "test.csv"))
+    parser.add_argument("--name", default=REGISTERED_MODEL, help="Registered model to continue and register to")
+    parser.add_argument("--base-version", default="Production", help="Registry version to continue: 2, latest, Production")
+    parser.add_argument("--base-model", help="Continue this pickled pipeline instead of a registry version")
+    parser.add_argument("--rounds", type=int, default=20, help="Trees to add")
+    parser.add_argument("--learning-rate", type=float, help="Learning rate of the added trees (default: the model's)")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Largest holdout F1/accuracy drop accepted")
+    parser.add_argument("--experiment", default="classification_models", help="MLflow experiment")
+    parser.add_argument("--tracking-uri", default=os.getenv("MLFLOW_TRACKING_URI"))
+    parser.add_argument("--no-register", action="store_true", help="Only evaluate the retrained model")
+    parser.add_argument("--output", help="Also pickle the accepted pipeline to this path")
+    args = parser.parse_args()
+
+    model, base_label = load_base_model(args.name, args.base_version, args.base_model)
+    parts = [load_dataset(path) for path in args.new_data]
+    X_new = pd.concat([X for X, _ in parts], ignore_index=True)
+    y_new = pd.concat([y for _, y in parts], ignore_index=True)
+
+    start = time.perf_counter()
+    retrained = retrain(model, X_new, y_new, args.rounds, args.learning_rate)
+    seconds = time.perf_counter() - start
+    n_trees = retrained.steps[-1][1].get_booster().num_boosted_rounds()
+    print(f"✓ Added {args.rounds} trees ({n_trees} in total) on {len(X_new)} new records in {seconds:.2f}s")
+
+    X_holdout, y_holdout = load_dataset(args.holdout)
+    before, after = evaluate(model, X_holdout, y_holdout), evaluate(retrained, X_holdout, y_holdout)
+    for metric in before:
+        print(f"{metric:>10}: {before[metric]:.4f} -> {after[metric]:.4f}")
+    worse = regressions(before, after, args.tolerance)
+    if worse:
+        print(f"Not registering: holdout {', '.join(worse)} regressed")
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            pickle.dump(retrained, f)
+    if not args.no_register:
+        params = {"base_model": base_label, "rounds": args.rounds, "learning_rate": args.learning_rate,
+                  "new_records": len(X_new), "n_trees": n_trees}
+        metrics = {**after, **{f"base_{metric}": value for metric, value in before.items()}, "retrain_time_s": seconds}
+        version = register(retrained, args.name, args.experiment, args.tracking_uri, params, metrics,
+                           X_new.sample(min(5, len(X_new)), random_state=0))
+        print(f"Registered {args.name} version {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Hyperparameter search over the model families of final_model.ipynb.
+
+The notebook refits the ColumnTransformer, SelectKBest and SMOTE for every
+parameter combination. Those steps don't depend on the classifier's
+hyperparameters, so here they are fitted once per cross-validation fold and the
+encoded, resampled folds are cached as .npy files under data/.cache/search/, keyed
+on the data files and settings. Candidates then only fit their classifier on the
+cached (memory-mapped) arrays, spread over a process pool.
+
+Each model family is searched with successive halving: all of its parameter
+combinations are scored on a small share of each fold's training rows, and only
+the best 1/--factor of them go on to the next round with --factor times more rows,
+until the last round uses all of them. The best configuration of each family is
+then refitted on the whole training set and evaluated on the test set.
+
+Every candidate is logged to MLflow as a run with its parameters, cross-validated
+weighted F1 per round and fit wall-clock time, nested under one run for the whole
+search. The refitted winners are logged with their test f1_score and accuracy and
+the fitted pipeline, like the notebook's runs.
+
+Example:
+    python app/search.py --train data/Faker_Data/train.csv --test data/Faker_Data/test.csv --workers 8
+"""
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from xgboost import XGBClassifier
+
+from registry import BASE_DIR
+from training import (SELECT_K, SMOTE_PARAMS, assemble_pipeline, build_preprocessor, build_selector, build_smote,
+                      load_dataset)
+
+# Estimators run single-threaded: the parallelism comes from the process pool
+SEARCH_SPACE = {
+    "RandomForest": (RandomForestClassifier(random_state=42, max_features="sqrt", n_jobs=1), {
+        "n_estimators": [50, 100],
+        "max_depth": [10, 15, 20],
+        "min_samples_split": [10, 20],
+        "min_samples_leaf": [4, 8],
+    }),
+    "KNN": (KNeighborsClassifier(n_jobs=1), {
+        "n_neighbors": [3, 5, 7],
+        "weights": ["uniform", "distance"],
+    }),
+    "XGBoost": (XGBClassifier(eval_metric="logloss", random_state=42, n_jobs=1), {
+        "n_estimators": [100, 200],
+        "max_depth": [3, 5, 7],
+        "learning_rate": [0.05, 0.1, 0.2],
+    }),
+    "LogisticRegression": (LogisticRegression(max_iter=2000, solver="liblinear"), {
+        "C": [0.1, 1, 10],
+        "penalty": ["l1", "l2"],
+    }),
+    "NaiveBayes": (GaussianNB(), {
+        "var_smoothing": [1e-9, 1e-8, 1e-7],
+    }),
+}
+CACHE_DIR = os.path.join(BASE_DIR, "data", ".cache", "search")
+# Bump when the cached arrays change meaning
+CACHE_FORMAT = 1
+FULL = "full"
+
+
+def cache_key(train_path: str, test_path: str, n_folds: int, seed: int) -> str:
+    """Identify the cached folds by the data files (path, size, mtime) and every setting that shapes them."""
+    stats = [(os.path.abspath(path), os.path.getsize(path), os.path.getmtime(path)) for path in (train_path, test_path)]
+    settings = [CACHE_FORMAT, stats, n_folds, seed, SMOTE_PARAMS, SELECT_K]
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def prepare_split(cache_dir: str, split, train_path: str, test_path: str, n_folds: int, seed: int):
+    """Fit the preprocessing steps on one fold (or on the whole training set) and cache the arrays.
+
+    ``split`` is a fold number, or FULL for the whole training set with the test set
+    as validation; the fitted steps of FULL are pickled too, to assemble the final
+    pipelines. Training rows are shuffled after SMOTE, so any prefix is a random
+    subsample for successive halving.
+    """
+    X, y = load_dataset(train_path)
+    if split == FULL:
+        X_train, y_train = X, y
+        X_val, y_val = load_dataset(test_path)
+    else:
+        train_index, val_index = list(StratifiedKFold(n_folds, shuffle=True, random_state=seed).split(X, y))[split]
+        X_train, y_train, X_val, y_val = X.iloc[train_index], y.iloc[train_index], X.iloc[val_index], y.iloc[val_index]
+    preprocessor, selector, smote = build_preprocessor(), build_selector(), build_smote()
+    encoded = selector.fit_transform(preprocessor.fit_transform(X_train), y_train)
+    X_resampled, y_resampled = smote.fit_resample(encoded, y_train)
+    order = np.random.default_rng(seed).permutation(len(y_resampled))
+    arrays = {
+        "X_train": np.asarray(X_resampled, dtype=np.float64)[order],
+        "y_train": np.asarray(y_resampled)[order],
+        "X_val": selector.transform(preprocessor.transform(X_val)),
+        "y_val": np.asarray(y_val),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(cache_dir, f"{split}_{name}.npy"), array)
+    if split == FULL:
+        with open(os.path.join(cache_dir, "full_steps.pkl"), "wb") as f:
+            pickle.dump((preprocessor, selector, smote), f)
+    return split, len(y_resampled)
+
+
+def load_split(cache_dir: str, split) -> dict:
+    return {name: np.load(os.path.join(cache_dir, f"{split}_{name}.npy"), mmap_mode="r")
+            for name in ("X_train", "y_train", "X_val", "y_val")}
+
+
+def fit_candidate(cache_dir: str, split, family: str, params: dict, n_rows: int = None):
+    """Fit one configuration on the first ``n_rows`` cached training rows of ``split`` and score it.
+
+    Returns (weighted F1 on the validation rows, accuracy, fit seconds, fitted estimator or None).
+    The estimator is only returned for FULL, where it becomes part of the final pipeline.
+    """
+    data = load_split(cache_dir, split)
+    estimator = clone(SEARCH_SPACE[family][0]).set_params(**params)
+    n_rows = n_rows or len(data["y_train"])
+    start = time.perf_counter()
+    estimator.fit(np.asarray(data["X_train"][:n_rows]), np.asarray(data["y_train"][:n_rows]))
+    seconds = time.perf_counter() - start
+    predictions = estimator.predict(np.asarray(data["X_val"]))
+    f1 = f1_score(data["y_val"], predictions, average="weighted")
+    accuracy = accuracy_score(data["y_val"], predictions)
+    return f1, accuracy, seconds, estimator if split == FULL else None
+
+
+def halving_fractions(n_candidates: int, factor: int, smallest_train: int, min_rows: int) -> list:
+    """Share of the training rows used in each round, ending at 1.0.
+
+    One round per 1/factor cut needed to go from ``n_candidates`` to one, fewer if
+    the first round would get under ``min_rows`` rows.
+    """
+    n_rounds = 1 + (math.ceil(math.log(n_candidates, factor)) if n_candidates > 1 else 0)
+    while n_rounds > 1 and smallest_train / factor ** (n_rounds - 1) < min_rows:
+        n_rounds -= 1
+    return [1 / factor ** (n_rounds - 1 - r) for r in range(n_rounds)]
+
+
+class FamilySearch:
+    """Successive halving state for the parameter grid of one model family."""
+
+    def __init__(self, family: str, fractions: list, factor: int):
+        self.family = family
+        self.fractions = fractions
+        self.factor = factor
+        self.candidates = [{"family": family, "params": params, "cv_f1": [], "rows": [], "fit_seconds": 0.0}
+                           for params in ParameterGrid(SEARCH_SPACE[family][1])]
+        self.alive = list(range(len(self.candidates)))
+        self.round = 0
+        self.outstanding = 0
+        self._fold_scores = {}
+
+    def record(self, candidate: int, f1: float, seconds: float):
+        self._fold_scores.setdefault(candidate, []).append(f1)
+        self.candidates[candidate]["fit_seconds"] += seconds
+        self.outstanding -= 1
+
+    def finish_round(self, rows: int) -> bool:
+        """Average the fold scores of the round and keep the best; returns True when the search is over."""
+        for candidate in self.alive:
+            self.candidates[candidate]["cv_f1"].append(float(np.mean(self._fold_scores[candidate])))
+            self.candidates[candidate]["rows"].append(rows)
+        self._fold_scores = {}
+        self.alive.sort(key=lambda candidate: self.candidates[candidate]["cv_f1"][-1], reverse=True)
+        self.round += 1
+        if self.round == len(self.fractions):
+            self.alive = self.alive[:1]
+            return True
+        self.alive = self.alive[:max(1, math.ceil(len(self.alive) / self.factor))]
+        return False
+
+    @property
+    def best(self) -> dict:
+        return self.candidates[self.alive[0]]
+
+
+def run_search(train_path: str, test_path: str, families: list, n_folds: int = 5, factor: int = 3,
+               min_rows: int = 1000, workers: int = None, seed: int = 42, cache_dir: str = CACHE_DIR):
+    """Search every family on a process pool; returns (per-family FamilySearch, winners, cache dir)."""
+    cache_dir = os.path.join(cache_dir, cache_key(train_path, test_path, n_folds, seed))
+    os.makedirs(cache_dir, exist_ok=True)
+    splits = list(range(n_folds))
+    pool = ProcessPoolExecutor(workers or os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        meta_path = os.path.join(cache_dir, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                train_rows = json.load(f)["train_rows"]
+            print(f"Reusing cached folds in {cache_dir}")
+        else:
+            start = time.perf_counter()
+            futures = [pool.submit(prepare_split, cache_dir, split, train_path, test_path, n_folds, seed)
+                       for split in splits + [FULL]]
+            train_rows = {str(split): rows for split, rows in (future.result() for future in futures)}
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"train_rows": train_rows}, f)
+            print(f"Prepared {n_folds} folds and the full training set in {time.perf_counter() - start:.1f}s")
+
+        smallest = min(train_rows[str(split)] for split in splits)
+        searches = {family: FamilySearch(family, halving_fractions(len(ParameterGrid(SEARCH_SPACE[family][1])),
+                                                                   factor, smallest, min_rows), factor)
+                    for family in families}
+        pending, winners = {}, {}
+
+        def submit_round(search: FamilySearch):
+            fraction = search.fractions[search.round]
+            for candidate in search.alive:
+                params = search.candidates[candidate]["params"]
+                for split in splits:
+                    n_rows = int(train_rows[str(split)] * fraction)
+                    future = pool.submit(fit_candidate, cache_dir, split, search.family, params, n_rows)
+                    pending[future] = ("round", search, candidate)
+                    search.outstanding += 1
+
+        for search in searches.values():
+            submit_round(search)
+        # Each family moves to its next round (or its final refit) as soon as its own round is done
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, search, candidate = pending.pop(future)
+                f1, accuracy, seconds, estimator = future.result()
+                if kind == "refit":
+                    winners[search.family] = {"test_f1": f1, "test_accuracy": accuracy, "fit_seconds": seconds,
+                                              "classifier": estimator}
+                    continue
+                search.record(candidate, f1, seconds)
+                if search.outstanding:
+                    continue
+                rows = int(smallest * search.fractions[search.round])
+                if search.finish_round(rows):
+                    best = search.best
+                    print(f"{search.family}: best CV F1 {best['cv_f1'][-1]:.4f} with {best['params']}")
+                    pending[pool.submit(fit_candidate, cache_dir, FULL, search.family, best["params"])] = \
+                        ("refit", search, None)
+                else:
+                    submit_round(search)
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return searches, winners, cache_dir
+
+
+def final_pipeline(cache_dir: str, classifier):
+    """Put a refitted classifier behind the preprocessing steps fitted on the whole training set."""
+    with open(os.path.join(cache_dir, "full_steps.pkl"), "rb") as f:
+        preprocessor, selector, smote = pickle.load(f)
+    return assemble_pipeline(preprocessor, selector, smote, classifier)
+
+
+def log_to_mlflow(searches: dict, winners: dict, cache_dir: str, train_path: str, settings: dict,
+                  search_seconds: float, experiment: str, tracking_uri: str = None):
+    """One parent run for the search, a nested run per candidate and one per refitted family winner."""
+    import mlflow
+    import mlflow.sklearn
+
+    if tracking_uri:
+        mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment(experiment)
+    X_sample = load_dataset(train_path)[0].sample(5, random_state=0)
+    with mlflow.start_run(run_name=f"search-{time.strftime('%Y%m%d-%H%M%S')}"):
+        mlflow.log_params(settings)
+        mlflow.log_metric("search_wall_clock_s", search_seconds)
+        for search in searches.values():
+            for candidate in search.candidates:
+                with mlflow.start_run(run_name=search.family, nested=True):
+                    mlflow.set_tags({"search.role": "candidate", "search.family": search.family})
+                    # Same parameter names as the notebook's pipeline runs
+                    mlflow.log_params({f"classifier__{k}": v for k, v in candidate["params"].items()})
+                    for step, (rows, f1) in enumerate(zip(candidate["rows"], candidate["cv_f1"])):
+                        mlflow.log_metric("cv_f1", f1, step=step)
+                        mlflow.log_metric("train_rows", rows, step=step)
+                    mlflow.log_metric("rounds", len(candidate["cv_f1"]))
+                    mlflow.log_metric("fit_time_s", candidate["fit_seconds"])
+        for family, winner in winners.items():
+            best = searches[family].best
+            pipeline = final_pipeline(cache_dir, winner["classifier"])
+            with mlflow.start_run(run_name=family, nested=True):
+                mlflow.set_tags({"search.role": "best", "search.family": family})
+                mlflow.log_params({f"classifier__{k}": v for k, v in best["params"].items()})
+                mlflow.log_metric("cv_f1", best["cv_f1"][-1])
+                mlflow.log_metric("f1_score", winner["test_f1"])
+                mlflow.log_metric("accuracy", winner["test_accuracy"])
+                mlflow.log_metric("fit_time_s", winner["fit_seconds"])
+                # cloudpickle, like the registered models: registry.py loads the pickled_model file
+                mlflow.sklearn.log_model(pipeline, name="model", serialization_format="cloudpickle",
+                                         signature=mlflow.models.infer_signature(X_sample, pipeline.predict(X_sample)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter search with cached preprocessing.")
+    parser.add_argument("--train", default=os.path.join(BASE_DIR, "data", "Faker_Data", "train.csv"))
+    parser.add_argument("--test", default=os.path.join(BASE_DIR, "data", "Faker_Data", "test.csv"))
+    parser.add_argument("--models", nargs="+", default=list(SEARCH_SPACE), choices=list(SEARCH_SPACE))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--factor", type=int, default=3, help="Keep the best 1/factor of candidates each round")
+    parser.add_argument("--min-rows", type=int, default=1000, help="Fewest training rows per fold in the first round")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--experiment", default="classification_models", help="MLflow experiment")
+    parser.add_argument("--tracking-uri", default=os.getenv("MLFLOW_TRACKING_URI"))
+    parser.add_argument("--no-mlflow", action="store_true", help="Only print the results")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    searches, winners, cache_dir = run_search(args.train, args.test, args.models, args.folds, args.factor,
+                                              args.min_rows, args.workers, args.seed, args.cache_dir)
+    elapsed = time.perf_counter() - start
+    n_fits = sum(len(c["cv_f1"]) for s in searches.values() for c in s.candidates) * args.folds
+    print(f"✓ Searched {sum(len(s.candidates) for s in searches.values())} configurations "
+          f"({n_fits} fold fits) in {elapsed:.1f}s on {args.workers} worker(s)")
+    for family, winner in winners.items():
+        best = searches[family].best
+        print(f"{family:>20}: CV F1 {best['cv_f1'][-1]:.4f} | test F1 {winner['test_f1']:.4f} "
+              f"accuracy {winner['test_accuracy']:.4f} | {best['params']}")
+
+    if not args.no_mlflow:
+        settings = {"folds": args.folds, "factor": args.factor, "min_rows": args.min_rows, "workers": args.workers,
+                    "seed": args.seed, "models": ",".join(args.models)}
+        log_to_mlflow(searches, winners, cache_dir, args.train, settings, elapsed, args.experiment, args.tracking_uri)
+        print(f"Logged the search to MLflow experiment '{args.experiment}'")
+    if args.output:
+        report = {
+            "search_seconds": elapsed,
+            "families": {family: {"best": searches[family].best, "test_f1": winner["test_f1"],
+                                  "test_accuracy": winner["test_accuracy"], "candidates": searches[family].candidates}
+                         for family, winner in winners.items()},
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Pre-fork production launcher for the API.
+
+``uvicorn --workers N`` starts N independent processes, each importing the
+libraries and unpickling the model in its startup hook, so memory grows with N.
+This launcher imports api.py, loads and warms the model once in a master process,
+freezes the garbage collector's view of those objects and binds the listening
+socket. It then forks the workers. They inherit the model, the compiled pipeline
+and the imported libraries as copy-on-write pages and share them for as long as
+nothing writes to them. All workers accept connections on the same socket.
+
+Each worker runs one inference thread, and XGBoost (and BLAS) with cores / workers
+threads, so N workers saturate the machine without oversubscribing it. The master reports each
+worker's resident, shared and private memory and its proportional share (PSS).
+It does this once all workers are up, every --report-interval seconds, and on
+SIGUSR1. It replaces workers that die and stops them all on SIGTERM or SIGINT. If a
+worker dies during startup, or the workers aren't ready within --ready-timeout
+seconds, the master stops the rest and exits with status 1.
+
+Per-process state (/metrics, /cache/stats, /drift, micro-batches, prediction log
+files) is kept by each worker. Changing the model means restarting the launcher:
+/model/reload would only swap the worker that answered it.
+
+Linux only (fork and /proc). Example:
+    python app/serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+MB = 2 ** 20
+
+
+def memory_usage(pid: int) -> dict:
+    """Resident, shared, private and proportional memory of a process in bytes, from /proc."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "pss": fields.get("Pss", 0),
+    }
+
+
+def memory_report(master_pid: int, worker_pids: list) -> str:
+    lines = [f"{'process':>14} {'RSS MB':>8} {'shared MB':>10} {'private MB':>11} {'PSS MB':>8}"]
+    total_pss = 0
+    for label, pid in [("master", master_pid)] + [(f"worker {pid}", pid) for pid in worker_pids]:
+        try:
+            usage = memory_usage(pid)
+        except OSError:
+            continue
+        total_pss += usage["pss"]
+        lines.append(f"{label:>14} {usage['rss'] / MB:8.1f} {usage['shared'] / MB:10.1f} "
+                     f"{usage['private'] / MB:11.1f} {usage['pss'] / MB:8.1f}")
+    lines.append(f"{'total PSS':>14} {total_pss / MB:8.1f}")
+    return "\n".join(lines)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(api, sock: socket.socket, ready_fd: int, log_level: str):
+    """Body of a forked worker: serve the inherited app on the shared socket, then exit."""
+    import uvicorn
+
+    # Tell the master once the startup hook (executor, warm-up, batcher) has finished
+    async def notify_ready():
+        os.write(ready_fd, b"1")
+
+    api.app.router.on_startup.append(notify_ready)
+    server = uvicorn.Server(uvicorn.Config(api.app, log_level=log_level))
+    try:
+        server.run(sockets=[sock])
+    finally:
+        # Skip the master's cleanup handlers inherited through fork; a failed startup exits non-zero
+        os._exit(0 if server.started else 1)
+
+
+def wait_until_ready(ready_fd: int, workers: set, expected: int, timeout: float) -> bool:
+    """Wait for ``expected`` workers to report ready; False if one dies first or time runs out."""
+    ready = 0
+    deadline = time.monotonic() + timeout
+    while ready < expected:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"Only {ready} of {expected} worker(s) ready after {timeout:.0f}s; stopping")
+            return False
+        readable, _, _ = select.select([ready_fd], [], [], min(remaining, 0.5))
+        if readable:
+            ready += len(os.read(ready_fd, expected - ready))
+            continue
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid:
+            workers.discard(pid)
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)} before it was ready; stopping")
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the model once, then fork API workers that share it.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="XGBoost/BLAS threads per worker (default: cores / workers)")
+    parser.add_argument("--report-interval", type=float, default=0,
+                        help="Seconds between memory reports (0: only once all workers are up, and on SIGUSR1)")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--ready-timeout", type=float, default=120,
+                        help="Seconds to wait for the workers' startup before giving up")
+    args = parser.parse_args()
+    if not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("serve.py needs Linux (fork and /proc); use uvicorn api:app elsewhere")
+
+    threads = args.threads or max(1, (os.cpu_count() or 1) // args.workers)
+    # Read by numpy/BLAS and api.py at import time, so set before importing them
+    for name in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(name, str(threads))
+    os.environ["XGB_NTHREAD"] = str(threads)
+    if os.environ.get("INFERENCE_EXECUTOR", "thread") != "thread":
+        print("INFERENCE_EXECUTOR=process would load a model copy per pool process; using threads")
+    os.environ["INFERENCE_EXECUTOR"] = "thread"
+    # One inference thread per worker: the workers are the parallelism, and each of them
+    # already gets its share of the cores through XGB_NTHREAD
+    if os.environ.get("INFERENCE_WORKERS", "1") != "1":
+        print("Ignoring INFERENCE_WORKERS: each worker runs one inference thread with XGB_NTHREAD threads")
+    os.environ["INFERENCE_WORKERS"] = "1"
+
+    import api
+    from inference import predict_with_proba, set_nthread, synthetic_batch
+
+    start = time.perf_counter()
+    api.load_model()
+    # Warm up single-threaded: an OpenMP thread pool started before fork would not survive in the workers
+    set_nthread(api.model, 1)
+    predict_with_proba(api.model, synthetic_batch())
+    api.preforked = True
+    # Move everything loaded so far out of the collector's reach, so its passes in the
+    # workers don't write to (and un-share) the pages holding the model
+    gc.collect()
+    gc.freeze()
+    sock = bind_socket(args.host, args.port)
+    print(f"✓ Model {api.model_version} loaded and warmed in {time.perf_counter() - start:.1f}s; "
+          f"forking {args.workers} worker(s) with {threads} thread(s) each on {args.host}:{args.port}")
+
+    ready_read, ready_write = os.pipe()
+    workers = set()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+            run_worker(api, sock, ready_write, args.log_level)
+        workers.add(pid)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    master_pid = os.getpid()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGUSR1, lambda signum, frame: print(memory_report(master_pid, sorted(workers)), flush=True))
+
+    for _ in range(args.workers):
+        spawn()
+    if not wait_until_ready(ready_read, workers, args.workers, args.ready_timeout):
+        stop(None, None)
+        for pid in list(workers):
+            os.waitpid(pid, 0)
+        sys.exit(1)
+    print(f"✓ {args.workers} worker(s) serving")
+    print(memory_report(master_pid, sorted(workers)), flush=True)
+
+    next_report = time.monotonic() + args.report_interval
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            time.sleep(0.5)
+            if args.report_interval and time.monotonic() >= next_report:
+                print(memory_report(master_pid, sorted(workers)), flush=True)
+                next_report = time.monotonic() + args.report_interval
+            continue
+        workers.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; starting a new one")
+            spawn()
+    sock.close()
+    print("✓ All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
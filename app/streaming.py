@@ -0,0 +1,118 @@
+import asyncio
+import io
+import tempfile
+from typing import AsyncIterator, Dict, List
+
+import pandas as pd
+from starlette.responses import StreamingResponse
+
+
+async def spool_stream(byte_stream: AsyncIterator[bytes], max_memory: int = 8 * 1024 * 1024,
+                       read_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Re-yield a byte stream while a background task buffers it in a spooled temp file.
+
+    The upload keeps being read even while the consumer is blocked writing results, so
+    clients that send the whole body before reading the response cannot deadlock the
+    connection. Beyond ``max_memory`` bytes the buffer lives on disk.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    state = {"written": 0, "done": False, "error": None}
+    arrived = asyncio.Event()
+
+    async def pump():
+        try:
+            async for data in byte_stream:
+                spool.seek(state["written"])
+                spool.write(data)
+                state["written"] += len(data)
+                arrived.set()
+        except Exception as e:
+            state["error"] = e
+        finally:
+            state["done"] = True
+            arrived.set()
+
+    task = asyncio.get_running_loop().create_task(pump())
+    position = 0
+    try:
+        while True:
+            if position < state["written"]:
+                spool.seek(position)
+                data = spool.read(min(read_size, state["written"] - position))
+                position += len(data)
+                yield data
+            elif state["done"]:
+                if state["error"] is not None:
+                    raise state["error"]
+                break
+            else:
+                arrived.clear()
+                await arrived.wait()
+    finally:
+        task.cancel()
+        spool.close()
+
+
+async def iter_csv_frames(byte_stream: AsyncIterator[bytes], columns: List[str],
+                          dtypes: Dict[str, str], chunk_rows: int = 5000,
+                          first_chunk_rows: int = 256) -> AsyncIterator[pd.DataFrame]:
+    """Parse a CSV byte stream into DataFrames of at most ``chunk_rows`` rows.
+
+    Frames are yielded as soon as enough complete lines have arrived, so only one chunk
+    of the input is held in memory at a time. The first frame is kept small so the
+    first results go out quickly. Records must not contain embedded newlines, which
+    holds for the exports written by data_generator.py.
+    """
+    header = None
+    lines = []
+    pending = b""
+    limit = min(first_chunk_rows, chunk_rows)
+
+    def to_frame() -> pd.DataFrame:
+        frame = pd.read_csv(io.BytesIO(header + b"\n" + b"\n".join(lines)))
+        missing = [name for name in columns if name not in frame.columns]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {missing}")
+        return frame[columns].astype(dtypes)
+
+    async for data in byte_stream:
+        pending += data
+        *complete, pending = pending.split(b"\n")
+        for line in complete:
+            line = line.rstrip(b"\r")
+            if header is None:
+                header = line
+            elif line:
+                lines.append(line)
+                if len(lines) >= limit:
+                    yield to_frame()
+                    lines = []
+                    limit = chunk_rows
+    pending = pending.rstrip(b"\r")
+    if pending:
+        if header is None:
+            header = pending
+        else:
+            lines.append(pending)
+    if lines:
+        yield to_frame()
+
+
+def encode_frame(frame: pd.DataFrame, output_format: str, include_header: bool) -> bytes:
+    """Serialize scored rows as NDJSON lines or CSV text."""
+    if output_format == "csv":
+        return frame.to_csv(index=False, header=include_header).encode("utf-8")
+    return frame.to_json(orient="records", lines=True, force_ascii=False).rstrip("\n").encode("utf-8") + b"\n"
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse for handlers that are still reading the request body while responding.
+
+    Starlette normally watches for client disconnects by calling ``receive()`` during the
+    response, which would swallow the body chunks the handler has not read yet.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
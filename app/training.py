@@ -0,0 +1,86 @@
+"""Training data and pipeline definitions shared by the training scripts.
+
+These are the preprocessing steps of notebooks/Milestone 3 & 4/final_model.ipynb:
+the same row filter, label encoding, column groups and encoder categories, so models
+trained here accept the same input as the ones trained in the notebook.
+"""
+import pandas as pd
+
+LABELS = {"Left": 0, "Stayed": 1}
+TARGET = "attrition"
+
+NUMERIC_COLS = ["age", "years_at_company", "monthly_income", "number_of_promotions", "distance_from_home",
+                "number_of_dependents", "age_before_working"]
+NOMINAL_COLS = ["job_role", "marital_status"]
+BINARY_CATEGORIES = {
+    "gender": ["Female", "Male"],
+    "overtime": ["No", "Yes"],
+    "remote_work": ["No", "Yes"],
+    "leadership_opportunities": ["No", "Yes"],
+    "innovation_opportunities": ["No", "Yes"],
+}
+ORDINAL_CATEGORIES = {
+    "work_life_balance": ["Poor", "Fair", "Good", "Excellent"],
+    "job_satisfaction": ["Low", "Medium", "High", "Very High"],
+    "performance_rating": ["Low", "Average", "High", "Excellent"],
+    "education_level": ["High School", "Associate Degree", "Bachelor’s Degree", "Master’s Degree", "PhD"],
+    "job_level": ["Entry", "Mid", "Senior"],
+    "company_size": ["Small", "Medium", "Large"],
+    "company_reputation": ["Poor", "Fair", "Good", "Excellent"],
+    "employee_recognition": ["Low", "Medium", "High", "Very High"],
+    "age_groups": ["18-25", "26-35", "36-45", "46-55", "55+"],
+}
+# SMOTE settings of the notebook's pipelines
+SMOTE_PARAMS = {"random_state": 42, "sampling_strategy": 0.5, "k_neighbors": 9}
+# Encoded columns kept by SelectKBest in the model-comparison pipeline
+SELECT_K = 25
+
+
+def load_dataset(path: str):
+    """Read a train/test CSV, drop implausible rows and return (X, y) with y as 0 = Left, 1 = Stayed."""
+    df = pd.read_csv(path)
+    df = df[~((df["years_at_company"] == 0) & (df["age"] > 45))]
+    X = df.drop(columns=[TARGET, "employee_id"], errors="ignore").reset_index(drop=True)
+    y = df[TARGET].map(LABELS).reset_index(drop=True)
+    if y.isna().any():
+        raise ValueError(f"Unexpected {TARGET} values in {path}: {sorted(df[TARGET][y.isna()].unique())}")
+    return X, y.astype(int)
+
+
+def build_preprocessor():
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+    return ColumnTransformer([
+        ("num", Pipeline([("scaler", StandardScaler())]), NUMERIC_COLS),
+        ("ord", Pipeline([("ordinal", OrdinalEncoder(categories=list(ORDINAL_CATEGORIES.values())))]),
+         list(ORDINAL_CATEGORIES)),
+        ("bin", Pipeline([("binary", OrdinalEncoder(categories=list(BINARY_CATEGORIES.values())))]),
+         list(BINARY_CATEGORIES)),
+        ("one", OneHotEncoder(), NOMINAL_COLS),
+    ])
+
+
+def build_selector():
+    from sklearn.feature_selection import SelectKBest, f_classif
+
+    return SelectKBest(score_func=f_classif, k=SELECT_K)
+
+
+def build_smote():
+    from imblearn.over_sampling import SMOTE
+
+    return SMOTE(**SMOTE_PARAMS)
+
+
+def assemble_pipeline(preprocessor, selector, smote, classifier):
+    """The notebook's preprocessor/feature_selection/smote/classifier pipeline from its (fitted or unfitted) steps."""
+    from imblearn.pipeline import Pipeline as ImbPipeline
+
+    return ImbPipeline([
+        ("preprocessor", preprocessor),
+        ("feature_selection", selector),
+        ("smote", smote),
+        ("classifier", classifier),
+    ])
@@ -0,0 +1,251 @@
+"""Binary batch formats for high-volume scoring clients: Arrow IPC and MessagePack.
+
+A JSON batch repeats all 24 field names per record, and 16 of them are
+category strings such as "Bachelor’s Degree" or "Very High". Parsing it creates
+several Python objects per row, and validating it creates a model per record.
+Both formats here are columnar. Numbers travel as raw little-endian buffers and
+strings as a dictionary (each distinct value once) plus integer codes. Decoding
+maps the buffers straight into NumPy arrays and pandas Categoricals, with no
+Python object per row. The compiled pipeline encodes Categorical columns from
+their codes.
+
+Arrow: an IPC stream (media type ``application/vnd.apache.arrow.stream``) with
+one column per feature. Dictionary-encoded string columns are kept as categoricals.
+
+MessagePack (``application/msgpack``): a map ``{"columns": {name: column}}``,
+where a column is one of
+    [value, ...]                                  plain values
+    {"dtype": "<f8", "data": <bin>}               a NumPy buffer (numeric dtypes only)
+    {"categories": [str, ...], "codes": column}   dictionary-encoded; code -1 is missing
+
+Responses use the same format, with ``prediction_label`` and ``model_version``
+dictionary-encoded. ``encode_frame`` and ``decode_frame`` work on both sides.
+
+Compare payload size and decode/encode time with JSON:
+    python app/wire.py --rows 1000 10000 100000
+"""
+import argparse
+import importlib
+import json
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ARROW = "arrow"
+MSGPACK = "msgpack"
+MEDIA_TYPES = {ARROW: "application/vnd.apache.arrow.stream", MSGPACK: "application/msgpack"}
+# Every name clients use for the two formats
+FORMATS = {**{media_type: fmt for fmt, media_type in MEDIA_TYPES.items()},
+           "application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+
+class WireError(ValueError):
+    """Raised when a binary payload cannot be decoded into the expected columns."""
+
+
+def media_format(content_type: Optional[str]) -> Optional[str]:
+    """"arrow" or "msgpack" for a Content-Type or Accept value, None for anything else."""
+    for media_type in (content_type or "").split(","):
+        fmt = FORMATS.get(media_type.split(";")[0].strip().lower())
+        if fmt is not None:
+            return fmt
+    return None
+
+
+def require(fmt: str):
+    """Import the library a format needs, so a missing one is reported before any work is done."""
+    importlib.import_module("pyarrow" if fmt == ARROW else "msgpack")
+
+
+def decode_frame(body: bytes, fmt: str, columns: List[str], dtypes: Dict[str, str]) -> pd.DataFrame:
+    """The ``columns`` of a payload as a DataFrame: numeric columns cast to ``dtypes``, strings left categorical."""
+    try:
+        raw = _decode_arrow(body) if fmt == ARROW else _decode_msgpack(body)
+    except (WireError, ImportError):
+        raise
+    except Exception as e:
+        # Truncated or malformed payloads surface as a variety of library errors
+        raise WireError(f"Invalid {fmt} payload: {str(e)}")
+    missing = [name for name in columns if name not in raw]
+    if missing:
+        raise WireError(f"Missing columns: {missing}")
+    lengths = {len(raw[name]) for name in columns}
+    if len(lengths) != 1:
+        raise WireError("All columns must have the same length")
+    frame = pd.DataFrame({name: raw[name] for name in columns}, copy=False)
+    numeric = {name: dtype for name, dtype in dtypes.items() if dtype != "object" and frame[name].dtype != dtype}
+    try:
+        for name, dtype in numeric.items():
+            frame[name] = _cast_numeric(frame[name], dtype)
+    except (TypeError, ValueError) as e:
+        raise WireError(f"Invalid values in column {name}: {str(e)}")
+    return frame
+
+
+def _cast_numeric(values: pd.Series, dtype: str) -> pd.Series:
+    """Cast to ``dtype``, refusing values the cast would change, as the JSON endpoints' validation does."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(values.cat.categories.dtype)
+    if values.dtype == object or values.dtype.kind in "OSUT":
+        values = pd.to_numeric(values)
+    if values.isna().any():
+        raise ValueError("missing values")
+    target = np.dtype(dtype)
+    array = values.to_numpy()
+    if target.kind in "iu" and len(array):
+        info = np.iinfo(target)
+        if array.dtype.kind == "f":
+            if not np.array_equal(array, np.trunc(array)):
+                raise ValueError("expected integers, got fractional values")
+            # float(info.max) rounds up to 2 ** 63, which is itself out of range
+            out_of_range = array.min() < float(info.min) or array.max() >= float(info.max)
+        else:
+            out_of_range = int(array.min()) < info.min or int(array.max()) > info.max
+        if out_of_range:
+            raise ValueError(f"values out of range for {target}")
+    return values.astype(target)
+
+
+def encode_frame(frame: pd.DataFrame, fmt: str) -> bytes:
+    """Serialize a DataFrame with its string columns dictionary-encoded."""
+    return _encode_arrow(frame) if fmt == ARROW else _encode_msgpack(frame)
+
+
+def _decode_arrow(body: bytes) -> dict:
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(body).read_all()
+    # Dictionary arrays become Categoricals, other strings object arrays
+    return {name: table.column(name).to_pandas() for name in table.column_names}
+
+
+def _encode_arrow(frame: pd.DataFrame) -> bytes:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(_categorize(frame), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode_msgpack(body: bytes) -> dict:
+    import msgpack
+
+    payload = msgpack.unpackb(body, raw=False)
+    if not isinstance(payload, dict) or not isinstance(payload.get("columns"), dict):
+        raise WireError('Expected a map with a "columns" map')
+    return {name: _unpack_column(name, column) for name, column in payload["columns"].items()}
+
+
+def _unpack_column(name: str, column):
+    if isinstance(column, list):
+        return column
+    if not isinstance(column, dict):
+        raise WireError(f"Column {name}: expected a list or a map")
+    if "categories" in column:
+        codes = np.asarray(_unpack_column(name, column.get("codes", [])))
+        if codes.dtype.kind not in "iu":
+            raise WireError(f"Column {name}: codes must be integers")
+        try:
+            return pd.Categorical.from_codes(codes, categories=column["categories"])
+        except (TypeError, ValueError) as e:
+            raise WireError(f"Column {name}: {str(e)}")
+    try:
+        dtype = np.dtype(column["dtype"])
+        if dtype.kind not in "biuf":
+            raise TypeError(f"unsupported dtype {dtype}")
+        return np.frombuffer(column["data"], dtype=dtype)
+    except (KeyError, TypeError, ValueError) as e:
+        raise WireError(f"Column {name}: {str(e)}")
+
+
+def _pack_column(series: pd.Series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return {"categories": series.cat.categories.tolist(), "codes": _pack_column(pd.Series(series.cat.codes))}
+    values = series.to_numpy()
+    if values.dtype.kind in "biuf":
+        values = values.astype(values.dtype.newbyteorder("<"), copy=False)
+        return {"dtype": values.dtype.str, "data": values.tobytes()}
+    return values.tolist()
+
+
+def _encode_msgpack(frame: pd.DataFrame) -> bytes:
+    import msgpack
+
+    frame = _categorize(frame)
+    return msgpack.packb({"columns": {name: _pack_column(frame[name]) for name in frame.columns}})
+
+
+def _categorize(frame: pd.DataFrame) -> pd.DataFrame:
+    """String columns as Categoricals, so both formats send each distinct value once."""
+    # pandas 3 gives string columns the "str" dtype rather than object
+    strings = [name for name in frame.columns
+               if frame[name].dtype == object or isinstance(frame[name].dtype, pd.StringDtype)]
+    return frame.astype({name: "category" for name in strings}) if strings else frame
+
+
+def main():
+    from api import FEATURE_COLUMNS, FEATURE_DTYPES, BatchPredictionRequest, build_responses
+    from inference import results_frame
+    from loadtest import generate_payloads
+
+    parser = argparse.ArgumentParser(description="Compare batch payload size and decode time of JSON, Arrow and MessagePack.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=5, help="Timings per format and size (the median is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    def median_ms(fn) -> float:
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings) * 1000)
+
+    def decode_json(body: bytes) -> pd.DataFrame:
+        # What /predict/batch does with {"records": [...]}: parse, validate, build the frame
+        request = BatchPredictionRequest(**json.loads(body))
+        return pd.DataFrame.from_records([record.dict() for record in request.records], columns=FEATURE_COLUMNS)
+
+    payloads = generate_payloads(max(args.rows), seed=args.seed)
+    results = {}
+    for n_rows in args.rows:
+        frame = pd.DataFrame.from_records(payloads[:n_rows], columns=FEATURE_COLUMNS).astype(FEATURE_DTYPES)
+        rng = np.random.default_rng(args.seed)
+        probabilities = rng.random(n_rows)
+        probabilities = np.column_stack([probabilities, 1 - probabilities])
+        predictions = probabilities.argmax(axis=1)
+        json_body = json.dumps({"records": payloads[:n_rows]}).encode("utf-8")
+        bodies = {"json": json_body, ARROW: encode_frame(frame, ARROW), MSGPACK: encode_frame(frame, MSGPACK)}
+        decoders = {"json": decode_json,
+                    ARROW: lambda body: decode_frame(body, ARROW, FEATURE_COLUMNS, FEATURE_DTYPES),
+                    MSGPACK: lambda body: decode_frame(body, MSGPACK, FEATURE_COLUMNS, FEATURE_DTYPES)}
+        encoders = {"json": lambda: json.dumps([response.dict() for response in
+                                                build_responses(predictions, probabilities, "v1")]).encode("utf-8"),
+                    ARROW: lambda: encode_frame(results_frame(frame["employee_id"].to_numpy(), predictions,
+                                                              probabilities, "v1"), ARROW),
+                    MSGPACK: lambda: encode_frame(results_frame(frame["employee_id"].to_numpy(), predictions,
+                                                                probabilities, "v1"), MSGPACK)}
+        results[str(n_rows)] = {
+            fmt: {"request_bytes": len(body),
+                  "decode_ms": median_ms(lambda: decoders[fmt](body)),
+                  "response_bytes": len(encoders[fmt]()),
+                  "encode_ms": median_ms(encoders[fmt])}
+            for fmt, body in bodies.items()
+        }
+        for fmt, result in results[str(n_rows)].items():
+            print(f"{n_rows:>7} rows {fmt:>8}: request {result['request_bytes'] / 1024:10.1f} KiB, "
+                  f"decode {result['decode_ms']:9.2f} ms; response {result['response_bytes'] / 1024:9.1f} KiB, "
+                  f"encode {result['encode_ms']:8.2f} ms")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app's modules import each other by bare name, as they do when run from app/
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+TEST_CSV = os.path.join(ROOT, "data", "Faker_Data", "test.csv")
+SERVED_MODEL = os.path.join(ROOT, "models", "model.pkl")
+
+
+@pytest.fixture(scope="session")
+def test_set():
+    """(X, y) of data/Faker_Data/test.csv, filtered and labeled as for training."""
+    from training import load_dataset
+
+    return load_dataset(TEST_CSV)
+
+
+@pytest.fixture(scope="session")
+def pipeline(test_set):
+    """A small fitted preprocessor/feature_selection/smote/classifier pipeline, built as in final_model.ipynb."""
+    from xgboost import XGBClassifier
+
+    from training import assemble_pipeline, build_preprocessor, build_selector, build_smote
+
+    X, y = test_set
+    model = assemble_pipeline(build_preprocessor(), build_selector(), build_smote(),
+                              XGBClassifier(n_estimators=20, max_depth=4, n_jobs=1, random_state=0))
+    return model.fit(X.iloc[:3000], y.iloc[:3000])
+
+
+@pytest.fixture(scope="session")
+def served_model():
+    """The pickled pipeline the API serves by default; models/ is not versioned, so it may be absent."""
+    import pickle
+
+    if not os.path.exists(SERVED_MODEL):
+        pytest.skip("models/model.pkl is not available")
+    with open(SERVED_MODEL, "rb") as f:
+        return pickle.load(f)
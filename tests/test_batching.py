@@ -0,0 +1,138 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from batching import BatcherStopped, MicroBatcher
+from executor import ExecutorFull
+
+COLUMNS = ["x"]
+
+
+def run_batch(score_fn, rows, max_batch_size=64):
+    """Submit ``rows`` concurrently and return each caller's result or exception."""
+    async def main():
+        batcher = MicroBatcher(score_fn, COLUMNS, max_batch_size=max_batch_size, max_wait_ms=50)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(row) for row in rows), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_rows_share_one_call():
+    calls = []
+
+    async def score(input_df: pd.DataFrame):
+        calls.append(len(input_df))
+        return (input_df["x"] * 2).tolist()
+
+    assert run_batch(score, [{"x": i} for i in range(10)]) == [i * 2 for i in range(10)]
+    assert calls == [10]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    calls = []
+
+    async def score(input_df: pd.DataFrame):
+        calls.append(len(input_df))
+        return input_df["x"].tolist()
+
+    run_batch(score, [{"x": i} for i in range(10)], max_batch_size=4)
+    assert calls == [4, 4, 2]
+
+
+def test_bad_row_fails_only_its_caller():
+    async def score(input_df: pd.DataFrame):
+        if (input_df["x"] < 0).any():
+            raise ValueError("negative")
+        return input_df["x"].tolist()
+
+    results = run_batch(score, [{"x": 1}, {"x": -1}, {"x": 3}])
+    assert results[0] == 1 and results[2] == 3
+    assert isinstance(results[1], ValueError)
+
+
+def test_executor_full_fails_the_batch_without_row_retries():
+    calls = []
+
+    async def score(input_df: pd.DataFrame):
+        calls.append(len(input_df))
+        raise ExecutorFull("busy")
+
+    results = run_batch(score, [{"x": i} for i in range(8)])
+    assert all(isinstance(result, ExecutorFull) for result in results)
+    assert calls == [8]
+
+
+def test_row_retries_stop_once_the_executor_is_full():
+    calls = []
+
+    async def score(input_df: pd.DataFrame):
+        calls.append(len(input_df))
+        if len(input_df) > 1:
+            raise ValueError("bad row somewhere")
+        if len(calls) > 2:
+            raise ExecutorFull("busy")
+        return input_df["x"].tolist()
+
+    results = run_batch(score, [{"x": i} for i in range(6)])
+    assert results[0] == 0
+    assert all(isinstance(result, ExecutorFull) for result in results[1:])
+    # The batch, one successful row, then a single rejected submission
+    assert calls == [6, 1, 1]
+
+
+@pytest.mark.parametrize("rows", [[{"x": 1}]])
+def test_single_row_error_is_passed_through(rows):
+    async def score(input_df: pd.DataFrame):
+        raise KeyError("x")
+
+    assert isinstance(run_batch(score, rows)[0], KeyError)
+
+
+def test_stop_fails_pending_callers():
+    started = None
+
+    async def score(input_df: pd.DataFrame):
+        started.set()
+        await asyncio.Event().wait()
+
+    async def main():
+        nonlocal started
+        started = asyncio.Event()
+        batcher = MicroBatcher(score, COLUMNS, max_batch_size=2, max_wait_ms=50)
+        batcher.start()
+        # Two rows in a batch that never finishes, one being collected, one queued
+        requests = [asyncio.ensure_future(batcher.submit({"x": i})) for i in range(3)]
+        await started.wait()
+        await asyncio.sleep(0.01)
+        requests.append(asyncio.ensure_future(batcher.submit({"x": 3})))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(batcher.stop(), 1)
+        results = await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), 1)
+        with pytest.raises(BatcherStopped):
+            await batcher.submit({"x": 4})
+        return results
+
+    assert all(isinstance(result, BatcherStopped) for result in asyncio.run(main()))
+
+
+def test_full_queue_is_rejected_like_a_full_executor():
+    async def score(input_df: pd.DataFrame):
+        return input_df["x"].tolist()
+
+    async def main():
+        batcher = MicroBatcher(score, COLUMNS, max_wait_ms=50, max_queue=2)
+        batcher.start()
+        try:
+            # Submitted before the collector runs, so the third row finds the queue full
+            return await asyncio.gather(*(batcher.submit({"x": i}) for i in range(3)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(main())
+    assert results[:2] == [0, 1]
+    assert isinstance(results[2], ExecutorFull)
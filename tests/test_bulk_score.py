@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bulk_score import bulk_score, csv_ranges, read_task
+from conftest import TEST_CSV
+from inference import load_pipeline, predict_with_proba
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory):
+    """The header and first 500 rows of the test set, as exported."""
+    path = tmp_path_factory.mktemp("bulk") / "employees.csv"
+    with open(TEST_CSV, "rb") as f:
+        path.write_bytes(b"".join(line for line, _ in zip(f, range(501))))
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 100, 10000])
+def test_ranges_cover_the_file_at_line_ends(csv_path, chunk_rows):
+    ranges = list(csv_ranges(csv_path, chunk_rows))
+    assert ranges[0][1] == len(ranges[0][0])
+    assert all(end == next_start for (_, _, end), (_, next_start, _) in zip(ranges, ranges[1:]))
+    frames = [read_task("csv", csv_path, byte_range) for byte_range in ranges]
+    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), pd.read_csv(csv_path))
+
+
+def test_last_line_without_newline(tmp_path):
+    path = tmp_path / "short.csv"
+    path.write_bytes(b"employee_id,age\n1,30\n2,41")
+    frames = [read_task("csv", str(path), byte_range) for byte_range in csv_ranges(str(path), 1)]
+    assert pd.concat(frames)["employee_id"].tolist() == [1, 2]
+
+
+def test_header_only_file_has_no_ranges(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_bytes(b"employee_id,age\n")
+    assert list(csv_ranges(str(path), 10)) == []
+
+
+def test_bulk_score_matches_the_model_in_input_order(served_model, csv_path, tmp_path):
+    from registry import DEFAULT_MODEL_PATH
+
+    output = str(tmp_path / "scored.parquet")
+    assert bulk_score([csv_path], output, workers=2, chunk_rows=60, name="unused") == 500
+    scored = pd.read_parquet(output)
+    expected_labels, expected = predict_with_proba(load_pipeline(DEFAULT_MODEL_PATH), pd.read_csv(csv_path))
+    assert scored["employee_id"].tolist() == pd.read_csv(csv_path)["employee_id"].tolist()
+    assert (scored["prediction"].to_numpy() == expected_labels).all()
+    np.testing.assert_allclose(scored["probability_stayed"].to_numpy(), expected[:, 1] * 100)
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xgboost
+
+from bundle import NUMPY_TOLERANCE, is_bundle, load_bundle, save_bundle
+from compiled import check_parity
+from forest import NumpyForest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+
+@pytest.fixture(scope="module")
+def bundle_dir(pipeline, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("bundle"))
+    save_bundle(pipeline, path)
+    return path
+
+
+def test_saved_directory_is_a_bundle(bundle_dir, tmp_path):
+    assert is_bundle(bundle_dir)
+    assert not is_bundle(str(tmp_path))
+
+
+def test_booster_bundle_matches_pipeline_exactly(pipeline, bundle_dir, test_set):
+    X, _ = test_set
+    assert check_parity(pipeline, load_bundle(bundle_dir, "xgboost"), X) == 0
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_numpy_bundle_matches_pipeline(pipeline, bundle_dir, test_set, mmap):
+    X, _ = test_set
+    bundle = load_bundle(bundle_dir, "numpy", mmap=mmap)
+    assert isinstance(bundle.steps[-1][1], NumpyForest)
+    assert check_parity(pipeline, bundle, X) <= NUMPY_TOLERANCE
+    assert (bundle.predict(X) == pipeline.predict(X)).all()
+
+
+def test_numpy_bundle_loads_without_xgboost_or_sklearn(bundle_dir):
+    script = ("import sys; from inference import predict_with_proba, synthetic_batch; from bundle import load_bundle; "
+              f"predict_with_proba(load_bundle({bundle_dir!r}, 'numpy', mmap=True), synthetic_batch()); "
+              "print(sorted({'xgboost', 'sklearn'} & {name.split('.')[0] for name in sys.modules}))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=APP_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_load_rejects_unknown_evaluator(bundle_dir):
+    with pytest.raises(ValueError, match="Unknown evaluator"):
+        load_bundle(bundle_dir, "onnx")
+
+
+def test_load_rejects_other_formats(bundle_dir, tmp_path):
+    spec = (Path(bundle_dir) / "spec.json").read_text(encoding="utf-8")
+    (tmp_path / "spec.json").write_text(spec.replace('"format": 1', '"format": 99'), encoding="utf-8")
+    with pytest.raises(ValueError, match="Unsupported bundle format"):
+        load_bundle(str(tmp_path))
+
+
+def test_numpy_forest_margin_matches_booster(pipeline, bundle_dir, test_set):
+    X, _ = test_set
+    features = load_bundle(bundle_dir, "numpy").steps[0][1]
+    booster = pipeline.steps[-1][1].get_booster()
+    expected = booster.predict(xgboost.DMatrix(features.transform(X.iloc[:500])), output_margin=True)
+    forest = NumpyForest.from_booster(booster, pipeline.classes_)
+    np.testing.assert_allclose(forest.predict_margin(features.transform(X.iloc[:500])), expected, atol=1e-5)
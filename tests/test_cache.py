@@ -0,0 +1,76 @@
+import pandas as pd
+
+import cache
+from cache import PredictionCache
+
+COLUMNS = ["age", "job_role"]
+
+
+def make_cache(**kwargs) -> PredictionCache:
+    prediction_cache = PredictionCache(COLUMNS, **kwargs)
+    prediction_cache.set_model_version("v1")
+    return prediction_cache
+
+
+def test_key_ignores_columns_outside_the_features():
+    prediction_cache = make_cache()
+    assert prediction_cache.key({"employee_id": 1, "age": 30, "job_role": "Media"}) == \
+        prediction_cache.key({"employee_id": 2, "job_role": "Media", "age": 30})
+
+
+def test_frame_keys_match_record_keys():
+    prediction_cache = make_cache()
+    records = [{"employee_id": 1, "age": 30, "job_role": "Media"}, {"employee_id": 2, "age": 41, "job_role": "Finance"}]
+    assert prediction_cache.keys_for_frame(pd.DataFrame(records)) == [prediction_cache.key(r) for r in records]
+
+
+def test_hit_and_miss_are_counted():
+    prediction_cache = make_cache()
+    assert prediction_cache.get((30, "Media")) is None
+    prediction_cache.put((30, "Media"), "Stayed", "v1")
+    assert prediction_cache.get((30, "Media")) == "Stayed"
+    assert prediction_cache.stats()["hits"] == 1
+    assert prediction_cache.stats()["misses"] == 1
+    assert prediction_cache.stats()["hit_rate"] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+    prediction_cache = make_cache(max_entries=2)
+    prediction_cache.put("a", 1, "v1")
+    prediction_cache.put("b", 2, "v1")
+    prediction_cache.get("a")
+    prediction_cache.put("c", 3, "v1")
+    assert prediction_cache.get("b") is None
+    assert prediction_cache.get("a") == 1
+    assert prediction_cache.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    prediction_cache = make_cache(ttl_seconds=10)
+    prediction_cache.put("a", 1, "v1")
+    now[0] += 11
+    assert prediction_cache.get("a") is None
+    assert prediction_cache.stats()["expirations"] == 1
+    assert prediction_cache.stats()["entries"] == 0
+
+
+def test_new_model_version_empties_the_cache():
+    prediction_cache = make_cache()
+    prediction_cache.put("a", 1, "v1")
+    prediction_cache.set_model_version("v2")
+    assert prediction_cache.get("a") is None
+
+
+def test_results_of_another_model_are_not_stored():
+    prediction_cache = make_cache()
+    prediction_cache.put("a", 1, "v0")
+    assert prediction_cache.stats()["entries"] == 0
+
+
+def test_zero_size_disables_the_cache():
+    prediction_cache = make_cache(max_entries=0)
+    assert not prediction_cache.enabled
+    prediction_cache.put("a", 1, "v1")
+    assert prediction_cache.get("a") is None
@@ -0,0 +1,43 @@
+import pytest
+
+from compiled import CompiledPipeline, check_parity, compile_pipeline
+from inference import predict_with_proba, predict_with_stages
+
+
+def test_compiled_matches_pipeline_on_test_set(pipeline, test_set):
+    X, _ = test_set
+    assert check_parity(pipeline, compile_pipeline(pipeline), X) == 0
+
+
+def test_compiled_matches_served_model_on_test_set(served_model, test_set):
+    X, _ = test_set
+    assert check_parity(served_model, compile_pipeline(served_model), X) == 0
+
+
+def test_compiled_labels_match_pipeline(pipeline, test_set):
+    X, _ = test_set
+    expected_labels, _ = predict_with_proba(pipeline, X)
+    labels, _ = predict_with_proba(compile_pipeline(pipeline), X)
+    assert (labels == expected_labels).all()
+
+
+def test_compile_is_idempotent(pipeline):
+    compiled = compile_pipeline(pipeline)
+    assert isinstance(compiled, CompiledPipeline)
+    assert compile_pipeline(compiled) is compiled
+
+
+def test_compiled_rejects_unknown_category(pipeline, test_set):
+    X, _ = test_set
+    bad = X.iloc[:5].copy()
+    bad["job_level"] = "Director"
+    with pytest.raises(ValueError, match="unknown categories"):
+        compile_pipeline(pipeline).predict_proba(bad)
+
+
+def test_compiled_stages_keep_pipeline_names(pipeline, test_set):
+    X, _ = test_set
+    _, expected, pipeline_timings = predict_with_stages(pipeline, X.iloc[:100])
+    _, probabilities, timings = predict_with_stages(compile_pipeline(pipeline), X.iloc[:100])
+    assert set(timings) == set(pipeline_timings) == {"preprocessor", "feature_selection", "classifier"}
+    assert (probabilities == expected).all()
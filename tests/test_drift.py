@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import drift
+from drift import (CATEGORICAL_FEATURES, NUMERIC_FEATURES, PSI_ALERT, CategoricalSketch, DriftMonitor,
+                   build_baseline, load_baseline, psi, save_baseline)
+
+
+@pytest.fixture(scope="module")
+def baseline(test_set):
+    X, _ = test_set
+    return build_baseline(X.iloc[:10000], NUMERIC_FEATURES, CATEGORICAL_FEATURES, source="test.csv")
+
+
+def test_psi_is_zero_for_identical_distributions():
+    counts = np.array([10.0, 20.0, 30.0])
+    assert psi(counts, counts * 3) == pytest.approx(0.0)
+    assert psi(counts, counts[::-1]) > 0
+
+
+def test_same_distribution_does_not_drift(baseline, test_set):
+    X, _ = test_set
+    monitor = DriftMonitor(baseline, half_life=0)
+    monitor.observe_frame(X.iloc[10000:])
+    report = monitor.report()
+    assert report["rows"] == len(X) - 10000
+    assert report["drifted"] == []
+    assert report["max_psi"] < 0.05
+
+
+def test_shifted_feature_is_flagged(baseline, test_set):
+    X, _ = test_set
+    shifted = X.iloc[10000:12000].copy()
+    shifted["monthly_income"] = shifted["monthly_income"] * 3
+    shifted["overtime"] = "Yes"
+    monitor = DriftMonitor(baseline, half_life=0)
+    monitor.observe_frame(shifted)
+    report = monitor.report()
+    assert report["drifted"] == ["monthly_income", "overtime"]
+    assert report["features"]["monthly_income"]["psi"] > PSI_ALERT
+
+
+def test_records_and_frames_count_alike(baseline, test_set):
+    X, _ = test_set
+    rows = X.iloc[:200]
+    by_record, by_frame, by_category = (DriftMonitor(baseline, half_life=0) for _ in range(3))
+    for record in rows.to_dict(orient="records"):
+        by_record.observe(record)
+    by_frame.observe_frame(rows)
+    by_category.observe_frame(rows.astype({name: "category" for name in CATEGORICAL_FEATURES}))
+    for name in baseline["features"]:
+        np.testing.assert_allclose(by_frame.sketches[name].counts, by_record.sketches[name].counts)
+        np.testing.assert_allclose(by_category.sketches[name].counts, by_record.sketches[name].counts)
+
+
+def test_unseen_categories_get_their_own_bucket():
+    sketch = CategoricalSketch(["No", "Yes"])
+    sketch.add_values(np.array(["No", "Maybe", "Yes", "Maybe"]))
+    sketch.add("Perhaps")
+    assert sketch.counts.tolist() == [1, 1, 3]
+
+
+def test_half_life_decays_older_rows(baseline, test_set):
+    X, _ = test_set
+    monitor = DriftMonitor(baseline, half_life=100)
+    monitor.observe_frame(X.iloc[:100])
+    monitor.observe_frame(X.iloc[100:200])
+    # The first batch weighs half as much as the second one
+    assert monitor.effective_rows() == pytest.approx(150)
+
+
+def test_rescaling_keeps_the_effective_rows(baseline, test_set, monkeypatch):
+    X, _ = test_set
+    monitor, rescaled = DriftMonitor(baseline, half_life=10), DriftMonitor(baseline, half_life=10)
+    for start in range(0, 100, 10):
+        monitor.observe_frame(X.iloc[start:start + 10])
+    monkeypatch.setattr(drift, "RESCALE_EXPONENT", 3)
+    for start in range(0, 100, 10):
+        rescaled.observe_frame(X.iloc[start:start + 10])
+    assert rescaled._exponent < monitor._exponent
+    assert rescaled.effective_rows() == pytest.approx(monitor.effective_rows())
+    assert rescaled.report()["max_psi"] == pytest.approx(monitor.report()["max_psi"])
+
+
+def test_saved_baseline_round_trips(baseline, tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(baseline, path)
+    assert load_baseline(path) == baseline
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from executor import ExecutorFull, InferenceExecutor
+
+
+class BlockingModel:
+    """A stand-in model whose predict_proba waits until the test releases it."""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict_proba(self, input_df: pd.DataFrame):
+        self.release.wait(5)
+        return np.tile([0.25, 0.75], (len(input_df), 1))
+
+
+def test_jobs_beyond_max_pending_are_rejected():
+    async def main():
+        executor = InferenceExecutor("thread", max_workers=1, max_pending=2, nthread=1)
+        model = BlockingModel()
+        frame = pd.DataFrame({"x": [1, 2]})
+        try:
+            jobs = [asyncio.ensure_future(executor.predict(model, frame)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with pytest.raises(ExecutorFull):
+                await executor.predict(model, frame)
+            model.release.set()
+            results = await asyncio.gather(*jobs)
+            assert executor.pending == 0
+            return results
+        finally:
+            model.release.set()
+            executor.shutdown()
+
+    for labels, probabilities in asyncio.run(main()):
+        assert labels.tolist() == [1, 1]
+        assert probabilities.shape == (2, 2)
+
+
+def test_pending_is_released_when_a_job_fails():
+    class FailingModel:
+        def predict_proba(self, input_df):
+            raise ValueError("bad input")
+
+    async def main():
+        executor = InferenceExecutor("thread", max_workers=1, max_pending=1, nthread=1)
+        try:
+            for _ in range(3):
+                with pytest.raises(ValueError):
+                    await executor.predict(FailingModel(), pd.DataFrame({"x": [1]}))
+            return executor.pending
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(main()) == 0
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        InferenceExecutor("fiber")
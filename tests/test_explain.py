@@ -0,0 +1,32 @@
+import numpy as np
+
+import explain
+from compiled import compile_pipeline
+from explain import explain_frame, selected_input_columns
+
+
+def test_selected_input_columns_compiles_each_model_once(pipeline, monkeypatch):
+    calls = []
+
+    def counting_compile(model):
+        calls.append(model)
+        return compile_pipeline(model)
+
+    monkeypatch.setattr(explain, "_selected_columns", type(explain._selected_columns)())
+    monkeypatch.setattr(explain, "compile_pipeline", counting_compile)
+    first = selected_input_columns(pipeline)
+    assert selected_input_columns(pipeline) is first
+    assert calls == [pipeline]
+
+
+def test_selected_input_columns_match_compiled_pipeline(pipeline):
+    assert selected_input_columns(pipeline) == selected_input_columns(compile_pipeline(pipeline))
+
+
+def test_contributions_add_up_to_margin(pipeline, test_set):
+    X, _ = test_set
+    rows = X.iloc[:50]
+    contributions, base_values = explain_frame(pipeline, rows, list(X.columns))
+    probability_left = pipeline.predict_proba(rows)[:, 0]
+    margin = np.log(probability_left / (1 - probability_left))
+    np.testing.assert_allclose(base_values + contributions.sum(axis=1), margin, atol=1e-4)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import xgboost
+
+from forest import NumpyForest
+
+
+def train(X: np.ndarray, y: np.ndarray, **params) -> xgboost.Booster:
+    params = {"objective": "binary:logistic", "max_depth": 3, "nthread": 1, **params}
+    return xgboost.train(params, xgboost.DMatrix(X, y), num_boost_round=5)
+
+
+@pytest.fixture(scope="module")
+def X():
+    return np.random.default_rng(0).random((300, 4)).astype(np.float32)
+
+
+def test_constant_target_gives_single_leaf_trees(X, tmp_path):
+    # A constant target leaves nothing to split on: every tree is a lone leaf
+    booster = train(X, np.zeros(len(X)), base_score=0.5)
+    forest = NumpyForest.from_booster(booster)
+    assert forest.max_depth == 0
+    expected = booster.predict(xgboost.DMatrix(X), output_margin=True)
+    np.testing.assert_array_equal(forest.predict_margin(X), expected)
+    loaded = NumpyForest.load(str(tmp_path), forest.save(str(tmp_path)), mmap=True)
+    np.testing.assert_array_equal(loaded.predict_margin(X), expected)
+
+
+def test_margin_matches_booster_with_missing_values(X):
+    y = (X[:, 0] + X[:, 1] > 1).astype(np.float64)
+    booster = train(X, y)
+    X = X.copy()
+    X[::7, 0] = np.nan
+    forest = NumpyForest.from_booster(booster)
+    np.testing.assert_allclose(forest.predict_margin(X), booster.predict(xgboost.DMatrix(X), output_margin=True),
+                               atol=1e-6)
+
+
+def test_rejects_other_objectives(X):
+    booster = train(X, X[:, 0].astype(np.float64), objective="reg:squarederror")
+    with pytest.raises(ValueError, match="binary:logistic"):
+        NumpyForest.from_booster(booster)
@@ -0,0 +1,14 @@
+from api import FEATURE_COLUMNS, PredictionRequest
+from loadtest import generate_payloads
+
+
+def test_generated_payloads_are_valid_requests():
+    payloads = generate_payloads(200, seed=0)
+    assert len(payloads) == 200
+    for payload in payloads:
+        assert sorted(payload) == sorted(FEATURE_COLUMNS)
+        PredictionRequest(**payload)
+
+
+def test_generated_payloads_are_reproducible():
+    assert generate_payloads(50, seed=1) == generate_payloads(50, seed=1)
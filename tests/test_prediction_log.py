@@ -0,0 +1,107 @@
+import asyncio
+
+import pandas as pd
+
+from prediction_log import LOG_FIELDS, PredictionLog, iter_log_files, read_log, request_payloads
+
+
+class Response:
+    """Stand-in for PredictionResponse."""
+
+    def __init__(self, prediction: int):
+        self.prediction = prediction
+
+    def dict(self):
+        return {"prediction": self.prediction, "prediction_label": "Stayed" if self.prediction else "Left",
+                "confidence": 90.0, "probability_stayed": 90.0, "probability_left": 10.0, "model_version": "v1"}
+
+
+def run(coroutine_fn, *args):
+    return asyncio.run(asyncio.wait_for(coroutine_fn(*args), 10))
+
+
+def test_logged_rows_are_written_in_order_and_replayable(tmp_path):
+    async def main():
+        log = PredictionLog(str(tmp_path), batch_rows=2, flush_interval=0.05)
+        log.start()
+        await log.log("/predict", {"age": 30, "overtime": "Yes"}, Response(1))
+        await log.log_frame("/predict/batch", pd.DataFrame({"age": [41, 52], "overtime": ["No", "Yes"]}),
+                            [Response(0), Response(1)])
+        await log.stop()
+        return log.stats()
+
+    stats = run(main)
+    assert stats["rows_written"] == 3 and stats["write_errors"] == 0
+    files = list(iter_log_files([str(tmp_path)]))
+    assert len(files) == 1
+    frame = read_log(files[0])
+    assert frame["age"].tolist() == [30, 41, 52]
+    assert set(LOG_FIELDS) <= set(frame.columns)
+    assert request_payloads([str(tmp_path)])[1] == {"age": 41, "overtime": "No"}
+
+
+def test_writer_survives_a_failed_write(tmp_path):
+    async def main():
+        log = PredictionLog(str(tmp_path), batch_rows=1, flush_interval=0.05)
+        write = log._write
+        failures = []
+
+        def failing_write(entries):
+            if not failures and entries:
+                failures.append(len(entries))
+                raise OSError("No space left on device")
+            write(entries)
+
+        log._write = failing_write
+        log.start()
+        await log.log("/predict", {"age": 30}, Response(1))
+        await asyncio.sleep(0.2)
+        await log.log("/predict", {"age": 31}, Response(0))
+        await asyncio.sleep(0.2)
+        stats = log.stats()
+        await log.stop()
+        return stats, log.stats()
+
+    running, stopped = run(main)
+    assert running["writer_running"]
+    assert running["write_errors"] == 1 and "No space left" in running["last_error"]
+    assert running["rows_dropped"] == 1
+    assert stopped["rows_written"] == 1
+    assert read_log(next(iter_log_files([str(tmp_path)])))["age"].tolist() == [31]
+
+
+def test_blocking_policy_does_not_hang_when_writes_keep_failing(tmp_path):
+    async def main():
+        log = PredictionLog(str(tmp_path), buffer_rows=2, batch_rows=2, flush_interval=0.05, policy="block")
+
+        def failing_write(entries):
+            raise OSError("Read-only file system")
+
+        log._write = failing_write
+        log._write_and_close = failing_write
+        log.start()
+        for age in range(10):
+            await log.log("/predict", {"age": age}, Response(1))
+        await log.stop()
+        return log.stats()
+
+    stats = run(main)
+    assert stats["write_errors"] >= 1
+    assert stats["rows_written"] == 0 and stats["rows_dropped"] == 10
+
+
+def test_requests_are_not_blocked_once_the_writer_is_gone(tmp_path):
+    async def main():
+        log = PredictionLog(str(tmp_path), buffer_rows=1, batch_rows=100, flush_interval=60, policy="block")
+        log.start()
+        await log.log("/predict", {"age": 30}, Response(1))
+        log._task.cancel()
+        await asyncio.sleep(0)
+        # The buffer is full and nothing will drain it: these must return, not wait
+        await log.log("/predict", {"age": 31}, Response(1))
+        await log.log("/predict", {"age": 32}, Response(1))
+        return log.stats()
+
+    stats = run(main)
+    assert not stats["writer_running"]
+    assert stats["rows_dropped"] == 2
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="serve.py needs fork and /proc")
+
+from serve import memory_usage, wait_until_ready  # noqa: E402
+
+
+def fork(body):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            body()
+        finally:
+            os._exit(3)
+    return pid
+
+
+def test_workers_that_report_ready():
+    ready_read, ready_write = os.pipe()
+    workers = {fork(lambda: (os.write(ready_write, b"1"), time.sleep(0.2))) for _ in range(2)}
+    try:
+        assert wait_until_ready(ready_read, workers, 2, timeout=10)
+    finally:
+        for pid in workers:
+            os.waitpid(pid, 0)
+
+
+def test_worker_dying_before_ready_stops_the_wait():
+    ready_read, _ = os.pipe()
+    workers = {fork(lambda: None)}
+    start = time.monotonic()
+    assert not wait_until_ready(ready_read, workers, 1, timeout=30)
+    assert time.monotonic() - start < 5
+    assert not workers
+
+
+def test_ready_timeout():
+    ready_read, _ = os.pipe()
+    pid = fork(lambda: time.sleep(2))
+    try:
+        assert not wait_until_ready(ready_read, {pid}, 1, timeout=0.3)
+    finally:
+        os.waitpid(pid, 0)
+
+
+def test_memory_usage_of_this_process():
+    usage = memory_usage(os.getpid())
+    assert usage["rss"] > 0
+    assert usage["shared"] + usage["private"] == pytest.approx(usage["rss"], rel=0.01)
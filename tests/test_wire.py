@@ -0,0 +1,97 @@
+import msgpack
+import numpy as np
+import pandas as pd
+import pytest
+
+import wire
+from wire import ARROW, MSGPACK, WireError, decode_frame, encode_frame, media_format
+
+COLUMNS = ["employee_id", "age", "monthly_income", "overtime"]
+DTYPES = {"employee_id": "int64", "age": "int64", "monthly_income": "float64", "overtime": "object"}
+
+
+def frame(**overrides) -> pd.DataFrame:
+    data = {"employee_id": [1, 2, 3], "age": [30, 41, 52], "monthly_income": [5000.0, 7250.5, 3100.0],
+            "overtime": ["Yes", "No", "Yes"]}
+    data.update(overrides)
+    return pd.DataFrame(data)
+
+
+def msgpack_body(columns: dict) -> bytes:
+    return msgpack.packb({"columns": columns})
+
+
+@pytest.mark.parametrize("fmt", [ARROW, MSGPACK])
+def test_round_trip_keeps_values_and_dictionary_encodes_strings(fmt):
+    decoded = decode_frame(encode_frame(frame(), fmt), fmt, COLUMNS, DTYPES)
+    assert decoded["age"].dtype == "int64" and decoded["monthly_income"].dtype == "float64"
+    assert isinstance(decoded["overtime"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(decoded.astype({"overtime": object}), frame().astype({"overtime": object}),
+                                  check_dtype=False)
+
+
+@pytest.mark.parametrize("fmt", [ARROW, MSGPACK])
+def test_integral_floats_are_accepted(fmt):
+    decoded = decode_frame(encode_frame(frame(age=[30.0, 41.0, 52.0]), fmt), fmt, COLUMNS, DTYPES)
+    assert decoded["age"].tolist() == [30, 41, 52]
+
+
+@pytest.mark.parametrize("fmt", [ARROW, MSGPACK])
+@pytest.mark.parametrize("ages", [[30.7, 41.0, 52.0], [1e30, 41.0, 52.0], [float("inf"), 1.0, 2.0],
+                                  [float("nan"), 1.0, 2.0]])
+def test_values_an_int_cast_would_change_are_rejected(fmt, ages):
+    with pytest.raises(WireError, match="age"):
+        decode_frame(encode_frame(frame(age=ages), fmt), fmt, COLUMNS, DTYPES)
+
+
+def test_unsigned_values_beyond_int64_are_rejected():
+    columns = {name: wire._pack_column(frame()[name]) for name in COLUMNS}
+    columns["age"] = {"dtype": "<u8", "data": np.array([30, 2 ** 63, 1], dtype="<u8").tobytes()}
+    with pytest.raises(WireError, match="out of range"):
+        decode_frame(msgpack_body(columns), MSGPACK, COLUMNS, DTYPES)
+
+
+def test_plain_list_columns_are_accepted():
+    columns = {name: frame()[name].tolist() for name in COLUMNS}
+    decoded = decode_frame(msgpack_body(columns), MSGPACK, COLUMNS, DTYPES)
+    assert decoded["overtime"].tolist() == ["Yes", "No", "Yes"]
+
+
+def test_missing_column_is_reported():
+    with pytest.raises(WireError, match="Missing columns"):
+        decode_frame(encode_frame(frame().drop(columns="age"), ARROW), ARROW, COLUMNS, DTYPES)
+
+
+def test_codes_outside_the_dictionary_are_rejected():
+    columns = {name: frame()[name].tolist() for name in COLUMNS}
+    columns["overtime"] = {"categories": ["No", "Yes"], "codes": [0, 1, 5]}
+    with pytest.raises(WireError, match="overtime"):
+        decode_frame(msgpack_body(columns), MSGPACK, COLUMNS, DTYPES)
+
+
+@pytest.mark.parametrize("fmt", [ARROW, MSGPACK])
+def test_garbage_is_a_wire_error(fmt):
+    with pytest.raises(WireError):
+        decode_frame(b"\x00not a payload", fmt, COLUMNS, DTYPES)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack; charset=binary", MSGPACK),
+    ("application/json, application/vnd.apache.arrow.stream;q=0.9", ARROW),
+    ("application/json", None),
+    (None, None),
+])
+def test_media_format(header, expected):
+    assert media_format(header) == expected
+
+
+@pytest.mark.parametrize("fmt", [ARROW, MSGPACK])
+def test_response_labels_are_dictionary_encoded(fmt):
+    from inference import results_frame
+
+    probabilities = np.array([[0.9, 0.1], [0.2, 0.8], [0.4, 0.6]])
+    scored = results_frame(np.array([1, 2, 3]), probabilities.argmax(axis=1), probabilities, "v1")
+    decoded = decode_frame(encode_frame(scored, fmt), fmt, list(scored.columns), {})
+    assert isinstance(decoded["prediction_label"].dtype, pd.CategoricalDtype)
+    assert decoded["prediction_label"].tolist() == ["Left", "Stayed", "Stayed"]